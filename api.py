@@ -5,6 +5,7 @@ from typing import Sequence
 from _version import __version__
 from distributions import Distributions
 from entry import Entry
+from profiling import Profiler
 from utility import Utility
 
 class API:
@@ -15,12 +16,34 @@ class API:
     def json_serialization(self, indent: int = 0) -> str:
         document = {
             "data": {entry.name: entry.value for entry in self.entries},
-            "meta": {
-                "version": Utility.version_to_semver_segments(__version__),
-                "date": datetime.now().isoformat(),
-                "count": len(self.entries),
-                "distro": Distributions.get_local().value,
-            },
+            "meta": self._get_meta(),
         }
 
         return json.dumps(document, indent=((indent * 2) or None))
+
+    def ndjson_meta_serialization(self) -> str:
+        return json.dumps({"meta": self._get_meta()})
+
+    @staticmethod
+    def ndjson_entry_serialization(entry: Entry) -> str:
+        return json.dumps(
+            {"name": entry.name, "value": entry.value, "timed_out": entry.timed_out}
+        )
+
+    def _get_meta(self) -> dict:
+        meta = {
+            "version": Utility.version_to_semver_segments(__version__),
+            "date": datetime.now().isoformat(),
+            "count": len(self.entries),
+            "distro": Distributions.get_local().value,
+            "timed_out": [entry.name for entry in self.entries if entry.timed_out],
+        }
+
+        profiler = Profiler()
+        if profiler.enabled:
+            meta["timings"] = {
+                "entries": {entry.name: entry.profile for entry in self.entries},
+                "process": profiler.get_process_usage(),
+            }
+
+        return meta
@@ -0,0 +1,140 @@
+import asyncio
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from subprocess import DEVNULL, PIPE, CalledProcessError
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Type
+
+from cache import EntryCache
+from deadline import Deadline
+from entry import Entry
+from isolation import collect_entry
+from profiling import Profiler
+
+
+async def async_check_output(
+    *cmd: str, env: Optional[dict] = None, timeout: Optional[float] = None
+) -> str:
+    process = await asyncio.create_subprocess_exec(
+        *cmd, stdout=PIPE, stderr=DEVNULL, env=env
+    )
+    try:
+        stdout, _ = await asyncio.wait_for(process.communicate(), timeout)
+    except (asyncio.TimeoutError, asyncio.CancelledError):
+        if process.returncode is None:
+            process.kill()
+            await process.wait()
+        raise
+
+    output = stdout.decode("utf-8", errors="replace")
+    if process.returncode:
+        raise CalledProcessError(process.returncode, cmd, output=output)
+
+    return output
+
+
+class AsyncEngine:
+
+    def __init__(
+        self,
+        entry_cache: EntryCache,
+        max_workers: Optional[int] = None,
+        deadline: Optional[Deadline] = None,
+        executor: Optional[ThreadPoolExecutor] = None,
+    ):
+        self._entry_cache = entry_cache
+        self._max_workers = max_workers
+        self._deadline = deadline or Deadline()
+        self._executor = executor
+        # Thread-adapted collections still running past their timeout, which a next call waits
+        # for again.
+        self._abandoned_futures: Dict[str, Future] = {}
+
+    def collect(
+        self,
+        entries: Sequence[Tuple[Type[Entry], dict]],
+        on_entry: Optional[Callable[[Entry], None]] = None,
+    ) -> List[Entry]:
+        executor = self._executor or ThreadPoolExecutor(max_workers=self._max_workers)
+        try:
+            return asyncio.run(self._collect_all(entries, executor, on_entry))
+        finally:
+            # Do not wait for abandoned (timed out) thread-adapted collectors.
+            if executor is not self._executor:
+                executor.shutdown(wait=False)
+
+    async def _collect_all(
+        self,
+        entries: Sequence[Tuple[Type[Entry], dict]],
+        executor: ThreadPoolExecutor,
+        on_entry: Optional[Callable[[Entry], None]],
+    ) -> List[Entry]:
+        return list(
+            await asyncio.gather(
+                *(
+                    self._collect_one_with_timeout(entry_cls, options, executor, on_entry)
+                    for entry_cls, options in entries
+                )
+            )
+        )
+
+    async def _collect_one_with_timeout(
+        self,
+        entry_cls: Type[Entry],
+        options: dict,
+        executor: ThreadPoolExecutor,
+        on_entry: Optional[Callable[[Entry], None]],
+    ) -> Entry:
+        try:
+            entry = await asyncio.wait_for(
+                self._collect_one(entry_cls, options, executor),
+                self._deadline.get_entry_timeout(entry_cls, options),
+            )
+        except (TimeoutError, asyncio.TimeoutError):
+            logging.warning("%s entry timed out.", entry_cls.__name__)
+            entry = entry_cls.from_timeout(options)
+
+        if on_entry is not None:
+            on_entry(entry)
+
+        return entry
+
+    async def _collect_one(
+        self, entry_cls: Type[Entry], options: dict, executor: ThreadPoolExecutor
+    ) -> Entry:
+        profiler = Profiler()
+        with profiler.profile_entry(per_thread=False) as profile:
+            entry = self._entry_cache.get(entry_cls, options)
+        if entry is not None:
+            profiler.add_source(profile, "cache")
+            entry.profile = profile
+            return entry
+
+        if entry_cls.has_async_collector():
+            # Async collectors share the event loop thread, so only wall time is accounted.
+            with profiler.profile_entry(per_thread=False) as profile:
+                entry = entry_cls.from_value(None, options=options)
+                await entry.collect_async()
+            entry.profile = profile
+        else:
+            key = EntryCache.get_key(entry_cls, options)
+            future = self._abandoned_futures.pop(key, None)
+            if future is None or future.done():
+                future = executor.submit(
+                    partial(
+                        collect_entry,
+                        entry_cls,
+                        options,
+                        self._deadline.get_entry_timeout(entry_cls, options),
+                    )
+                )
+
+            try:
+                entry = await asyncio.wrap_future(future)
+            except asyncio.CancelledError:
+                if not future.done():
+                    self._abandoned_futures[key] = future
+                raise
+
+        self._entry_cache.store(entry)
+        return entry
@@ -0,0 +1,264 @@
+import argparse
+import json
+import logging
+import math
+import mmap
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+
+# Benchmarks must never reach the network (see `Kernel` and `WAN_IP` entries).
+os.environ["DO_NOT_TRACK"] = "1"
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from benchmarks.fixtures import SCALES, FixtureSysroot
+from configuration import Configuration
+from entries import get_entries_names, lazy_load_entry_class
+from pci_ids import PciIds
+from processes import Processes
+from singleton import Singleton
+from sysroot import Sysroot
+
+
+def args_parsing() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    parser.add_argument(
+        "-s",
+        "--scale",
+        action="append",
+        choices=tuple(SCALES),
+        help="fixtures scale to benchmark against, may be given multiple times (default: all)",
+    )
+    parser.add_argument(
+        "-e",
+        "--entry",
+        action="append",
+        metavar="NAME",
+        help="only benchmark this entry, may be given multiple times",
+    )
+    parser.add_argument(
+        "-n",
+        "--iterations",
+        type=int,
+        default=20,
+        help="timed iterations per benchmark (default: 20)",
+    )
+    parser.add_argument(
+        "--main-iterations",
+        type=int,
+        default=5,
+        help="timed iterations of the full `main()` pipeline, 0 to skip it (default: 5)",
+    )
+    parser.add_argument(
+        "-j",
+        "--json",
+        action="store_true",
+        help="output results to JSON format",
+    )
+    return parser.parse_args()
+
+
+def percentile(samples: List[float], percent: float) -> float:
+    sorted_samples = sorted(samples)
+    rank = max(1, math.ceil(percent / 100 * len(sorted_samples)))
+    return sorted_samples[rank - 1]
+
+
+def measure(function: Callable[[], object], iterations: int) -> dict:
+    try:
+        # Warm-up run, so that lazy imports and regular expressions compilation are left out.
+        function()
+    except Exception as error:
+        return {"error": f"{type(error).__name__}: {error}"}
+
+    latencies = []
+    for _ in range(iterations):
+        start_time = time.perf_counter()
+        function()
+        latencies.append(time.perf_counter() - start_time)
+
+    # Allocations are traced on a separate run, as `tracemalloc` skews latencies.
+    tracemalloc.start()
+    try:
+        function()
+        retained_size, peak_size = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "peak_kib": peak_size / 1024,
+        "retained_kib": retained_size / 1024,
+    }
+
+
+def measure_main(sysroot: FixtureSysroot, iterations: int) -> dict:
+    main_cmd = (
+        sys.executable,
+        os.path.join(ROOT_DIR, "main.py"),
+        "--no-daemon",
+        "--no-cache",
+        "--sysroot",
+        sysroot.root_dir,
+        "-j",
+    )
+    main_env = {**os.environ, "PATH": sysroot.bin_dir}
+
+    latencies = []
+    max_rss = 0
+    for _ in range(iterations):
+        start_time = time.perf_counter()
+        main_process = subprocess.Popen(
+            main_cmd,
+            cwd=ROOT_DIR,
+            env=main_env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        _, exit_status, rusage = os.wait4(main_process.pid, 0)
+        latencies.append(time.perf_counter() - start_time)
+        main_process.returncode = os.waitstatus_to_exitcode(exit_status)
+        if main_process.returncode:
+            return {"error": f"`main.py` exited with status {main_process.returncode}"}
+
+        max_rss = max(max_rss, rusage.ru_maxrss)
+
+    return {
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "max_rss_kib": max_rss,
+    }
+
+
+def get_parsers_benchmarks(sysroot: FixtureSysroot) -> Dict[str, Callable[[], object]]:
+    cpu_cls = lazy_load_entry_class("CPU")
+    disk_cls = lazy_load_entry_class("Disk")
+    disk_io_cls = lazy_load_entry_class("DiskIO")
+    gpu_cls = lazy_load_entry_class("GPU")
+    ram_cls = lazy_load_entry_class("RAM")
+    uptime_cls = lazy_load_entry_class("Uptime")
+
+    cpuinfo_lines = sysroot.files["/proc/cpuinfo"].splitlines()
+    _, cpus_packages, _ = cpu_cls._read_sysfs_topology()
+    meminfo = sysroot.files["/proc/meminfo"]
+    df_output = sysroot.read_output("df")
+    mountinfo = sysroot.files["/proc/self/mountinfo"]
+    diskstats = sysroot.files["/proc/diskstats"]
+    lspci_output = sysroot.read_output("lspci")
+    uptime_output = sysroot.read_output("uptime")
+    with open(os.path.join(sysroot.root_dir, "usr/share/hwdata/pci.ids"), "rb") as f_pci_ids:
+        pci_ids = mmap.mmap(f_pci_ids.fileno(), 0, access=mmap.ACCESS_READ)
+
+    return {
+        "CPU._parse_cpuinfo": lambda: cpu_cls._parse_cpuinfo(cpuinfo_lines, cpus_packages),
+        "Disk._parse_df_output": lambda: disk_cls._parse_df_output(df_output),
+        "Disk._parse_mountinfo": lambda: disk_cls._parse_mountinfo(mountinfo),
+        "DiskIO._parse_diskstats": lambda: disk_io_cls._parse_diskstats(diskstats),
+        "GPU._filter_gpus": lambda: gpu_cls._filter_gpus(lspci_output),
+        "PciIds._build_index": lambda: PciIds._build_index(pci_ids),
+        "RAM._parse_meminfo": lambda: ram_cls._parse_meminfo(meminfo),
+        "Uptime._parse_uptime_output": lambda: uptime_cls._parse_uptime_output(uptime_output),
+        "Processes._scan_proc": lambda: Processes._scan_proc(),
+        "Processes._run_ps": lambda: Processes._run_ps(),
+    }
+
+
+# Sampling entries would otherwise mostly measure their sleep.
+ENTRIES_OPTIONS: Dict[str, dict] = {"DiskIO": {"interval": 0}}
+
+
+def get_entries_benchmarks(entries_names: List[str]) -> Dict[str, Callable[[], object]]:
+    def _collect_entry(entry_name: str) -> Callable[[], object]:
+        entry_cls = lazy_load_entry_class(entry_name)
+
+        def _collect():
+            if entry_cls.uses_processes():
+                Processes().refresh()
+            return entry_cls(options=ENTRIES_OPTIONS.get(entry_name, {}))
+
+        return _collect
+
+    return {entry_name: _collect_entry(entry_name) for entry_name in entries_names}
+
+
+def run_scale(scale: str, args: argparse.Namespace) -> Dict[str, dict]:
+    results: Dict[str, dict] = {}
+
+    with tempfile.TemporaryDirectory(
+        prefix=f"sysinfo-bench-{scale}-"
+    ) as root_dir, tempfile.TemporaryDirectory(prefix="sysinfo-bench-cache-") as cache_dir:
+        sysroot = FixtureSysroot(root_dir, scale).build()
+
+        # Each scale reads files below its own fixture tree.
+        Singleton._instances.pop(Sysroot, None)
+        Singleton._instances.pop(PciIds, None)
+        Sysroot(root_dir)
+
+        # Commands without a stub are unavailable, as on a minimal host. Indexes built from
+        # fixtures (e.g. of pci.ids) must not pile up in the user cache either.
+        environment_overrides = {"PATH": sysroot.bin_dir, "XDG_CACHE_HOME": cache_dir}
+        previous_environment = {name: os.environ.get(name) for name in environment_overrides}
+        os.environ.update(environment_overrides)
+        try:
+            benchmarks = get_parsers_benchmarks(sysroot)
+            benchmarks.update(get_entries_benchmarks(args.entry or get_entries_names()))
+            for benchmark_name, function in benchmarks.items():
+                results[benchmark_name] = measure(function, args.iterations)
+
+            if args.main_iterations > 0:
+                results["main()"] = measure_main(sysroot, args.main_iterations)
+        finally:
+            for name, previous_value in previous_environment.items():
+                if previous_value is None:
+                    del os.environ[name]
+                else:
+                    os.environ[name] = previous_value
+
+    return results
+
+
+def format_results(scale: str, results: Dict[str, dict], iterations: int) -> str:
+    sizes = ", ".join(f"{name}={size}" for name, size in SCALES[scale].items())
+    lines = [
+        f"scale={scale} ({sizes}), {iterations} iterations",
+        f"{'benchmark':<30} {'p50 (ms)':>10} {'p99 (ms)':>10} {'peak (KiB)':>12}",
+    ]
+    for benchmark_name, result in results.items():
+        if "error" in result:
+            lines.append(f"{benchmark_name:<30} {result['error']}")
+            continue
+
+        peak: Optional[float] = result.get("peak_kib", result.get("max_rss_kib"))
+        lines.append(
+            f"{benchmark_name:<30} {result['p50_ms']:>10.3f} {result['p99_ms']:>10.3f}"
+            f" {peak:>12.1f}" + (" (max RSS)" if "max_rss_kib" in result else "")
+        )
+
+    return "\n".join(lines)
+
+
+def main():
+    args = args_parsing()
+
+    # Warnings would be repeated on each iteration.
+    logging.basicConfig(level=logging.ERROR)
+    Configuration()
+
+    all_results = {}
+    for scale in args.scale or SCALES:
+        all_results[scale] = run_scale(scale, args)
+        if not args.json:
+            print(format_results(scale, all_results[scale], args.iterations), end="\n\n")
+
+    if args.json:
+        print(json.dumps(all_results, indent=2))
+
+
+main()
@@ -0,0 +1,389 @@
+import json
+import os
+import shlex
+import shutil
+import stat
+from itertools import chain
+from typing import Dict
+
+SCALES: Dict[str, Dict[str, int]] = {
+    "small": {"cpus": 8, "mounts": 12, "processes": 300, "packages": 1500},
+    "large": {"cpus": 512, "mounts": 10000, "processes": 100000, "packages": 5000},
+}
+
+CPU_MODEL_NAME = "AMD EPYC 9754 128-Core Processor"
+
+LSPCI_OUTPUT = """\
+00:00.0 Host bridge: Advanced Micro Devices, Inc. [AMD] Genoa/Bergamo Root Complex
+00:01.0 Host bridge: Advanced Micro Devices, Inc. [AMD] Genoa/Bergamo Dummy Host Bridge
+02:00.0 VGA compatible controller: ASPEED Technology, Inc. ASPEED Graphics Family (rev 52)
+41:00.0 3D controller: NVIDIA Corporation GH100 [H100 PCIe] (rev a1)
+c1:00.0 Ethernet controller: Mellanox Technologies MT2892 Family [ConnectX-6 Dx]
+"""
+
+# (address, class, vendor, device, revision), as `LSPCI_OUTPUT`.
+PCI_DEVICES = (
+    ("0000:00:00.0", 0x060000, 0x1022, 0x14A4, 0x00),
+    ("0000:00:01.0", 0x060000, 0x1022, 0x149F, 0x00),
+    ("0000:02:00.0", 0x030000, 0x1A03, 0x2000, 0x52),
+    ("0000:41:00.0", 0x030200, 0x10DE, 0x2331, 0xA1),
+    ("0000:c1:00.0", 0x020000, 0x15B3, 0x101D, 0x00),
+)
+PCI_IDS_NAMES = {
+    0x1022: ("Advanced Micro Devices, Inc. [AMD]", {0x14A4: "Genoa/Bergamo Root Complex"}),
+    0x10DE: ("NVIDIA Corporation", {0x2331: "GH100 [H100 PCIe]"}),
+    0x15B3: ("Mellanox Technologies", {0x101D: "MT2892 Family [ConnectX-6 Dx]"}),
+    0x1A03: ("ASPEED Technology, Inc.", {0x2000: "ASPEED Graphics Family"}),
+}
+
+UPTIME_OUTPUT = " 16:12:30 up 412 days,  3:07,  4 users,  load average: 12.01, 11.52, 10.90\n"
+
+STATIC_FILES = {
+    "/etc/hostname": "bench-node-01\n",
+    "/etc/os-release": 'NAME="Debian GNU/Linux"\nID=debian\nPRETTY_NAME="Debian GNU/Linux 12"\n',
+    "/proc/loadavg": "12.01 11.52 10.90 3/2048 123456\n",
+    "/proc/meminfo": (
+        "MemTotal:       1584754688 kB\n"
+        "MemFree:        912345678 kB\n"
+        "Buffers:          1234567 kB\n"
+        "Cached:         123456789 kB\n"
+        "Shmem:            2345678 kB\n"
+        "SwapTotal:       67108860 kB\n"
+        "SwapFree:        54321098 kB\n"
+        "Zswap:             524288 kB\n"
+        "Zswapped:         1572864 kB\n"
+        "SReclaimable:    12345678 kB\n"
+        "HugePages_Total:    16384\n"
+        "HugePages_Free:      4096\n"
+        "Hugepagesize:       2048 kB\n"
+    ),
+    "/proc/sys/kernel/osrelease": "6.1.0-18-amd64\n",
+    "/proc/uptime": "35608020.53 1139456789.12\n",
+    "/sys/block/zram0/mm_stat": "4294967296 1073741824 1136656384 0 1136656384 12 0 0 0\n",
+    "/sys/class/thermal/thermal_zone0/temp": "41000\n",
+    "/sys/devices/virtual/dmi/id/product_name": "PowerEdge R7625\n",
+    "/sys/devices/virtual/dmi/id/sys_vendor": "Dell Inc.\n",
+}
+
+
+def generate_cpuinfo(nb_cpus: int, nb_sockets: int = 2) -> str:
+    cpus_per_socket = max(1, nb_cpus // nb_sockets)
+
+    cpuinfo_blocks = []
+    for processor in range(nb_cpus):
+        cpuinfo_blocks.append(
+            f"processor\t: {processor}\n"
+            "vendor_id\t: AuthenticAMD\n"
+            "cpu family\t: 25\n"
+            "model\t\t: 160\n"
+            f"model name\t: {CPU_MODEL_NAME}\n"
+            "stepping\t: 2\n"
+            "cpu MHz\t\t: 2250.000\n"
+            "cache size\t: 1024 KB\n"
+            f"physical id\t: {min(processor // cpus_per_socket, nb_sockets - 1)}\n"
+            f"siblings\t: {cpus_per_socket}\n"
+            f"core id\t\t: {processor % cpus_per_socket}\n"
+            f"cpu cores\t: {cpus_per_socket}\n"
+            "flags\t\t: fpu vme de pse tsc msr pae mce cx8 apic sep mtrr pge mca cmov pat pse36"
+            " clflush mmx fxsr sse sse2 ht syscall nx mmxext fxsr_opt pdpe1gb rdtscp lm avx2\n"
+            "bogomips\t: 4500.00\n"
+            "address sizes\t: 52 bits physical, 57 bits virtual\n"
+        )
+
+    return "\n".join(cpuinfo_blocks) + "\n"
+
+
+def generate_sysfs_cpu_files(nb_cpus: int, nb_sockets: int = 2) -> Dict[str, str]:
+    cpus_per_socket = max(1, nb_cpus // nb_sockets)
+    cpus_per_ccx = min(8, cpus_per_socket)
+
+    sysfs_cpu_files = {}
+    for processor in range(nb_cpus):
+        physical_id = min(processor // cpus_per_socket, nb_sockets - 1)
+        ccx_first_cpu = processor - processor % cpus_per_ccx
+        ccx_cpus_list = f"{ccx_first_cpu}-{ccx_first_cpu + cpus_per_ccx - 1}"
+
+        cpu_path = f"/sys/devices/system/cpu/cpu{processor}"
+        sysfs_cpu_files.update(
+            {
+                f"{cpu_path}/topology/core_cpus_list": f"{processor}\n",
+                f"{cpu_path}/topology/physical_package_id": f"{physical_id}\n",
+                f"{cpu_path}/topology/cluster_cpus_list": f"{ccx_cpus_list}\n",
+            }
+        )
+        for index, (level, cache_type, size, shared_cpus_list) in enumerate(
+            (
+                (1, "Data", "32K", f"{processor}"),
+                (1, "Instruction", "32K", f"{processor}"),
+                (2, "Unified", "1024K", f"{processor}"),
+                (3, "Unified", "32768K", ccx_cpus_list),
+            )
+        ):
+            cache_path = f"{cpu_path}/cache/index{index}"
+            sysfs_cpu_files.update(
+                {
+                    f"{cache_path}/level": f"{level}\n",
+                    f"{cache_path}/type": f"{cache_type}\n",
+                    f"{cache_path}/size": f"{size}\n",
+                    f"{cache_path}/shared_cpu_list": f"{shared_cpus_list}\n",
+                }
+            )
+
+    for physical_id in range(nb_sockets):
+        policy_path = f"/sys/devices/system/cpu/cpufreq/policy{physical_id * cpus_per_socket}"
+        sysfs_cpu_files.update(
+            {
+                f"{policy_path}/scaling_cur_freq": "2250000\n",
+                f"{policy_path}/cpuinfo_min_freq": "1500000\n",
+                f"{policy_path}/cpuinfo_max_freq": "3100000\n",
+                f"{policy_path}/scaling_governor": "performance\n",
+            }
+        )
+
+    return sysfs_cpu_files
+
+
+def generate_hwmon_files(nb_chips: int) -> Dict[str, str]:
+    # Same chips as `sensors` output.
+    hwmon_files = {}
+    for chip_index in range(nb_chips):
+        hwmon_path = f"/sys/class/hwmon/hwmon{chip_index}"
+        hwmon_files.update(
+            {
+                f"{hwmon_path}/name": "k10temp\n",
+                f"{hwmon_path}/temp1_input": f"{40000 + chip_index * 1000}\n",
+                f"{hwmon_path}/temp1_label": "Tctl\n",
+                f"{hwmon_path}/temp3_input": f"{38500 + chip_index * 1000}\n",
+                f"{hwmon_path}/temp3_label": "Tccd1\n",
+            }
+        )
+
+    return hwmon_files
+
+
+def generate_pci_ids(nb_vendors: int = 2500, nb_devices_per_vendor: int = 16) -> str:
+    # Over a megabyte, as upstream pci.ids, real devices names being kept.
+    pci_ids_lines = ["# Synthetic pci.ids", "# Syntax:", "# vendor  vendor_name", ""]
+    vendors_ids = sorted({0x1000 + vendor_index * 5 for vendor_index in range(nb_vendors)})
+    for vendor_id in sorted(set(vendors_ids) | set(PCI_IDS_NAMES)):
+        vendor_name, devices_names = PCI_IDS_NAMES.get(
+            vendor_id, (f"Synthetic Vendor {vendor_id:04x}", {})
+        )
+        pci_ids_lines.append(f"{vendor_id:04x}  {vendor_name}")
+        devices_names = {
+            **{
+                0x1000 + device_index * 0x111: f"Synthetic Device {device_index} [Model]"
+                for device_index in range(nb_devices_per_vendor)
+            },
+            **devices_names,
+        }
+        for device_id, device_name in sorted(devices_names.items()):
+            pci_ids_lines.append(f"\t{device_id:04x}  {device_name}")
+            if device_id % 4 == 0:
+                pci_ids_lines.append(f"\t\t{vendor_id:04x} {device_id:04x}  Synthetic Subsystem")
+
+    pci_ids_lines.extend(("", "C 03  Display controller", "\t00  VGA compatible controller"))
+    return "\n".join(pci_ids_lines) + "\n"
+
+
+def generate_pci_devices_files() -> Dict[str, str]:
+    pci_devices_files = {}
+    for pci_address, pci_class, vendor_id, device_id, revision in PCI_DEVICES:
+        device_path = f"/sys/bus/pci/devices/{pci_address}"
+        pci_devices_files.update(
+            {
+                f"{device_path}/class": f"0x{pci_class:06x}\n",
+                f"{device_path}/vendor": f"0x{vendor_id:04x}\n",
+                f"{device_path}/device": f"0x{device_id:04x}\n",
+                f"{device_path}/revision": f"0x{revision:02x}\n",
+            }
+        )
+
+    return pci_devices_files
+
+
+def generate_df_output(nb_mounts: int) -> str:
+    df_lines = [
+        "Filesystem     1024-blocks      Used Available Capacity Mounted on",
+        "/dev/nvme0n1p2   960303848 412345678 499123456      46% /",
+        "tmpfs             65536000         0  65536000       0% /dev/shm",
+    ]
+    for mount_index in range(nb_mounts):
+        if mount_index % 4 == 0:
+            device_path = f"/dev/loop{mount_index}"
+        elif mount_index % 4 == 1:
+            device_path = "overlay"
+        else:
+            device_path = f"/dev/nvme{1 + mount_index % 8}n1p{1 + mount_index % 16}"
+
+        df_lines.append(
+            f"{device_path} 104857600 {mount_index * 1024} {104857600 - mount_index * 1024}"
+            f" {mount_index * 100 // nb_mounts}% /srv/volumes/volume-{mount_index}"
+        )
+
+    return "\n".join(df_lines) + "\n"
+
+
+def generate_mountinfo(nb_mounts: int) -> str:
+    mountinfo_lines = [
+        "22 1 259:2 / / rw,relatime shared:1 - ext4 /dev/nvme0n1p2 rw",
+        "23 22 0:21 / /proc rw,nosuid,nodev,noexec,relatime shared:12 - proc proc rw",
+        "24 22 0:5 / /dev/shm rw,nosuid,nodev shared:3 - tmpfs tmpfs rw",
+    ]
+    for mount_index in range(nb_mounts):
+        mount_id = 100 + mount_index
+        mount_point = f"/srv/volumes/volume-{mount_index}"
+        if mount_index % 4 == 0:
+            mountinfo_lines.append(
+                f"{mount_id} 22 7:{mount_index} / {mount_point} ro,relatime"
+                f" - squashfs /dev/loop{mount_index} ro"
+            )
+        elif mount_index % 4 == 1:
+            mountinfo_lines.append(
+                f"{mount_id} 22 0:{1000 + mount_index} / {mount_point} rw,relatime"
+                " - overlay overlay rw,lowerdir=/l,upperdir=/u,workdir=/w"
+            )
+        else:
+            # Same devices as `df` output, most of them being bind-mounted several times.
+            nvme_index, partition = 1 + mount_index % 8, 1 + mount_index % 16
+            mountinfo_lines.append(
+                f"{mount_id} 22 259:{nvme_index * 16 + partition} /{mount_index} {mount_point}"
+                f" rw,relatime shared:{mount_id} - xfs /dev/nvme{nvme_index}n1p{partition} rw"
+            )
+
+    return "\n".join(mountinfo_lines) + "\n"
+
+
+def generate_diskstats(nb_mounts: int) -> str:
+    diskstats_lines = []
+    for nvme_index in range(1 + min(8, nb_mounts)):
+        diskstats_lines.append(
+            f" 259 {nvme_index * 16} nvme{nvme_index}n1 123456 789 98765432 45678 234567 890"
+            " 87654321 56789 0 123456 102467 0 0 0 0 1234 567"
+        )
+        for partition in range(1, 17):
+            diskstats_lines.append(
+                f" 259 {nvme_index * 16 + partition} nvme{nvme_index}n1p{partition} 1234 0 98765"
+                " 456 2345 0 87654 567 0 1234 1023 0 0 0 0"
+            )
+    for loop_index in range(nb_mounts // 4):
+        diskstats_lines.append(
+            f"   7 {loop_index} loop{loop_index} 12 0 345 1 0 0 0 0 0 4 1 0 0 0 0"
+        )
+
+    return "\n".join(diskstats_lines) + "\n"
+
+
+PROCESSES_COMMANDS = (
+    "systemd", "kworker/u64:2", "sshd", "bash", "python3", "containerd-shim", "java"
+)
+
+
+def generate_ps_output(nb_processes: int) -> str:
+    ps_lines = ["COMMAND"]
+    for process_index in range(nb_processes):
+        ps_lines.append(PROCESSES_COMMANDS[process_index % len(PROCESSES_COMMANDS)])
+
+    return "\n".join(ps_lines) + "\n"
+
+
+def generate_dpkg_status(nb_packages: int) -> str:
+    status_blocks = []
+    for package_index in range(nb_packages):
+        status = "deinstall ok config-files" if package_index % 97 == 0 else "install ok installed"
+        status_blocks.append(
+            f"Package: package-{package_index}\n"
+            f"Status: {status}\n"
+            "Priority: optional\n"
+            "Section: misc\n"
+            "Installed-Size: 1024\n"
+            "Architecture: amd64\n"
+            f"Version: 1.{package_index}-1\n"
+            "Description: synthetic benchmark package\n"
+        )
+
+    return "\n".join(status_blocks)
+
+
+def generate_sensors_output(nb_chips: int) -> str:
+    # Mimics `sensors -A -j`, which leaves adapters out.
+    sensors_data = {}
+    for chip_index in range(nb_chips):
+        sensors_data[f"k10temp-pci-00{chip_index:02x}"] = {
+            "Tctl": {"temp1_input": 40.0 + chip_index},
+            "Tccd1": {"temp3_input": 38.5 + chip_index},
+        }
+
+    return json.dumps(sensors_data, indent=2)
+
+
+class FixtureSysroot:
+
+    def __init__(self, root_dir: str, scale: str):
+        self.root_dir = root_dir
+        self.scale = scale
+        self.sizes = SCALES[scale]
+        self.bin_dir = os.path.join(root_dir, "bin")
+        self.outputs_dir = os.path.join(root_dir, "outputs")
+        self.files: Dict[str, str] = {}
+
+    def build(self) -> "FixtureSysroot":
+        self.files = {
+            **STATIC_FILES,
+            "/proc/cpuinfo": generate_cpuinfo(self.sizes["cpus"]),
+            "/proc/self/mountinfo": generate_mountinfo(self.sizes["mounts"]),
+            "/proc/diskstats": generate_diskstats(self.sizes["mounts"]),
+            "/usr/share/hwdata/pci.ids": generate_pci_ids(),
+            "/var/lib/dpkg/status": generate_dpkg_status(self.sizes["packages"]),
+        }
+        sysfs_files = {
+            **generate_sysfs_cpu_files(self.sizes["cpus"]),
+            **generate_hwmon_files(self.sizes["cpus"] // 64 + 1),
+            **generate_pci_devices_files(),
+        }
+        for file_path, content in chain(self.files.items(), sysfs_files.items()):
+            self._write(os.path.join(self.root_dir, file_path.lstrip("/")), content)
+
+        # Mount points must exist for `statvfs` to succeed below the fixture tree.
+        for mount_index in range(self.sizes["mounts"]):
+            os.makedirs(
+                os.path.join(self.root_dir, "srv", "volumes", f"volume-{mount_index}"),
+                exist_ok=True,
+            )
+
+        for nvme_index in range(1 + min(8, self.sizes["mounts"])):
+            os.makedirs(os.path.join(self.root_dir, "sys", "block", f"nvme{nvme_index}n1"))
+
+        for process_index in range(self.sizes["processes"]):
+            self._write(
+                os.path.join(self.root_dir, "proc", str(process_index + 1), "comm"),
+                PROCESSES_COMMANDS[process_index % len(PROCESSES_COMMANDS)] + "\n",
+            )
+
+        self._add_stub_binary("ps", generate_ps_output(self.sizes["processes"]))
+        self._add_stub_binary("df", generate_df_output(self.sizes["mounts"]))
+        self._add_stub_binary("lspci", LSPCI_OUTPUT)
+        self._add_stub_binary("sensors", generate_sensors_output(self.sizes["cpus"] // 64 + 1))
+        self._add_stub_binary("uptime", UPTIME_OUTPUT)
+
+        return self
+
+    def read_output(self, command: str) -> str:
+        with open(os.path.join(self.outputs_dir, command), encoding="UTF-8") as f_output:
+            return f_output.read()
+
+    def _add_stub_binary(self, command: str, output: str) -> None:
+        output_path = os.path.join(self.outputs_dir, command)
+        self._write(output_path, output)
+
+        stub_path = os.path.join(self.bin_dir, command)
+        # Stubs must not depend on `PATH`, which only contains the stubs themselves.
+        cat_path = shutil.which("cat") or "/bin/cat"
+        self._write(stub_path, f"#!/bin/sh\nexec {cat_path} {shlex.quote(output_path)}\n")
+        os.chmod(stub_path, os.stat(stub_path).st_mode | stat.S_IXUSR)
+
+    @staticmethod
+    def _write(path: str, content: str) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, mode="w", encoding="UTF-8") as f_fixture:
+            f_fixture.write(content)
@@ -0,0 +1,164 @@
+import json
+import logging
+import math
+import os
+import time
+from contextlib import suppress
+from threading import Lock
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+from configuration import Configuration
+from entry import Entry
+from singleton import Singleton
+
+
+def get_cache_dir() -> str:
+    return os.path.join(
+        os.getenv("XDG_CACHE_HOME") or os.path.expanduser(os.path.join("~", ".cache")), "sysinfo"
+    )
+
+
+class EntryCache(metaclass=Singleton):
+
+    _BOOT_ID_PATH = "/proc/sys/kernel/random/boot_id"
+
+    def __init__(self, enabled: bool = True):
+        cache_config = Configuration().get("entry_cache", {})
+
+        self._enabled = enabled and cache_config.get("enabled", True)
+        self._path = cache_config.get("path") or self._get_default_path()
+        self._lock = Lock()
+        self._dirty = False
+        self._boot_id = self._read_boot_id()
+        self._records: Dict[str, dict] = {}
+        self._data: Dict[str, Any] = {}
+        if self._enabled:
+            self._records, self._data = self._load()
+
+    @staticmethod
+    def _get_default_path() -> str:
+        return os.path.join(get_cache_dir(), "entries.json")
+
+    @classmethod
+    def _read_boot_id(cls) -> Optional[str]:
+        try:
+            with open(cls._BOOT_ID_PATH, encoding="ASCII") as f_boot_id:
+                return f_boot_id.read().strip()
+        except OSError:
+            return None
+
+    @staticmethod
+    def get_key(entry_cls: Type[Entry], options: dict) -> str:
+        return (
+            f"{entry_cls.__name__}:{entry_cls._VALUE_VERSION}:"
+            f"{json.dumps(options, sort_keys=True, default=str)}"
+        )
+
+    @staticmethod
+    def _fingerprint(path: str) -> Optional[List[int]]:
+        try:
+            file_stat = os.stat(path)
+        except OSError:
+            return None
+
+        return [file_stat.st_mtime_ns, file_stat.st_ino]
+
+    def _load(self) -> Tuple[Dict[str, dict], Dict[str, Any]]:
+        try:
+            with open(self._path, encoding="UTF-8") as f_cache:
+                cache_document = json.load(f_cache)
+        except FileNotFoundError:
+            return {}, {}
+        except (OSError, ValueError) as error:
+            logging.warning("Couldn't load entry cache (%s) : %s", self._path, error)
+            return {}, {}
+
+        if not isinstance(cache_document, dict) or cache_document.get("boot_id") != self._boot_id:
+            return {}, {}
+
+        return cache_document.get("entries", {}), cache_document.get("data", {})
+
+    def get(self, entry_cls: Type[Entry], options: dict) -> Optional[Entry]:
+        if not self._enabled or entry_cls.get_cache_ttl(options) is None:
+            return None
+
+        with self._lock:
+            record = self._records.get(self.get_key(entry_cls, options))
+
+        if not record or (record["expires"] is not None and record["expires"] < time.time()):
+            return None
+
+        for path, fingerprint in record["files"].items():
+            if self._fingerprint(path) != fingerprint:
+                return None
+
+        entry = entry_cls.from_value(record["value"], options=options)
+        entry.refresh()
+        return entry
+
+    def store(self, entry: Entry) -> None:
+        cache_ttl = entry.get_cache_ttl(entry.options)
+        if not self._enabled or cache_ttl is None or not entry.value:
+            return
+
+        record = {
+            "value": entry.value,
+            "expires": None if math.isinf(cache_ttl) else time.time() + cache_ttl,
+            "files": {
+                path: self._fingerprint(path) for path in entry.get_cache_dependencies()
+            },
+        }
+
+        with self._lock:
+            self._records[self.get_key(type(entry), entry.options)] = record
+            self._dirty = True
+
+    def get_data(self, key: str) -> Any:
+        if not self._enabled:
+            return None
+
+        with self._lock:
+            return self._data.get(key)
+
+    def store_data(self, key: str, value: Any) -> None:
+        if not self._enabled:
+            return
+
+        with self._lock:
+            if self._data.get(key) != value:
+                self._data[key] = value
+                self._dirty = True
+
+    def get_or_collect(self, entry_cls: Type[Entry], options: dict) -> Entry:
+        entry = self.get(entry_cls, options)
+        if entry is None:
+            entry = entry_cls(options=options)
+            self.store(entry)
+
+        return entry
+
+    def save(self) -> None:
+        with self._lock:
+            if not self._dirty:
+                return
+
+            cache_document: Dict[str, Any] = {
+                "boot_id": self._boot_id,
+                "entries": self._records,
+                "data": self._data,
+            }
+            self._dirty = False
+
+        tmp_path = f"{self._path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self._path), exist_ok=True)
+            try:
+                with open(tmp_path, mode="w", encoding="UTF-8") as f_cache:
+                    json.dump(cache_document, f_cache)
+                os.replace(tmp_path, self._path)
+            except BaseException:
+                with suppress(FileNotFoundError):
+                    os.unlink(tmp_path)
+                raise
+        except (OSError, TypeError, ValueError) as error:
+            logging.warning("Couldn't write entry cache (%s) : %s", self._path, error)
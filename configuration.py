@@ -10,12 +10,49 @@ from utility import Utility
 DEFAULT_CONFIG: Dict[str, Any] = {
     "allow_overriding": False,
     "parallel_loading": True,
+    "engine": "threads",
+    "deadline_ms": None,
+    "sysroot": "/",
     "suppress_warnings": False,
+    "entry_cache": {
+        "enabled": True,
+        "path": None,
+    },
+    "daemon": {
+        "query": True,
+        "query_timeout": 1,
+        "socket_path": None,
+        "refresh_interval": 5,
+        "entries_timeout": 10,
+    },
+    "entries": [
+        {"type": "User"},
+        {"type": "Hostname"},
+        {"type": "Model"},
+        {"type": "Distro"},
+        {"type": "Kernel"},
+        {"type": "Uptime"},
+        {"type": "LoadAverage"},
+        {"type": "Processes"},
+        {"type": "WindowManager"},
+        {"type": "DesktopEnvironment"},
+        {"type": "Shell"},
+        {"type": "Terminal"},
+        {"type": "Packages"},
+        {"type": "Temperature"},
+        {"type": "CPU"},
+        {"type": "GPU"},
+        {"type": "RAM"},
+        {"type": "Disk"},
+        {"type": "LAN_IP"},
+        {"type": "WAN_IP"},
+    ],
     "default_strings": {
         "latest": "latest",
         "available": "available",
         "no_address": "No Address",
         "not_detected": "Not detected",
+        "timed_out": "timed out",
         "virtual_environment": "Virtual Environment",
     },
 }
@@ -24,6 +61,7 @@ DEFAULT_CONFIG: Dict[str, Any] = {
 class Configuration(metaclass=Singleton):
 
     def __init__(self, config_path=None):
+        self.config_path = config_path
         self._config = deepcopy(DEFAULT_CONFIG)
         self._config_files_info = {}
         if config_path:
@@ -0,0 +1,188 @@
+import json
+import logging
+import os
+import socket
+import socketserver
+import time
+from threading import Event, Lock, Thread
+from typing import Dict, List, Optional, Sequence, Tuple, Type
+
+from cache import EntryCache
+from configuration import Configuration
+from deadline import Deadline
+from entries import lazy_load_entry_class
+from entry import Entry
+from processes import Processes
+from thread_engine import ThreadEngine
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+
+    server: "_DaemonServer"
+
+    def handle(self) -> None:
+        try:
+            request = json.loads(self.rfile.readline())
+            requested_entries = request["entries"]
+        except (ValueError, KeyError, TypeError) as error:
+            logging.warning("Discarding invalid daemon request : %s", error)
+            return
+
+        try:
+            entries_values = self.server.sysinfo_daemon.get_entries_values(requested_entries)
+        except (KeyError, TypeError, ValueError) as error:
+            logging.warning("Discarding invalid daemon request : %s", error)
+            return
+
+        response = {"entries": entries_values}
+        self.wfile.write(json.dumps(response).encode() + b"\n")
+
+
+class _DaemonServer(socketserver.ThreadingUnixStreamServer):
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: str, sysinfo_daemon: "Daemon"):
+        self.sysinfo_daemon = sysinfo_daemon
+        super().__init__(socket_path, _RequestHandler)
+
+
+class Daemon:
+
+    def __init__(
+        self,
+        entry_cache: EntryCache,
+        entries: Sequence[Tuple[Type[Entry], dict]],
+        max_workers: Optional[int] = None,
+    ):
+        daemon_config = Configuration().get("daemon", {})
+
+        self._entry_cache = entry_cache
+        self._max_workers = max_workers
+        self._default_refresh_interval = daemon_config.get("refresh_interval", 5)
+        self._timeout = daemon_config.get("entries_timeout", 10)
+
+        self._lock = Lock()
+        self._wakeup = Event()
+        self._stopped = Event()
+        self._entries: Dict[str, Tuple[Type[Entry], dict]] = {}
+        self._snapshot: Dict[str, Entry] = {}
+        self._next_refreshes: Dict[str, float] = {}
+
+        for entry_cls, options in entries:
+            # Clients collect these ones themselves.
+            if entry_cls.uses_environment():
+                continue
+
+            self._entries[EntryCache.get_key(entry_cls, options)] = (entry_cls, options)
+
+    def get_entries_values(self, requested_entries: List[dict]) -> List[dict]:
+        requested_keys = []
+        missing_keys = []
+        for requested_entry in requested_entries:
+            entry_cls = lazy_load_entry_class(requested_entry["type"])
+            if entry_cls.uses_environment():
+                raise ValueError(f"{entry_cls.__name__} depends on the client environment")
+
+            options = requested_entry.get("options") or {}
+            entry_key = EntryCache.get_key(entry_cls, options)
+
+            with self._lock:
+                if entry_key not in self._entries:
+                    self._entries[entry_key] = (entry_cls, options)
+                if entry_key not in self._snapshot:
+                    missing_keys.append(entry_key)
+
+            requested_keys.append(entry_key)
+
+        if missing_keys:
+            self._refresh(missing_keys)
+            self._wakeup.set()
+
+        with self._lock:
+            return [
+                {
+                    "value": self._snapshot[entry_key].value,
+                    "timed_out": self._snapshot[entry_key].timed_out,
+                }
+                for entry_key in requested_keys
+            ]
+
+    def _refresh(self, entries_keys: List[str]) -> None:
+        with self._lock:
+            entries = [self._entries[entry_key] for entry_key in entries_keys]
+
+        if any(entry_cls.uses_processes() for entry_cls, _ in entries):
+            Processes().refresh()
+
+        entries_instances = ThreadEngine(
+            self._entry_cache, self._max_workers, Deadline(self._timeout)
+        ).collect(entries)
+        self._entry_cache.save()
+
+        now = time.monotonic()
+        with self._lock:
+            for entry_key, (entry_cls, options), entry_instance in zip(
+                entries_keys, entries, entries_instances
+            ):
+                # Keep serving a stale value rather than a timed out one.
+                if not entry_instance.timed_out or entry_key not in self._snapshot:
+                    self._snapshot[entry_key] = entry_instance
+
+                refresh_interval = entry_cls.get_refresh_interval(options)
+                if refresh_interval is None:
+                    refresh_interval = self._default_refresh_interval
+                self._next_refreshes[entry_key] = now + refresh_interval
+
+    def _refresh_loop(self) -> None:
+        while not self._stopped.is_set():
+            self._wakeup.clear()
+
+            now = time.monotonic()
+            with self._lock:
+                due_keys = [
+                    entry_key
+                    for entry_key in self._entries
+                    if self._next_refreshes.get(entry_key, now) <= now
+                ]
+
+            if due_keys:
+                self._refresh(due_keys)
+
+            with self._lock:
+                next_refresh = min(self._next_refreshes.values(), default=None)
+
+            self._wakeup.wait(None if next_refresh is None else next_refresh - time.monotonic())
+
+    def serve_forever(self, socket_path: str) -> None:
+        if os.path.exists(socket_path):
+            try:
+                with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe_socket:
+                    probe_socket.connect(socket_path)
+            except OSError:
+                os.unlink(socket_path)
+            else:
+                logging.error("Another daemon is already listening on %s.", socket_path)
+                return
+
+        refresh_thread = Thread(target=self._refresh_loop, name="refresh", daemon=True)
+        refresh_thread.start()
+
+        previous_umask = os.umask(0o177)
+        try:
+            server = _DaemonServer(socket_path, self)
+        finally:
+            os.umask(previous_umask)
+
+        try:
+            with server:
+                server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self._stopped.set()
+            self._wakeup.set()
+            try:
+                os.unlink(socket_path)
+            except FileNotFoundError:
+                pass
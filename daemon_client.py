@@ -0,0 +1,78 @@
+import json
+import os
+import stat
+from typing import List, Optional, Sequence, Tuple, Type
+
+from configuration import Configuration
+from entries import get_entry_type
+from entry import Entry
+
+
+def get_socket_path() -> str:
+    socket_path = Configuration().get("daemon", {}).get("socket_path")
+    if socket_path:
+        return socket_path
+
+    runtime_dir = os.getenv("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return os.path.join(runtime_dir, "sysinfo.sock")
+
+    return os.path.join("/tmp", f"sysinfo-{os.getuid()}.sock")
+
+
+def query_daemon(
+    socket_path: str, entries: Sequence[Tuple[Type[Entry], dict]], timeout: float
+) -> Optional[List[Optional[Entry]]]:
+    # Anyone may create the `/tmp` fallback socket, so only the current user's one is trusted.
+    try:
+        socket_stat = os.stat(socket_path)
+    except OSError:
+        return None
+
+    if not stat.S_ISSOCK(socket_stat.st_mode) or socket_stat.st_uid != os.getuid():
+        return None
+
+    # Entries depending on the caller environment are returned as `None`, to be collected locally.
+    daemon_entries = [
+        (entry_cls, options) for entry_cls, options in entries if not entry_cls.uses_environment()
+    ]
+    request = {
+        "entries": [
+            {"type": get_entry_type(entry_cls), "options": options}
+            for entry_cls, options in daemon_entries
+        ]
+    }
+
+    # `socket` import is deferred, as no daemon is listening most of the time.
+    import socket
+
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client_socket:
+            client_socket.settimeout(timeout)
+            client_socket.connect(socket_path)
+            client_socket.sendall(json.dumps(request).encode() + b"\n")
+            with client_socket.makefile("rb") as f_response:
+                response = json.loads(f_response.readline())
+    except (OSError, ValueError):
+        return None
+
+    entries_values = response.get("entries")
+    if not isinstance(entries_values, list) or len(entries_values) != len(daemon_entries):
+        return None
+
+    entries_values_iterator = iter(entries_values)
+    entries_instances: List[Optional[Entry]] = []
+    for entry_cls, options in entries:
+        if entry_cls.uses_environment():
+            entries_instances.append(None)
+            continue
+
+        entry_value = next(entries_values_iterator)
+        if entry_value.get("timed_out"):
+            entries_instances.append(entry_cls.from_timeout(options))
+        else:
+            entry = entry_cls.from_value(entry_value.get("value"), options)
+            entry.refresh()
+            entries_instances.append(entry)
+
+    return entries_instances
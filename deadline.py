@@ -0,0 +1,33 @@
+import time
+from typing import Optional, Type
+
+from entry import Entry
+
+
+class Deadline:
+
+    def __init__(self, timeout: Optional[float] = None):
+        self._timeout = timeout
+        self.restart()
+
+    def restart(self) -> None:
+        self._started_at = time.monotonic()
+        self._expires_at = None if self._timeout is None else self._started_at + self._timeout
+
+    @classmethod
+    def from_milliseconds(cls, timeout_ms: Optional[float]) -> "Deadline":
+        return cls(None if timeout_ms is None else timeout_ms / 1000)
+
+    def get_entry_timeout(self, entry_cls: Type[Entry], options: dict) -> Optional[float]:
+        expires_at = self._expires_at
+
+        entry_timeout = entry_cls.get_timeout(options)
+        if entry_timeout is not None:
+            entry_expires_at = self._started_at + entry_timeout
+            if expires_at is None or entry_expires_at < expires_at:
+                expires_at = entry_expires_at
+
+        if expires_at is None:
+            return None
+
+        return max(0.0, expires_at - time.monotonic())
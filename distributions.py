@@ -1,8 +1,72 @@
 from contextlib import suppress
 from enum import Enum
-from typing import List, Optional
+from functools import lru_cache
+from types import ModuleType
+from typing import Dict, List, Optional
 
-import distro
+from sysroot import Sysroot
+
+OS_RELEASE_PATHS = ("/etc/os-release", "/usr/lib/os-release")
+
+
+@lru_cache(maxsize=None)
+def _read_os_release() -> Dict[str, str]:
+    for os_release_path in OS_RELEASE_PATHS:
+        try:
+            return _parse_os_release(Sysroot().read_text(os_release_path))
+        except OSError:
+            continue
+
+    return {}
+
+
+def _parse_os_release(os_release: str) -> Dict[str, str]:
+    os_release_info = {}
+    for line in os_release.splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+
+        key, separator, value = line.partition("=")
+        if not separator:
+            continue
+
+        if len(value) >= 2 and value[0] == value[-1] and value[0] in "\"'":
+            quote, value = value[0], value[1:-1]
+            if quote == '"':
+                for escaped_char in ("\\", '"', "$", "`"):
+                    value = value.replace("\\" + escaped_char, escaped_char)
+
+        os_release_info[key.strip().lower()] = value
+
+    return os_release_info
+
+
+@lru_cache(maxsize=None)
+def _lazy_load_distro_module() -> Optional[ModuleType]:
+    # `distro` is only a fallback for systems lacking an os-release file.
+    # It reads the host directly, so it is skipped for other sysroots and snapshots.
+    if not Sysroot().is_host:
+        return None
+
+    try:
+        import distro
+    except ImportError:
+        return None
+
+    return distro
+
+
+def _os_release_attr(attribute: str) -> str:
+    os_release_info = _read_os_release()
+    if os_release_info:
+        return os_release_info.get(attribute, "")
+
+    distro = _lazy_load_distro_module()
+    if distro is None:
+        return ""
+
+    return distro.os_release_attr(attribute)
 
 
 class Distributions(Enum):
@@ -20,9 +84,14 @@ class Distributions(Enum):
     def get_identifiers() -> List[str]:
         return [d.value for d in Distributions.__members__.values()]
 
+    @staticmethod
+    def clear_cache() -> None:
+        _read_os_release.cache_clear()
+        _detect_local_distribution.cache_clear()
+
     @staticmethod
     def get_local() -> "Distributions":
-        distribution = Distributions._vendor_detection()
+        distribution = _detect_local_distribution()
 
         if not distribution:
             return Distributions.LINUX
@@ -33,18 +102,53 @@ class Distributions(Enum):
     def _vendor_detection() -> Optional["Distributions"]:
 
         with suppress(ValueError):
-            return Distributions(distro.id())
+            return Distributions(Distributions._get_id())
 
-        for id_like in distro.like().split(" "):
+        for id_like in Distributions._get_id_like().split(" "):
             with suppress(ValueError):
                 return Distributions(id_like)
 
         return None
 
+    @staticmethod
+    def _get_id() -> str:
+        if _read_os_release():
+            return _os_release_attr("id").lower().replace(" ", "_")
+
+        distro = _lazy_load_distro_module()
+        return distro.id() if distro else ""
+
+    @staticmethod
+    def _get_id_like() -> str:
+        if _read_os_release():
+            return _os_release_attr("id_like")
+
+        distro = _lazy_load_distro_module()
+        return distro.like() if distro else ""
+
     @staticmethod
     def get_distro_name(pretty: bool = True) -> Optional[str]:
-        return distro.name(pretty=pretty) or None
+        if _read_os_release():
+            name = _os_release_attr("name")
+            if pretty:
+                pretty_name = _os_release_attr("pretty_name")
+                if pretty_name:
+                    return pretty_name
+
+                version = _os_release_attr("version")
+                if name and version:
+                    name = f"{name} {version}"
+
+            return name or None
+
+        distro = _lazy_load_distro_module()
+        return (distro.name(pretty=pretty) if distro else "") or None
 
     @staticmethod
     def get_ansi_color() -> Optional[str]:
-        return distro.os_release_attr("ansi_color") or None
+        return _os_release_attr("ansi_color") or None
+
+
+@lru_cache(maxsize=None)
+def _detect_local_distribution() -> Optional[Distributions]:
+    return Distributions._vendor_detection()
@@ -0,0 +1,135 @@
+import asyncio
+import os
+import socket
+import struct
+import time
+from typing import Optional, Tuple
+
+DNS_PORT = 53
+
+# See RFC 1035, sections 4.1 and 3.2.2.
+DNS_HEADER = struct.Struct("!HHHHHH")
+DNS_QUESTION_FOOTER = struct.Struct("!HH")
+DNS_RECORD_HEADER = struct.Struct("!HHIH")
+DNS_CLASS_IN = 1
+DNS_RECURSION_DESIRED = 0x0100
+DNS_RESPONSE = 0x8000
+DNS_RCODE_MASK = 0x000F
+DNS_MAX_UDP_PAYLOAD = 512
+
+ADDRESS_RECORDS_TYPES = {4: 1, 6: 28}
+ADDRESS_FAMILIES = {4: socket.AF_INET, 6: socket.AF_INET6}
+
+
+def build_query(name: str, ip_version: int) -> Tuple[int, bytes]:
+    query_id = int.from_bytes(os.urandom(2), "big")
+
+    qname = b"".join(
+        len(label).to_bytes(1, "big") + label
+        for label in name.rstrip(".").encode("IDNA").split(b".")
+    )
+    return query_id, (
+        DNS_HEADER.pack(query_id, DNS_RECURSION_DESIRED, 1, 0, 0, 0)
+        + qname
+        + b"\x00"
+        + DNS_QUESTION_FOOTER.pack(ADDRESS_RECORDS_TYPES[ip_version], DNS_CLASS_IN)
+    )
+
+
+def _skip_name(message: bytes, offset: int) -> int:
+    while True:
+        label_length = message[offset]
+        # A compression pointer always ends a name.
+        if label_length & 0xC0 == 0xC0:
+            return offset + 2
+        if not label_length:
+            return offset + 1
+
+        offset += 1 + label_length
+
+
+def parse_response(response: bytes, query_id: int, ip_version: int) -> Optional[str]:
+    try:
+        response_id, flags, nb_questions, nb_answers, _, _ = DNS_HEADER.unpack_from(response)
+        if response_id != query_id or not flags & DNS_RESPONSE or flags & DNS_RCODE_MASK:
+            return None
+
+        offset = DNS_HEADER.size
+        for _ in range(nb_questions):
+            offset = _skip_name(response, offset) + DNS_QUESTION_FOOTER.size
+
+        # Answers may start with CNAME records.
+        for _ in range(nb_answers):
+            offset = _skip_name(response, offset)
+            record_type, record_class, _, data_length = DNS_RECORD_HEADER.unpack_from(
+                response, offset
+            )
+            offset += DNS_RECORD_HEADER.size
+            if record_type == ADDRESS_RECORDS_TYPES[ip_version] and record_class == DNS_CLASS_IN:
+                return socket.inet_ntop(
+                    ADDRESS_FAMILIES[ip_version], response[offset:offset + data_length]
+                )
+
+            offset += data_length
+    except (IndexError, struct.error, ValueError):
+        return None
+
+    return None
+
+
+def query_address(
+    name: str, resolver: str, ip_version: int, timeout: float, port: int = DNS_PORT
+) -> Optional[str]:
+    # The query is sent over `ip_version`, as some resolvers answer with the querier address.
+    expires_at = time.monotonic() + timeout
+    try:
+        resolver_address = socket.getaddrinfo(
+            resolver, port, ADDRESS_FAMILIES[ip_version], socket.SOCK_DGRAM
+        )[0][4]
+        with socket.socket(ADDRESS_FAMILIES[ip_version], socket.SOCK_DGRAM) as dns_socket:
+            # Datagrams from other peers are dropped by a connected socket.
+            dns_socket.connect(resolver_address)
+            query_id, query = build_query(name, ip_version)
+            dns_socket.send(query)
+            while True:
+                dns_socket.settimeout(max(0.0, expires_at - time.monotonic()))
+                response = dns_socket.recv(DNS_MAX_UDP_PAYLOAD)
+                # Stray responses (e.g. to a former query) are ignored.
+                if response[:2] == query[:2]:
+                    return parse_response(response, query_id, ip_version)
+    except (OSError, UnicodeError):
+        return None
+
+
+async def query_address_async(
+    name: str, resolver: str, ip_version: int, timeout: float, port: int = DNS_PORT
+) -> Optional[str]:
+    try:
+        return await asyncio.wait_for(
+            _query_address_async(name, resolver, ip_version, port), timeout
+        )
+    except asyncio.TimeoutError:
+        return None
+
+
+async def _query_address_async(
+    name: str, resolver: str, ip_version: int, port: int
+) -> Optional[str]:
+    loop = asyncio.get_running_loop()
+    try:
+        resolver_address = (
+            await loop.getaddrinfo(
+                resolver, port, family=ADDRESS_FAMILIES[ip_version], type=socket.SOCK_DGRAM
+            )
+        )[0][4]
+        with socket.socket(ADDRESS_FAMILIES[ip_version], socket.SOCK_DGRAM) as dns_socket:
+            dns_socket.setblocking(False)
+            dns_socket.connect(resolver_address)
+            query_id, query = build_query(name, ip_version)
+            await loop.sock_sendall(dns_socket, query)
+            while True:
+                response = await loop.sock_recv(dns_socket, DNS_MAX_UDP_PAYLOAD)
+                if response[:2] == query[:2]:
+                    return parse_response(response, query_id, ip_version)
+    except (OSError, UnicodeError):
+        return None
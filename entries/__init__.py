@@ -0,0 +1,46 @@
+from importlib import import_module
+from typing import Dict, List, Tuple, Type
+
+from entry import Entry
+
+ENTRIES_DICT: Dict[str, Tuple[str, str]] = {
+    "User": ("user", "User"),
+    "Hostname": ("hostname", "Hostname"),
+    "Model": ("model", "Model"),
+    "Distro": ("distro", "Distro"),
+    "Kernel": ("kernel", "Kernel"),
+    "Uptime": ("uptime", "Uptime"),
+    "LoadAverage": ("load_average", "LoadAverage"),
+    "Processes": ("processes", "Processes"),
+    "WindowManager": ("window_manager", "WindowManager"),
+    "DesktopEnvironment": ("desktop_environment", "DesktopEnvironment"),
+    "Shell": ("shell", "Shell"),
+    "Terminal": ("terminal", "Terminal"),
+    "Packages": ("packages", "Packages"),
+    "Temperature": ("temperature", "Temperature"),
+    "CPU": ("cpu", "CPU"),
+    "GPU": ("gpu", "GPU"),
+    "RAM": ("ram", "RAM"),
+    "Disk": ("disk", "Disk"),
+    "DiskIO": ("disk_io", "DiskIO"),
+    "LAN_IP": ("lan_ip", "LanIP"),
+    "WAN_IP": ("wan_ip", "WanIP"),
+}
+
+
+def get_entries_names() -> List[str]:
+    return list(ENTRIES_DICT)
+
+
+def get_entry_type(entry_cls: Type[Entry]) -> str:
+    module_name = entry_cls.__module__.rpartition(".")[2]
+    for entry_type, entry_location in ENTRIES_DICT.items():
+        if entry_location == (module_name, entry_cls.__name__):
+            return entry_type
+
+    return entry_cls.__name__
+
+
+def lazy_load_entry_class(entry_name: str) -> Type[Entry]:
+    module_name, class_name = ENTRIES_DICT[entry_name]
+    return getattr(import_module(f"{__name__}.{module_name}"), class_name)
@@ -1,9 +1,62 @@
+import os
 import platform
 import re
-from subprocess import check_output
-from typing import Dict, List
+from contextlib import suppress
+from itertools import chain
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Optional, Set, Tuple
 
-from entry import Entry
+from entry import CACHE_TTL_UNTIL_REBOOT, Entry
+from sysroot import Sysroot
+
+# See `util-linux` `lscpu-arm.c`, which is much more exhaustive.
+ARM_IMPLEMENTERS = {
+    0x41: "ARM",
+    0x42: "Broadcom",
+    0x43: "Cavium",
+    0x46: "Fujitsu",
+    0x48: "HiSilicon",
+    0x4E: "NVIDIA",
+    0x50: "APM",
+    0x51: "Qualcomm",
+    0x53: "Samsung",
+    0x61: "Apple",
+    0x6D: "Microsoft",
+    0xC0: "Ampere",
+}
+ARM_PARTS = {
+    (0x41, 0xD03): "Cortex-A53",
+    (0x41, 0xD04): "Cortex-A35",
+    (0x41, 0xD05): "Cortex-A55",
+    (0x41, 0xD07): "Cortex-A57",
+    (0x41, 0xD08): "Cortex-A72",
+    (0x41, 0xD09): "Cortex-A73",
+    (0x41, 0xD0A): "Cortex-A75",
+    (0x41, 0xD0B): "Cortex-A76",
+    (0x41, 0xD0C): "Neoverse-N1",
+    (0x41, 0xD0D): "Cortex-A77",
+    (0x41, 0xD40): "Neoverse-V1",
+    (0x41, 0xD41): "Cortex-A78",
+    (0x41, 0xD44): "Cortex-X1",
+    (0x41, 0xD46): "Cortex-A510",
+    (0x41, 0xD47): "Cortex-A710",
+    (0x41, 0xD48): "Cortex-X2",
+    (0x41, 0xD49): "Neoverse-N2",
+    (0x41, 0xD4F): "Neoverse-V2",
+    (0x41, 0xD80): "Cortex-A520",
+    (0x41, 0xD81): "Cortex-A720",
+    (0x41, 0xD82): "Cortex-X4",
+    (0x41, 0xD84): "Neoverse-V3",
+    (0x41, 0xD8E): "Neoverse-N3",
+    (0x43, 0x0AF): "ThunderX2 99xx",
+    (0x46, 0x001): "A64FX",
+    (0x48, 0xD01): "Kunpeng-920",
+    (0x4E, 0x004): "Carmel",
+    (0xC0, 0xAC3): "Ampere-1",
+    (0xC0, 0xAC4): "Ampere-1a",
+}
+
+CACHE_TYPES_SUFFIXES = {"Data": "d", "Instruction": "i"}
+CACHE_SIZES_UNITS = {"K": 1, "M": 1024, "G": 1024 ** 2}
 
 
 class CPU(Entry):
@@ -12,10 +65,6 @@ class CPU(Entry):
         r"^model name\s*:\s*(.*)$",
         flags=re.IGNORECASE | re.MULTILINE,
     )
-    _PHYSICAL_ID_REGEXP = re.compile(
-        r"^physical id\s*:\s*(\d+)$",
-        flags=re.IGNORECASE | re.MULTILINE,
-    )
     _THREADS_PER_CORE_REGEXP = re.compile(
         r"^Thread\(s\) per core\s*:\s*(\d+)$",
         flags=re.IGNORECASE | re.MULTILINE,
@@ -37,42 +86,323 @@ class CPU(Entry):
         flags=re.IGNORECASE | re.MULTILINE,
     )
 
+    # Processors don't change until next boot, but the daemon still refreshes them once a day.
+    _CACHE_TTL = CACHE_TTL_UNTIL_REBOOT
+    _REFRESH_INTERVAL = 24 * 60 * 60
+    _VALUE_VERSION = 4
+
+    _SYSFS_CPU_PATH = "/sys/devices/system/cpu"
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
+        models: List[Dict[str, int]] = []
+        topology, caches, frequency, cpus_packages = None, None, None, {}
         if platform.system() == "Linux":
-            self.value = self._parse_proc_cpuinfo()
-        if not self.value:
-            self.value = self._parse_lscpu_output()
+            topology, cpus_packages, clusters = self._read_sysfs_topology()
+            caches = self._read_sysfs_caches(clusters)
+            frequency = self._read_sysfs_frequency()
+
+            models = self._parse_cpuinfo(
+                self._read_proc_cpuinfo(), cpus_packages
+            ) or self._parse_arm_cpuinfo(self._read_proc_cpuinfo(), cpus_packages)
+        if not models:
+            models = self._parse_lscpu_output()
+
+        if models:
+            self.value = {
+                "models": models,
+                "topology": topology,
+                "caches": caches,
+                "frequency": frequency,
+            }
+            self.refresh()
+
+    @staticmethod
+    def _read_proc_cpuinfo() -> Iterator[str]:
+        # Lines are streamed, as parsing usually stops after the first processors.
+        with suppress(OSError, UnicodeDecodeError):
+            yield from Sysroot().iter_lines("/proc/cpuinfo", encoding="ASCII")
+
+    @staticmethod
+    def _parse_cpuinfo(
+        cpu_info_lines: Iterable[str], cpus_packages: Dict[int, int]
+    ) -> List[Dict[str, int]]:
+        packages: Dict[int, Dict[str, int]] = {}
+        model_names: Dict[str, str] = {}
+
+        packages_cpus: Dict[int, int] = {}
+        for physical_package_id in cpus_packages.values():
+            packages_cpus[physical_package_id] = packages_cpus.get(physical_package_id, 0) + 1
+
+        raw_model_name = physical_id = None
+        in_block = is_hybrid = False
+        # A trailing empty line closes the last processor block.
+        for line in chain(cpu_info_lines, ("",)):
+            if line:
+                in_block = True
+                if line.startswith("model name"):
+                    raw_model_name = line.partition(":")[2]
+                elif line.startswith("physical id"):
+                    try:
+                        physical_id = int(line.partition(":")[2])
+                    except ValueError:
+                        pass
+                continue
+
+            if not in_block:
+                continue
+
+            if raw_model_name is None or physical_id is None:
+                # All the blocks have the same fields (e.g. ARM ones have no model name).
+                return []
+
+            # Model names are only normalised once, not once per logical processor.
+            model_name = model_names.get(raw_model_name)
+            if model_name is None:
+                model_name = model_names[raw_model_name] = " ".join(raw_model_name.split())
+
+            package = packages.setdefault(physical_id, {})
+            package[model_name] = package.get(model_name, 0) + 1
+            is_hybrid = is_hybrid or len(package) > 1
+
+            raw_model_name = physical_id = None
+            in_block = False
+
+            # The model name is the package brand string, so once each package known from sysfs
+            # has been seen, remaining processors are counted from there (unless they differ).
+            if packages_cpus and not is_hybrid and packages.keys() == packages_cpus.keys():
+                return [
+                    {next(iter(packages[physical_package_id])): packages_cpus[physical_package_id]}
+                    for physical_package_id in sorted(packages)
+                ]
+
+        return [packages[physical_package_id] for physical_package_id in sorted(packages)]
+
+    @staticmethod
+    def _parse_arm_cpuinfo(
+        cpu_info_lines: Iterable[str], cpus_packages: Dict[int, int]
+    ) -> List[Dict[str, int]]:
+        packages: Dict[int, Dict[str, int]] = {}
+
+        processor = implementer = part = None
+        # ARM processors blocks have no model name, only MIDR register fields.
+        for line in chain(cpu_info_lines, ("",)):
+            if not line:
+                if implementer is not None and part is not None:
+                    implementer_name = ARM_IMPLEMENTERS.get(implementer, f"{implementer:#x}")
+                    model_name = (
+                        f"{implementer_name} {ARM_PARTS.get((implementer, part), f'{part:#x}')}"
+                    )
+
+                    package = packages.setdefault(cpus_packages.get(processor, 0), {})
+                    package[model_name] = package.get(model_name, 0) + 1
+
+                processor = implementer = part = None
+                continue
+
+            key, _, value = line.partition(":")
+            key = key.rstrip()
+            try:
+                if key == "processor":
+                    processor = int(value)
+                elif key == "CPU implementer":
+                    implementer = int(value, 16)
+                elif key == "CPU part":
+                    part = int(value, 16)
+            except ValueError:
+                pass
+
+        return [packages[physical_id] for physical_id in sorted(packages)]
+
+    @staticmethod
+    def _parse_cpu_list(cpu_list: str) -> List[int]:
+        cpus = []
+        for cpu_range in filter(None, cpu_list.strip().split(",")):
+            first_cpu, _, last_cpu = cpu_range.partition("-")
+            cpus.extend(range(int(first_cpu), int(last_cpu or first_cpu) + 1))
+        return cpus
 
     @classmethod
-    def _parse_proc_cpuinfo(cls) -> List[Dict[str, int]]:
+    def _read_sysfs_topology(
+        cls,
+    ) -> Tuple[Optional[dict], Dict[int, int], Dict[int, FrozenSet[int]]]:
+        sysroot = Sysroot()
         try:
-            with open("/proc/cpuinfo", encoding="ASCII") as f_cpu_info:
-                cpu_info = f_cpu_info.read()
+            cpus = sorted(
+                int(name[3:])
+                for name in sysroot.listdir(cls._SYSFS_CPU_PATH)
+                if name.startswith("cpu") and name[3:].isdigit()
+            )
         except OSError:
-            return []
+            return None, {}, {}
 
-        model_names = cls._MODEL_NAME_REGEXP.findall(cpu_info)
-        physical_ids = cls._PHYSICAL_ID_REGEXP.findall(cpu_info)
+        cpus_packages: Dict[int, int] = {}
+        cores = 0
+        clusters: Dict[int, FrozenSet[int]] = {}
+        clustered_cpus: Set[int] = set()
+        threads_per_core = 0
+        for cpu in cpus:
+            # SMT siblings share their core topology, which is only read once per core.
+            if cpu in cpus_packages:
+                continue
 
-        cpus_list: List[Dict[str, int]] = []
+            topology_path = f"{cls._SYSFS_CPU_PATH}/cpu{cpu}/topology"
+            try:
+                try:
+                    core_cpus = sysroot.read_text(f"{topology_path}/core_cpus_list")
+                except FileNotFoundError:
+                    core_cpus = sysroot.read_text(f"{topology_path}/thread_siblings_list")
+                physical_package_id = int(
+                    sysroot.read_text(f"{topology_path}/physical_package_id")
+                )
+            except (OSError, ValueError):
+                # Offline processors have no topology.
+                continue
+
+            siblings = cls._parse_cpu_list(core_cpus) or [cpu]
+            for sibling in siblings:
+                cpus_packages[sibling] = physical_package_id
+            cores += 1
+            threads_per_core = max(threads_per_core, len(siblings))
+
+            if cpu not in clustered_cpus:
+                try:
+                    cluster_cpus = frozenset(
+                        cls._parse_cpu_list(
+                            sysroot.read_text(f"{topology_path}/cluster_cpus_list")
+                        )
+                    )
+                except (OSError, ValueError):
+                    cluster_cpus = frozenset(siblings)
+
+                clusters[cpu] = cluster_cpus | {cpu}
+                clustered_cpus.update(clusters[cpu])
 
-        for model_name, physical_id in zip(model_names, physical_ids):
-            model_name = re.sub(r"\s+", " ", model_name)
+        if not cpus_packages:
+            return None, {}, {}
 
+        topology = {
+            "packages": len(set(cpus_packages.values())),
+            "clusters": len(clusters),
+            "cores": cores,
+            "threads": len(cpus_packages),
+            "threads_per_core": threads_per_core,
+        }
+        return topology, cpus_packages, clusters
+
+    @classmethod
+    def _read_sysfs_caches(cls, clusters: Dict[int, FrozenSet[int]]) -> Optional[Dict[str, int]]:
+        sysroot = Sysroot()
+
+        caches: Dict[str, int] = {}
+        present_shared_caches = set()
+        # Cores of a cluster are identical, so caches are only read from the first of them.
+        for cpu, cluster_cpus in clusters.items():
+            cache_path = f"{cls._SYSFS_CPU_PATH}/cpu{cpu}/cache"
             try:
-                cpus_list[int(physical_id)][model_name] += 1
-            except KeyError:
-                cpus_list[int(physical_id)][model_name] = 1
-            except IndexError:
-                cpus_list.append({model_name: 1})
-        return cpus_list
+                indexes = [name for name in sysroot.listdir(cache_path) if name.startswith("index")]
+            except OSError:
+                continue
+
+            for index in indexes:
+                try:
+                    level = sysroot.read_text(f"{cache_path}/{index}/level").strip()
+                    cache_type = sysroot.read_text(f"{cache_path}/{index}/type").strip()
+                    shared_cpus = frozenset(
+                        cls._parse_cpu_list(
+                            sysroot.read_text(f"{cache_path}/{index}/shared_cpu_list")
+                        )
+                    )
+                    size = sysroot.read_text(f"{cache_path}/{index}/size").strip()
+                    size_kib = int(size.rstrip("KMG")) * CACHE_SIZES_UNITS.get(size[-1:], 1)
+                except (OSError, ValueError):
+                    continue
+
+                cache_name = f"L{level}" + CACHE_TYPES_SUFFIXES.get(cache_type, "")
+                if shared_cpus >= cluster_cpus:
+                    # Caches shared beyond a cluster are only accounted once.
+                    if (cache_name, shared_cpus) in present_shared_caches:
+                        continue
+                    present_shared_caches.add((cache_name, shared_cpus))
+                    instances = 1
+                else:
+                    instances = len(cluster_cpus) // max(1, len(shared_cpus & cluster_cpus))
+
+                caches[cache_name] = caches.get(cache_name, 0) + size_kib * instances
+
+        return dict(sorted(caches.items())) or None
+
+    @classmethod
+    def _read_sysfs_frequency(cls) -> Optional[dict]:
+        sysroot = Sysroot()
+        cpufreq_path = f"{cls._SYSFS_CPU_PATH}/cpufreq"
+        try:
+            # A policy is shared by all the processors of a frequency domain.
+            policies = [name for name in sysroot.listdir(cpufreq_path) if name.startswith("policy")]
+        except OSError:
+            return None
+
+        # Only hardware limits are read here, as the value is cached until reboot.
+        min_frequencies, max_frequencies = [], []
+        for policy in policies:
+            policy_path = f"{cpufreq_path}/{policy}"
+            for frequencies, file_name in (
+                (min_frequencies, "cpuinfo_min_freq"),
+                (max_frequencies, "cpuinfo_max_freq"),
+            ):
+                with suppress(OSError, ValueError):
+                    frequencies.append(int(sysroot.read_text(f"{policy_path}/{file_name}")) / 1000)
+
+        if not max_frequencies:
+            return None
+
+        return {
+            "min_mhz": min(min_frequencies) if min_frequencies else None,
+            "max_mhz": max(max_frequencies),
+        }
+
+    @classmethod
+    def _read_sysfs_scaling(cls) -> dict:
+        sysroot = Sysroot()
+        cpufreq_path = f"{cls._SYSFS_CPU_PATH}/cpufreq"
+        try:
+            policies = [name for name in sysroot.listdir(cpufreq_path) if name.startswith("policy")]
+        except OSError:
+            policies = []
+
+        current_frequencies = []
+        governors: Dict[str, int] = {}
+        for policy in policies:
+            policy_path = f"{cpufreq_path}/{policy}"
+            with suppress(OSError, ValueError):
+                current_frequencies.append(
+                    int(sysroot.read_text(f"{policy_path}/scaling_cur_freq")) / 1000
+                )
+
+            with suppress(OSError):
+                governor = sysroot.read_text(f"{policy_path}/scaling_governor").strip()
+                governors[governor] = governors.get(governor, 0) + 1
+
+        return {
+            "current_mhz": (
+                sum(current_frequencies) / len(current_frequencies) if current_frequencies else None
+            ),
+            "governor": max(governors, key=governors.__getitem__) if governors else None,
+        }
+
+    def refresh(self) -> None:
+        # Current frequency and scaling governor are sampled at each collection, even from cache.
+        if self.value and self.value["frequency"]:
+            self.value = {
+                **self.value,
+                "frequency": {**self.value["frequency"], **self._read_sysfs_scaling()},
+            }
 
     @classmethod
     def _parse_lscpu_output(cls) -> List[Dict[str, int]]:
         try:
-            cpu_info = check_output("lscpu", env={"LANG": "C"}, universal_newlines=True)
+            cpu_info = Sysroot().check_output("lscpu", env={**os.environ, "LANG": "C"})
         except FileNotFoundError:
             return []
 
@@ -97,13 +427,26 @@ class CPU(Entry):
             return
 
         entries = []
-        for cpus in self.value:
+        for cpus in self.value["models"]:
             for model_name, cpu_count in cpus.items():
                 if cpu_count > 1:
                     entries.append(f"{cpu_count} x {model_name}")
                 else:
                     entries.append(model_name)
 
+        topology = self.value["topology"]
+        if topology and self.options.get("show_topology"):
+            entries.append(
+                "{packages} package(s), {cores} core(s), {threads} thread(s)".format(**topology)
+            )
+
+        frequency = self.value["frequency"]
+        if frequency and self.options.get("show_frequency"):
+            entries.append(
+                f"{frequency['max_mhz'] / 1000:.2f} GHz"
+                + (f" ({frequency['governor']})" if frequency.get("governor") else "")
+            )
+
         if self.options.get("one_line"):
             output.append(self.name, ", ".join(entries))
         else:
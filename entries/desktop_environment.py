@@ -1,7 +1,6 @@
-import os
-
 from entry import Entry
 from processes import Processes
+from sysroot import Sysroot
 
 DE_DICT = {
     "cinnamon": "Cinnamon",
@@ -21,13 +20,16 @@ class DesktopEnvironment(Entry):
 
     _PRETTY_NAME = "Desktop Environment"
 
+    _USES_PROCESSES = True
+    _USES_ENVIRONMENT = True
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
-        processes = Processes().list
+        process_table = Processes().table
         for de_id, de_name in DE_DICT.items():
-            if de_id in processes:
+            if de_id in process_table:
                 self.value = de_name
                 break
         else:
-            self.value = os.getenv("XDG_CURRENT_DESKTOP")
+            self.value = Sysroot().getenv("XDG_CURRENT_DESKTOP")
@@ -1,52 +1,188 @@
+import os
 import re
-from subprocess import DEVNULL, PIPE, run
-from typing import Dict
+import time
+from contextvars import copy_context
+from subprocess import CalledProcessError
+from threading import Thread
+from typing import Dict, List, Optional, Tuple
 
 from colors import Colors
 from entry import Entry
+from sysroot import Sysroot
+
+PSEUDO_FILESYSTEM_TYPES = frozenset(
+    (
+        "autofs", "binfmt_misc", "bpf", "cgroup", "cgroup2", "configfs", "debugfs", "devpts",
+        "devtmpfs", "efivarfs", "fusectl", "hugetlbfs", "mqueue", "nsfs", "overlay", "proc",
+        "pstore", "ramfs", "rpc_pipefs", "securityfs", "squashfs", "sysfs", "tmpfs", "tracefs",
+    )
+)
+NETWORK_FILESYSTEM_TYPES = frozenset(
+    (
+        "9p", "afs", "ceph", "cifs", "davfs", "fuse.rclone", "fuse.s3fs", "fuse.sshfs",
+        "glusterfs", "lustre", "ncpfs", "nfs", "nfs4", "smb3", "smbfs", "sshfs",
+    )
+)
 
 
 class Disk(Entry):
 
+    _DYNAMIC = True
+
+    _LOCAL_DEVICE_PATH_REGEXP = re.compile(r"^\/dev\/(?:(?!loop|[rs]?vnd|lofi|dm).)+$")
+    _MOUNTINFO_ESCAPE_REGEXP = re.compile(r"\\([0-7]{3})")
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
-        self._disk_dict = self._get_df_output_dict()
+        self._disk_dict = self._get_mountinfo_dict(self.options.get("mount_timeout", 1))
+        if self._disk_dict is None:
+            self._disk_dict = self._get_df_output_dict()
         self.value = self._get_local_filesystems()
 
-    def _get_local_filesystems(self) -> Dict[str, dict]:
+    async def collect_async(self) -> None:
+        # `asyncio` is always loaded already when this collector is used.
+        import asyncio
 
-        device_path_regexp = re.compile(r"^\/dev\/(?:(?!loop|[rs]?vnd|lofi|dm).)+$")
+        # Native collection blocks (up to `mount_timeout`) on its `statvfs` threads, off the loop.
+        self._disk_dict = await asyncio.get_running_loop().run_in_executor(
+            None, self._get_mountinfo_dict, self.options.get("mount_timeout", 1)
+        )
+        if self._disk_dict is not None:
+            self.value = self._get_local_filesystems()
+            return
 
-        disk_dict = self._disk_dict
+        try:
+            df_output = await Sysroot().check_output_async(
+                "df", "-P", "-k", env={**os.environ, "LANG": "C"}
+            )
+        except FileNotFoundError:
+            df_output = ""
+        except CalledProcessError as process_error:
+            df_output = process_error.output
+
+        self._disk_dict = self._parse_df_output(df_output)
+        self.value = self._get_local_filesystems()
 
+    def _get_local_filesystems(self) -> Dict[str, dict]:
         local_disk_dict: Dict[str, dict] = {}
-        for mount_point, disk_data in disk_dict.items():
+        present_device_paths = set()
+        for mount_point, disk_data in self._disk_dict.items():
             if (
-                device_path_regexp.match(disk_data["device_path"])
-                and not any(
-                    disk_data["device_path"] == present_disk_data["device_path"]
-                    for present_disk_data in local_disk_dict.values()
-                )
+                self._LOCAL_DEVICE_PATH_REGEXP.match(disk_data["device_path"])
+                and disk_data["device_path"] not in present_device_paths
             ):
                 local_disk_dict[mount_point] = disk_data
+                present_device_paths.add(disk_data["device_path"])
         return local_disk_dict
 
-    @staticmethod
-    def _get_df_output_dict() -> Dict[str, dict]:
+    @classmethod
+    def _parse_mountinfo(cls, mountinfo: str) -> List[Tuple[str, str]]:
+        local_mounts = []
+        present_devices = set()
+        for line in mountinfo.splitlines():
+            # See proc(5) : optional fields are terminated by a single hyphen.
+            fields, separator, filesystem_fields = line.partition(" - ")
+            if not separator:
+                continue
+
+            fields = fields.split(" ")
+            filesystem_fields = filesystem_fields.split(" ")
+            if len(fields) < 5 or len(filesystem_fields) < 2:
+                continue
+
+            device_number, mount_point = fields[2], fields[4]
+            filesystem_type, device_path = filesystem_fields[0], filesystem_fields[1]
+            if (
+                filesystem_type in PSEUDO_FILESYSTEM_TYPES
+                or filesystem_type in NETWORK_FILESYSTEM_TYPES
+                or not cls._LOCAL_DEVICE_PATH_REGEXP.match(device_path)
+            ):
+                continue
+
+            # Bind mounts share a device number, btrfs subvolumes share a device path.
+            if device_number in present_devices or device_path in present_devices:
+                continue
+            present_devices.add(device_number)
+            present_devices.add(device_path)
+
+            local_mounts.append(
+                (
+                    cls._MOUNTINFO_ESCAPE_REGEXP.sub(
+                        lambda match: chr(int(match.group(1), 8)), mount_point
+                    ),
+                    device_path,
+                )
+            )
+
+        return local_mounts
+
+    def _get_mountinfo_dict(self, timeout: float) -> Optional[Dict[str, dict]]:
+        sysroot = Sysroot()
+        try:
+            mountinfo = sysroot.read_text("/proc/self/mountinfo")
+        except OSError:
+            return None
+
+        local_mounts = self._parse_mountinfo(mountinfo)
+
+        statvfs_results: Dict[str, Tuple[int, int, int]] = {}
+
+        def _statvfs(mount_point: str) -> None:
+            try:
+                statvfs_results[mount_point] = sysroot.statvfs(mount_point)
+            except OSError:
+                pass
+
+        # A hung mount blocks `statvfs` in the kernel, so calls are run (concurrently) in daemon
+        # threads that can be abandoned, in copies of the entry context (for profiling).
+        statvfs_threads = []
+        for mount_point, _ in local_mounts:
+            statvfs_thread = Thread(
+                target=copy_context().run, args=(_statvfs, mount_point), daemon=True
+            )
+            statvfs_thread.start()
+            statvfs_threads.append(statvfs_thread)
+
+        # Threads run concurrently, so every mount gets (at least) `timeout` seconds overall.
+        deadline = time.monotonic() + timeout
+        disk_dict = {}
+        for (mount_point, device_path), statvfs_thread in zip(local_mounts, statvfs_threads):
+            statvfs_thread.join(max(0.0, deadline - time.monotonic()))
+            if statvfs_thread.is_alive():
+                self._logger.warning(
+                    "Skipping %s, which did not respond within %ss.", mount_point, timeout
+                )
+                continue
+
+            statvfs_result = statvfs_results.get(mount_point)
+            if statvfs_result is None:
+                continue
+
+            fragment_size, total_fragments, free_fragments = statvfs_result
+            total_blocks = total_fragments * fragment_size // 1024
+            if total_blocks == 0:
+                continue
+
+            disk_dict[mount_point] = {
+                "device_path": device_path,
+                "used_blocks": (total_fragments - free_fragments) * fragment_size // 1024,
+                "total_blocks": total_blocks,
+            }
+
+        return disk_dict
+
+    @classmethod
+    def _get_df_output_dict(cls) -> Dict[str, dict]:
         try:
-            df_output = run(
-                ["df", "-P", "-k"],
-                env={"LANG": "C"},
-                universal_newlines=True,
-                stdout=PIPE,
-                stderr=DEVNULL,
-                check=False,
-                encoding="utf-8",
-            ).stdout
+            df_output = Sysroot().run(["df", "-P", "-k"], env={**os.environ, "LANG": "C"}).stdout
         except FileNotFoundError:
             return {}
 
+        return cls._parse_df_output(df_output)
+
+    @staticmethod
+    def _parse_df_output(df_output: str) -> Dict[str, dict]:
         df_output_dict = {}
         for df_entry_match in re.finditer(
             r"""^(?P<device_path>.+?)\s+
@@ -0,0 +1,180 @@
+import asyncio
+import re
+import time
+from typing import Dict, Optional, Tuple
+
+from colors import Colors
+from entry import Entry
+from sysroot import Sysroot
+
+DISKSTATS_SECTOR_SIZE = 512
+# Counters are `unsigned long`, so they wrap around at 2 ** 32 on 32-bit kernels.
+DISKSTATS_COUNTER_MODULUS = 2 ** 32
+# Half of the counter range, far more than can be transferred between two samples.
+DISKSTATS_MAX_WRAPPED_DELTA = DISKSTATS_COUNTER_MODULUS // 2
+
+
+class DiskIO(Entry):
+
+    _PRETTY_NAME = "Disk I/O"
+    _DYNAMIC = True
+
+    _IGNORED_DEVICES_REGEXP = re.compile(r"^(?:loop|ram|zram|fd|sr)\d+$")
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        first_sample = self._sample()
+        if first_sample is None:
+            return
+
+        time.sleep(self.options.get("interval", 0.5))
+        self._set_value(first_sample, self._sample())
+
+    async def collect_async(self) -> None:
+        first_sample = self._sample()
+        if first_sample is None:
+            return
+
+        await asyncio.sleep(self.options.get("interval", 0.5))
+        self._set_value(first_sample, self._sample())
+
+    def _sample(self) -> Optional[Tuple[float, Dict[str, Tuple[int, ...]]]]:
+        sysroot = Sysroot()
+        # Rates can't be computed from a single recorded sample.
+        if sysroot.replaying:
+            return None
+
+        try:
+            diskstats = sysroot.read_text("/proc/diskstats", encoding="ASCII")
+        except (OSError, UnicodeDecodeError):
+            return None
+
+        return time.monotonic(), self._parse_diskstats(diskstats, self._get_whole_disks())
+
+    @staticmethod
+    def _get_whole_disks() -> Optional[frozenset]:
+        # Partitions are left out, as their I/O is already accounted by their parent disk.
+        try:
+            return frozenset(Sysroot().listdir("/sys/block"))
+        except OSError:
+            return None
+
+    @classmethod
+    def _parse_diskstats(
+        cls, diskstats: str, whole_disks: Optional[frozenset] = None
+    ) -> Dict[str, Tuple[int, ...]]:
+        devices_stats = {}
+        for line in diskstats.splitlines():
+            fields = line.split()
+            # See the kernel `Documentation/admin-guide/iostats.rst`.
+            if len(fields) < 14:
+                continue
+
+            device = fields[2]
+            if cls._IGNORED_DEVICES_REGEXP.match(device) or (
+                whole_disks is not None and device.replace("/", "!") not in whole_disks
+            ):
+                continue
+
+            # reads, read sectors, ms reading, writes, written sectors, ms writing, ms doing I/O
+            devices_stats[device] = tuple(
+                int(fields[field_index]) for field_index in (3, 5, 6, 7, 9, 10, 12)
+            )
+
+        return devices_stats
+
+    def _set_value(
+        self,
+        first_sample: Tuple[float, Dict[str, Tuple[int, ...]]],
+        second_sample: Optional[Tuple[float, Dict[str, Tuple[int, ...]]]],
+    ) -> None:
+        if second_sample is None:
+            return
+
+        (first_time, first_stats), (second_time, second_stats) = first_sample, second_sample
+        elapsed_time = second_time - first_time
+        if elapsed_time <= 0:
+            return
+
+        devices_io = {}
+        for device, stats in second_stats.items():
+            previous_stats = first_stats.get(device)
+            if previous_stats is None:
+                continue
+
+            reads, read_sectors, read_ms, writes, written_sectors, write_ms, io_ms = (
+                self._get_counter_delta(value, previous_value)
+                for value, previous_value in zip(stats, previous_stats)
+            )
+            operations = reads + writes
+
+            devices_io[device] = {
+                "read_bytes_per_second": read_sectors * DISKSTATS_SECTOR_SIZE / elapsed_time,
+                "write_bytes_per_second": written_sectors * DISKSTATS_SECTOR_SIZE / elapsed_time,
+                "read_iops": reads / elapsed_time,
+                "write_iops": writes / elapsed_time,
+                "await_ms": (read_ms + write_ms) / operations if operations else 0.0,
+                "util_percent": min(100.0, io_ms / (elapsed_time * 1000) * 100),
+            }
+
+        self.value = devices_io
+
+    @staticmethod
+    def _get_counter_delta(value: int, previous_value: int) -> int:
+        if value >= previous_value:
+            return value - previous_value
+
+        # A 32-bit counter wraps around from near its maximum. Any other decrease (including of a
+        # 64-bit counter) means its device has been reset (re-attached), with no delta to report.
+        wrapped_delta = value + DISKSTATS_COUNTER_MODULUS - previous_value
+        if (
+            previous_value >= DISKSTATS_COUNTER_MODULUS
+            or wrapped_delta > DISKSTATS_MAX_WRAPPED_DELTA
+        ):
+            return 0
+
+        return wrapped_delta
+
+    @staticmethod
+    def _bytes_to_human_readable(byte_count: float, suffix: str = "B/s") -> str:
+        for unit in ("", "Ki", "Mi", "Gi", "Ti", "Pi", "Ei", "Zi", "Yi"):
+            if byte_count < 1024.0:
+                break
+
+            byte_count /= 1024.0
+
+        return f"{byte_count:02.1f} {unit}{suffix}"
+
+    def output(self, output) -> None:
+        if not self.value:
+            super().output(output)
+            return
+
+        for device, device_io in self.value.items():
+            util_color = Colors.get_level_color(
+                device_io["util_percent"],
+                self.options.get("warning_util_percent", 50),
+                self.options.get("danger_util_percent", 80),
+            )
+            await_color = Colors.get_level_color(
+                device_io["await_ms"],
+                self.options.get("warning_await_ms", 10),
+                self.options.get("danger_await_ms", 50),
+            )
+
+            output.append(
+                self.name,
+                "{}: R {} / W {}, {:.0f} IOPS, {}{:.1f} ms{}, {}{:.0f}%{}".format(
+                    device,
+                    self._bytes_to_human_readable(device_io["read_bytes_per_second"]),
+                    self._bytes_to_human_readable(device_io["write_bytes_per_second"]),
+                    device_io["read_iops"] + device_io["write_iops"],
+                    await_color,
+                    device_io["await_ms"],
+                    Colors.CLEAR,
+                    util_color,
+                    device_io["util_percent"],
+                    Colors.CLEAR,
+                ),
+            )
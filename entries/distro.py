@@ -4,16 +4,23 @@ from typing import Optional
 
 from distributions import Distributions
 from entry import Entry
+from sysroot import Sysroot
 
 
 class Distro(Entry):
 
+    _CACHE_TTL = 24 * 60 * 60
+    _CACHE_DEPENDENCIES = ("/etc/os-release", "/usr/lib/os-release", "/etc/lsb-release")
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
         distro_name = Distributions.get_distro_name()
 
-        self.value = {"name": distro_name, "arch": platform.machine()}
+        self.value = {
+            "name": distro_name,
+            "arch": Sysroot().lookup("platform:machine", platform.machine),
+        }
 
     def output(self, output) -> None:
         output.append(
@@ -1,33 +1,109 @@
 import platform
-from subprocess import DEVNULL, CalledProcessError, check_output
-from typing import List
+from subprocess import CalledProcessError
+from typing import List, Optional
 
 from entry import Entry
+from pci_ids import PciIds
+from sysroot import Sysroot
+
+
+# PCI display controllers subclasses, in lspci-based detection order (3D, VGA, then others).
+DISPLAY_SUBCLASSES_ORDER = {0x02: 0, 0x00: 1, 0x80: 2, 0x01: 3}
 
 
 class GPU(Entry):
 
+    _CACHE_TTL = 24 * 60 * 60
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
         if platform.system() == "Linux":
-            self.value = self._parse_lspci_output()
+            self.value = self._get_pci_gpus()
+            if self.value is None:
+                self.value = self._parse_lspci_output()
 
+        self._truncate_to_max_count()
+
+    async def collect_async(self) -> None:
+        if platform.system() == "Linux":
+            self.value = self._get_pci_gpus()
+            if self.value is None:
+                try:
+                    self.value = self._filter_gpus(await Sysroot().check_output_async("lspci"))
+                except (FileNotFoundError, CalledProcessError):
+                    self.value = []
+
+        self._truncate_to_max_count()
+
+    def _truncate_to_max_count(self) -> None:
         max_count = self.options.get("max_count", 2)
-        if max_count is not False:
+        if self.value and max_count is not False:
             self.value = self.value[:max_count]
 
     @staticmethod
-    def _parse_lspci_output() -> List[str]:
+    def _get_pci_gpus() -> Optional[List[str]]:
+        sysroot = Sysroot()
+        try:
+            pci_addresses = sorted(sysroot.listdir("/sys/bus/pci/devices"))
+        except OSError:
+            return None
+
+        pci_ids = PciIds()
+        gpus = []
+        for pci_address in pci_addresses:
+            device_path = f"/sys/bus/pci/devices/{pci_address}"
+            try:
+                pci_class = int(sysroot.read_text(f"{device_path}/class"), 16)
+            except (OSError, ValueError):
+                continue
+
+            if pci_class >> 16 != 0x03:
+                continue
+
+            try:
+                vendor_id = int(sysroot.read_text(f"{device_path}/vendor"), 16)
+                device_id = int(sysroot.read_text(f"{device_path}/device"), 16)
+            except (OSError, ValueError):
+                continue
+
+            try:
+                revision = int(sysroot.read_text(f"{device_path}/revision"), 16)
+            except (OSError, ValueError):
+                revision = 0
+
+            # Mimics lspci output when names are unknown.
+            gpu_name = "{} {}".format(
+                pci_ids.get_vendor_name(vendor_id) or f"Vendor {vendor_id:04x}",
+                pci_ids.get_device_name(vendor_id, device_id) or f"Device {device_id:04x}",
+            )
+            if revision:
+                gpu_name += f" (rev {revision:02x})"
+
+            subclass_order = DISPLAY_SUBCLASSES_ORDER.get(
+                pci_class >> 8 & 0xFF, len(DISPLAY_SUBCLASSES_ORDER)
+            )
+            gpus.append((subclass_order, gpu_name))
+
+        # Sorting is stable, so devices keep their PCI address order within a subclass.
+        return [gpu_name for _, gpu_name in sorted(gpus, key=lambda gpu: gpu[0])]
+
+    @classmethod
+    def _parse_lspci_output(cls) -> List[str]:
         try:
-            lspci_output = check_output("lspci", universal_newlines=True).splitlines()
+            lspci_output = Sysroot().check_output("lspci")
         except (FileNotFoundError, CalledProcessError):
             return []
 
+        return cls._filter_gpus(lspci_output)
+
+    @staticmethod
+    def _filter_gpus(lspci_output: str) -> List[str]:
+        pci_devices = lspci_output.splitlines()
         gpus_list = []
 
         for video_key in ("3D", "VGA", "Display"):
-            for pci_device in lspci_output:
+            for pci_device in pci_devices:
                 if video_key in pci_device:
                     gpus_list.append(pci_device.partition(": ")[2])
 
@@ -2,20 +2,26 @@ import platform
 from typing import Optional
 
 from entry import Entry
+from sysroot import Sysroot
 
 
 class Hostname(Entry):
+
+    _CACHE_TTL = 60 * 60
+    _CACHE_DEPENDENCIES = ("/etc/hostname",)
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
-        self.value = self._read_etc_hostname()
+        self.value = self._read_hostname("/etc/hostname") or self._read_hostname(
+            "/proc/sys/kernel/hostname"
+        )
         if not self.value:
-            self.value = platform.node()
+            self.value = Sysroot().lookup("platform:node", platform.node)
 
     @staticmethod
-    def _read_etc_hostname() -> Optional[str]:
+    def _read_hostname(path: str) -> Optional[str]:
         try:
-            with open("/etc/hostname", encoding="UTF-8") as f_hostname:
-                return f_hostname.read().rstrip()
+            return Sysroot().read_text(path).rstrip()
         except FileNotFoundError:
             return None
@@ -7,17 +7,21 @@ from urllib.request import urlopen
 
 from entry import Entry
 from environment import Environment
+from sysroot import Sysroot
 from utility import Utility
 
 
 class Kernel(Entry):
 
+    _ISOLATED = True
+    _REFRESH_INTERVAL = 6 * 60 * 60
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
         self.value = {
-            "name": platform.system(),
-            "release": platform.release(),
+            "name": self._get_name(),
+            "release": self._get_release(),
             "latest": None,
             "is_outdated": None,
         }
@@ -25,19 +29,36 @@ class Kernel(Entry):
         if (
             self.value["name"] != "Linux"
             or Environment.DO_NOT_TRACK
+            or Sysroot().replaying
         ):
             return
 
-        self.value["latest"] = self._fetch_latest_linux_release()
+        self.value["latest"] = self._fetch_latest_linux_release(
+            self.options.get("http_timeout", 1)
+        )
         if self.value["latest"]:
             self.value["is_outdated"] = Utility.version_to_semver_segments(
                 self.value["release"]
             ) < Utility.version_to_semver_segments(self.value["latest"])
 
     @staticmethod
-    def _fetch_latest_linux_release() -> Optional[str]:
+    def _get_name() -> str:
+        try:
+            return Sysroot().read_text("/proc/sys/kernel/ostype", encoding="ASCII").strip()
+        except OSError:
+            return Sysroot().lookup("platform:system", platform.system)
+
+    @staticmethod
+    def _get_release() -> str:
+        try:
+            return Sysroot().read_text("/proc/sys/kernel/osrelease", encoding="ASCII").strip()
+        except OSError:
+            return Sysroot().lookup("platform:release", platform.release)
+
+    @staticmethod
+    def _fetch_latest_linux_release(timeout: float) -> Optional[str]:
         try:
-            with urlopen("https://www.kernel.org/releases.json") as http_request:
+            with urlopen("https://www.kernel.org/releases.json", timeout=timeout) as http_request:
                 try:
                     kernel_releases = json.load(http_request)
                 except json.JSONDecodeError:
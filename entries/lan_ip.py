@@ -8,20 +8,30 @@ except ImportError:
     netifaces = None
 
 from entry import Entry
+from sysroot import Sysroot
 
 
 class LanIP(Entry):
 
     _PRETTY_NAME = "LAN IP"
 
+    # The daemon (and watch mode) collect entries again and again, but it's warned about once.
+    _netifaces_warning_logged = False
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
+        # Interfaces are read from the host, which a replayed snapshot is not.
+        if Sysroot().replaying:
+            return
+
         if not netifaces:
-            self._logger.warning(
-                "`netifaces` Python module couldn't be found. "
-                "Please either install it or explicitly disable `LAN_IP` entry in configuration."
-            )
+            if not LanIP._netifaces_warning_logged:
+                self._logger.warning(
+                    "`netifaces` Python module couldn't be found. Please either install it or "
+                    "explicitly disable `LAN_IP` entry in configuration."
+                )
+                LanIP._netifaces_warning_logged = True
             return
 
         addr_families = [netifaces.AF_INET]
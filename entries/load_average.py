@@ -3,17 +3,26 @@ from contextlib import suppress
 
 from colors import Colors
 from entry import Entry
+from sysroot import Sysroot
 
 
 class LoadAverage(Entry):
 
     _PRETTY_NAME = "Load Average"
+    _DYNAMIC = True
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
-        with suppress(AttributeError):
-            self.value = os.getloadavg()
+        with suppress(OSError, ValueError):
+            self.value = tuple(
+                float(load_avg)
+                for load_avg in Sysroot().read_text("/proc/loadavg", encoding="ASCII").split()[:3]
+            )
+
+        if not self.value and not Sysroot().replaying:
+            with suppress(AttributeError, OSError):
+                self.value = os.getloadavg()
 
     def output(self, output) -> None:
         if not self.value:
@@ -1,44 +1,60 @@
 import os
 import platform
-from subprocess import DEVNULL, CalledProcessError, check_output
+from subprocess import CalledProcessError
 from typing import Optional
 
 from entry import Entry
+from sysroot import Sysroot
 
 
 class Model(Entry):
 
     LINUX_DMI_SYS_PATH = "/sys/devices/virtual/dmi/id"
 
+    _CACHE_TTL = 24 * 60 * 60
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
         if platform.system() == "Linux":
-            virtual_env_info = self._fetch_virtual_env_info()
-            model_name = self._fetch_dmi_info()
-            if virtual_env_info is not None:
-                model_name = model_name or self._default_strings.get("virtual_environment")
-                self.value = f"{model_name} ({virtual_env_info})"
-            elif model_name:
-                self.value = model_name
+            self._set_model_value(self._fetch_virtual_env_info(), self._fetch_dmi_info())
+
+    async def collect_async(self) -> None:
+        if platform.system() == "Linux":
+            self._set_model_value(
+                await self._fetch_virtual_env_info_async(), self._fetch_dmi_info()
+            )
+
+    def _set_model_value(
+        self, virtual_env_info: Optional[str], model_name: Optional[str]
+    ) -> None:
+        if virtual_env_info is not None:
+            model_name = model_name or self._default_strings.get("virtual_environment")
+            self.value = f"{model_name} ({virtual_env_info})"
+        elif model_name:
+            self.value = model_name
 
     def _fetch_virtual_env_info(self) -> Optional[str]:
         try:
-            return check_output(
-                "systemd-detect-virt", stderr=DEVNULL, universal_newlines=True
-            ).rstrip()
+            return Sysroot().check_output("systemd-detect-virt").rstrip()
+        except CalledProcessError:
+            return None
+        except FileNotFoundError:
+            try:
+                return ", ".join(Sysroot().check_output("virt-what").splitlines()) or None
+            except (OSError, CalledProcessError):
+                return None
+
+    @staticmethod
+    async def _fetch_virtual_env_info_async() -> Optional[str]:
+        try:
+            return (await Sysroot().check_output_async("systemd-detect-virt")).rstrip()
         except CalledProcessError:
             return None
         except FileNotFoundError:
             try:
                 return (
-                    ", ".join(
-                        check_output(
-                            "virt-what",
-                            stderr=DEVNULL,
-                            universal_newlines=True,
-                        ).splitlines()
-                    )
+                    ", ".join((await Sysroot().check_output_async("virt-what")).splitlines())
                     or None
                 )
             except (OSError, CalledProcessError):
@@ -49,10 +65,9 @@ class Model(Entry):
 
         def _read_dmi_file(file_name: str) -> str:
             try:
-                with open(
-                    os.path.join(cls.LINUX_DMI_SYS_PATH, file_name), encoding="UTF-8"
-                ) as f_dmi_file:
-                    dmi_info = f_dmi_file.read().rstrip()
+                dmi_info = Sysroot().read_text(
+                    os.path.join(cls.LINUX_DMI_SYS_PATH, file_name)
+                ).rstrip()
             except OSError:
                 return ""
 
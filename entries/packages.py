@@ -1,45 +1,253 @@
+import json
 import os
-import typing
-from subprocess import DEVNULL, CalledProcessError, check_output
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import suppress
+from contextvars import copy_context
+from subprocess import CalledProcessError
+from typing import Dict, Optional, Tuple
 
 from entry import Entry
+from sysroot import Sysroot
 
-PACKAGES_TOOLS = (
-    {"cmd": ("apk", "list", "--installed")},  # Alpine Linux
-    {"cmd": ("dpkg", "--get-selections")},  # Debian/Ubuntu Linux
-    {"cmd": ("pacman", "-Q")},  # Arch Linux
-    {"cmd": ("yum", "list", "installed"), "skew": 2},  # CentOS
+DPKG_INSTALLED_STATUSES = (b"\nStatus: install ok installed", b"\nStatus: hold ok installed")
+
+# `pip` installs system-wide packages under `/usr/local`, away from distribution ones.
+PIP_SITE_PACKAGES_GLOB = "/usr/local/lib*/python3*/*-packages"
+PIP_METADATA_GLOBS = (
+    f"{PIP_SITE_PACKAGES_GLOB}/*.dist-info",
+    f"{PIP_SITE_PACKAGES_GLOB}/*.egg-info",
 )
 
 
 class Packages(Entry):
+
+    _CACHE_TTL = 24 * 60 * 60
+    _VALUE_VERSION = 2
+    _CACHE_DEPENDENCIES = (
+        "/lib/apk/db/installed",
+        "/var/lib/dpkg/status",
+        "/var/lib/pacman/local",
+        "/var/lib/rpm/Packages",
+        "/var/lib/rpm/rpmdb.sqlite",
+        "/var/lib/flatpak/app",
+        "/var/lib/flatpak/runtime",
+        "/var/lib/snapd/snaps",
+        "/nix/var/nix/profiles",
+        "/usr/local/lib",
+        "/usr/local/lib64",
+    )
+
+    # Alpine Linux, Debian/Ubuntu Linux, Arch Linux and RHEL/Fedora/SUSE Linux, then
+    # distribution-agnostic ecosystems. Each source is counted by `_count_<source>_packages`.
+    _PACKAGES_SOURCES = ("apk", "dpkg", "pacman", "rpm", "flatpak", "snap", "nix", "pip")
+
+    @classmethod
+    def get_cache_dependencies(cls) -> Tuple[str, ...]:
+        # Site-packages directories depend on the installed Python versions.
+        return cls._CACHE_DEPENDENCIES + tuple(Sysroot().glob(PIP_SITE_PACKAGES_GLOB))
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
-        for packages_tool in PACKAGES_TOOLS:
-            packages_tool = typing.cast(dict, packages_tool)
+        # Package databases are read directly, tools are never run for an absent database.
+        # Sources are counted concurrently, as some of them may sit on slow storage.
+        # Each of them runs in a copy of the entry context, which profiling relies on.
+        with ThreadPoolExecutor(max_workers=len(self._PACKAGES_SOURCES)) as executor:
+            packages_futures = [
+                executor.submit(
+                    copy_context().run, getattr(self, f"_count_{packages_source}_packages")
+                )
+                for packages_source in self._PACKAGES_SOURCES
+            ]
+        packages_counts = [packages_future.result() for packages_future in packages_futures]
 
-            try:
-                results = check_output(
-                    packages_tool["cmd"],
-                    stderr=DEVNULL,
-                    env={
-                        **os.environ,
-                        "LANG": "C",
-                    },
-                    universal_newlines=True,
+        sources_counts: Dict[str, int] = {
+            packages_source: packages_count
+            for packages_source, packages_count in zip(self._PACKAGES_SOURCES, packages_counts)
+            if packages_count is not None
+        }
+        if sources_counts:
+            self.value = {"count": sum(sources_counts.values()), "sources": sources_counts}
+
+    @staticmethod
+    def _count_apk_packages() -> Optional[int]:
+        try:
+            installed = Sysroot().read_bytes("/lib/apk/db/installed")
+        except OSError:
+            return None
+
+        # Each package stanza starts with its `P:` (name) field.
+        return installed.startswith(b"P:") + installed.count(b"\nP:")
+
+    @classmethod
+    def _count_dpkg_packages(cls) -> Optional[int]:
+        sysroot = Sysroot()
+
+        # The status database weighs hundreds of KiB, so only its count is recorded.
+        packages_count = sysroot.lookup(
+            "dpkg:installed",
+            lambda: cls._count_dpkg_statuses(sysroot.get_path("/var/lib/dpkg/status")),
+        )
+        if packages_count is None:
+            return None
+
+        return int(packages_count)
+
+    @staticmethod
+    def _count_dpkg_statuses(dpkg_status_path: str) -> Optional[str]:
+        try:
+            with open(dpkg_status_path, mode="rb") as f_status:
+                status = f_status.read()
+        except OSError:
+            return None
+
+        # Stanzas are never decoded, installed packages statuses are counted as bytes.
+        return str(
+            sum(status.count(installed_status) for installed_status in DPKG_INSTALLED_STATUSES)
+        )
+
+    @staticmethod
+    def _count_pacman_packages() -> Optional[int]:
+        try:
+            local_entries = Sysroot().listdir("/var/lib/pacman/local")
+        except OSError:
+            return None
+
+        return sum(1 for local_entry in local_entries if local_entry != "ALPM_DB_VERSION")
+
+    @classmethod
+    def _count_rpm_packages(cls) -> Optional[int]:
+        sysroot = Sysroot()
+
+        rpmdb_sqlite_path = "/var/lib/rpm/rpmdb.sqlite"
+        packages_count = sysroot.lookup(
+            f"sqlite:{rpmdb_sqlite_path}:packages",
+            lambda: cls._query_rpmdb_sqlite(sysroot.get_path(rpmdb_sqlite_path)),
+        )
+        if packages_count is not None:
+            return int(packages_count)
+
+        # Berkeley DB (or NDB) databases can't be read natively.
+        try:
+            sysroot.listdir("/var/lib/rpm")
+        except OSError:
+            return None
+
+        if sysroot.which("rpm") is None:
+            return None
+
+        try:
+            return sysroot.check_output(
+                ["rpm", "-qa", "--queryformat", r"\n"], env={**os.environ, "LANG": "C"}
+            ).count("\n")
+        except (OSError, CalledProcessError):
+            return None
+
+    @staticmethod
+    def _query_rpmdb_sqlite(rpmdb_sqlite_path: str) -> Optional[str]:
+        if not os.path.isfile(rpmdb_sqlite_path):
+            return None
+
+        try:
+            # `sqlite3` is an optional part of the standard library, seldom needed here.
+            import sqlite3
+        except ImportError:
+            return None
+
+        # The database (in WAL mode) may be unreadable without write access to its directory.
+        for uri_parameters in ("mode=ro", "immutable=1"):
+            with suppress(sqlite3.Error):
+                connection = sqlite3.connect(
+                    f"file:{rpmdb_sqlite_path}?{uri_parameters}", uri=True
                 )
-            except (OSError, CalledProcessError):
+                try:
+                    return str(connection.execute("SELECT COUNT(*) FROM Packages").fetchone()[0])
+                finally:
+                    connection.close()
+
+        return None
+
+    @staticmethod
+    def _count_flatpak_packages() -> Optional[int]:
+        sysroot = Sysroot()
+        try:
+            sysroot.listdir("/var/lib/flatpak")
+        except OSError:
+            return None
+
+        # Each deployed ref (`<kind>/<name>/<arch>/<branch>`) has an `active` deployment link.
+        return len(sysroot.glob("/var/lib/flatpak/app/*/*/*/active")) + len(
+            sysroot.glob("/var/lib/flatpak/runtime/*/*/*/active")
+        )
+
+    @staticmethod
+    def _count_snap_packages() -> Optional[int]:
+        try:
+            snaps_files = Sysroot().listdir("/var/lib/snapd/snaps")
+        except OSError:
+            return None
+
+        # Several revisions (`<name>_<revision>.snap`) of a snap are kept.
+        return len(
+            {
+                snap_file.rpartition("_")[0]
+                for snap_file in snaps_files
+                if snap_file.endswith(".snap") and "_" in snap_file
+            }
+        )
+
+    @staticmethod
+    def _count_nix_packages() -> Optional[int]:
+        sysroot = Sysroot()
+        try:
+            sysroot.listdir("/nix/var/nix/profiles")
+        except OSError:
+            return None
+
+        packages_count = 0
+        for manifest_path in (
+            "/nix/var/nix/profiles/default/manifest.json",
+            *sysroot.glob("/nix/var/nix/profiles/per-user/*/profile/manifest.json"),
+        ):
+            try:
+                manifest = json.loads(sysroot.read_bytes(manifest_path))
+            except (OSError, ValueError):
+                # Profiles managed by `nix-env` have a `manifest.nix` instead.
                 continue
 
-            if self.value:
-                self.value += results.count("\n")
-            else:
-                self.value = results.count("\n")
+            # Elements are a list up to manifest version 2, then a mapping by name.
+            if isinstance(manifest, dict):
+                packages_count += len(manifest.get("elements") or ())
+
+        return packages_count
+
+    @staticmethod
+    def _count_pip_packages() -> Optional[int]:
+        sysroot = Sysroot()
+        metadata_paths = [
+            metadata_path
+            for metadata_glob in PIP_METADATA_GLOBS
+            for metadata_path in sysroot.glob(metadata_glob)
+        ]
+        return len(metadata_paths) or None
 
-            if "skew" in packages_tool:
-                self.value -= packages_tool["skew"]
+    def output(self, output) -> None:
+        if not self.value:
+            super().output(output)
+            return
 
-            if packages_tool["cmd"][0] == "dpkg":
-                self.value -= results.count("deinstall")
+        sources_counts = self.value["sources"]
+        if len(sources_counts) == 1 or not self.options.get("show_sources", True):
+            output.append(self.name, str(self.value["count"]))
+            return
 
+        output.append(
+            self.name,
+            "{} ({})".format(
+                self.value["count"],
+                ", ".join(
+                    f"{packages_source}: {packages_count}"
+                    for packages_source, packages_count in sources_counts.items()
+                ),
+            ),
+        )
@@ -4,6 +4,9 @@ from processes import Processes as ProcessesUtil
 
 class Processes(Entry):
 
+    _USES_PROCESSES = True
+    _DYNAMIC = True
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.value = ProcessesUtil().number
@@ -1,76 +1,137 @@
+import os
 import platform
 import re
 from contextlib import suppress
-from subprocess import check_output
-from typing import Tuple
+from typing import Dict, Optional
 
 from colors import Colors
 from entry import Entry
+from sysroot import Sysroot
+
+
+MEMINFO_KEYS = frozenset(
+    (
+        "MemTotal", "MemFree", "Buffers", "Cached", "Shmem", "SReclaimable", "SwapTotal",
+        "SwapFree", "Zswap", "Zswapped", "HugePages_Total", "HugePages_Free", "Hugepagesize",
+    )
+)
 
 
 class RAM(Entry):
 
+    _DYNAMIC = True
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
-        used, total = self._get_used_total_values()
-        if not total:
-            return
+        try:
+            self.value = self._read_proc_meminfo()
+        except (OSError, KeyError, ValueError):
+            if platform.system() == "Linux":
+                with suppress(IndexError, ValueError, FileNotFoundError):
+                    self.value = self._run_free_dash_m()
 
-        self.value = {
-            "used": used,
-            "total": total,
+        if self.value is not None and not self.value["total"]:
+            self.value = None
+
+    @staticmethod
+    def _run_free_dash_m() -> dict:
+        free_lines = (
+            Sysroot().check_output(["free", "-m"], env={**os.environ, "LANG": "C"}).splitlines()
+        )
+        memory_usage = "".join(filter(re.compile(r"Mem").search, free_lines)).split()
+        swap_usage = "".join(filter(re.compile(r"Swap").search, free_lines)).split()
+
+        return {
+            "used": float(memory_usage[2]),
+            "total": float(memory_usage[1]),
             "unit": "MiB",
+            "swap_used": float(swap_usage[2]) if swap_usage else None,
+            "swap_total": float(swap_usage[1]) if swap_usage else None,
+            "zram_compression_ratio": None,
+            "zswap_compression_ratio": None,
+            "hugepages_total": None,
+            "hugepages_free": None,
+            "hugepage_size": None,
         }
 
-    def _get_used_total_values(self) -> Tuple[float, float]:
-        if platform.system() == "Linux":
-            with suppress(IndexError, FileNotFoundError):
-                return self._run_free_dash_m()
+    @classmethod
+    def _read_proc_meminfo(cls) -> dict:
+        mem_info = cls._parse_meminfo(Sysroot().read_text("/proc/meminfo", encoding="ASCII"))
 
-        with suppress(OSError):
-            return self._read_proc_meminfo()
+        total = mem_info["MemTotal"] / 1024
+        used = (
+            total
+            + (
+                mem_info["Shmem"]
+                - (
+                    mem_info["MemFree"]
+                    + mem_info["Cached"]
+                    + mem_info["SReclaimable"]
+                    + mem_info["Buffers"]
+                )
+            )
+            / 1024
+        )
+        if used < 0:
+            used = total - mem_info["MemFree"] / 1024
 
-        return 0, 0
+        swap_total = mem_info.get("SwapTotal")
+        swap_free = mem_info.get("SwapFree")
 
-    @staticmethod
-    def _run_free_dash_m() -> Tuple[float, float]:
-        memory_usage = "".join(
-            filter(
-                re.compile(r"Mem").search,
-                check_output(
-                    ["free", "-m"], env={"LANG": "C"}, universal_newlines=True
-                ).splitlines(),
-            )
-        ).split()
+        zswap_compression_ratio = None
+        if mem_info.get("Zswap") and "Zswapped" in mem_info:
+            zswap_compression_ratio = mem_info["Zswapped"] / mem_info["Zswap"]
 
-        return float(memory_usage[2]), float(memory_usage[1])
+        return {
+            "used": used,
+            "total": total,
+            "unit": "MiB",
+            "swap_used": (
+                (swap_total - swap_free) / 1024
+                if swap_total is not None and swap_free is not None
+                else None
+            ),
+            "swap_total": swap_total / 1024 if swap_total is not None else None,
+            "zram_compression_ratio": cls._get_zram_compression_ratio(),
+            "zswap_compression_ratio": zswap_compression_ratio,
+            "hugepages_total": mem_info.get("HugePages_Total"),
+            "hugepages_free": mem_info.get("HugePages_Free"),
+            "hugepage_size": (
+                mem_info["Hugepagesize"] / 1024 if "Hugepagesize" in mem_info else None
+            ),
+        }
 
     @staticmethod
-    def _read_proc_meminfo() -> Tuple[float, float]:
-        with open("/proc/meminfo", encoding="ASCII") as f_mem_info:
-            mem_info_lines = f_mem_info.read().splitlines()
-
+    def _parse_meminfo(meminfo: str) -> Dict[str, int]:
         mem_info = {}
-        for line in filter(None, mem_info_lines):
-            key, value = line.split(":", maxsplit=1)
-            mem_info[key] = float(value.strip(" kB")) / 1024
+        for line in meminfo.splitlines():
+            key, _, value = line.partition(":")
+            # Only a handful of the (~50) keys are needed, so the others are never converted.
+            if key not in MEMINFO_KEYS:
+                continue
 
-        total = mem_info["MemTotal"]
-        used = (
-            total
-            + mem_info["Shmem"]
-            - (
-                mem_info["MemFree"]
-                + mem_info["Cached"]
-                + mem_info["SReclaimable"]
-                + mem_info["Buffers"]
-            )
-        )
-        if used < 0:
-            used = total - mem_info["MemFree"]
+            mem_info[key] = int(value.split()[0])
+            if len(mem_info) == len(MEMINFO_KEYS):
+                break
+
+        return mem_info
 
-        return used, total
+    @staticmethod
+    def _get_zram_compression_ratio() -> Optional[float]:
+        original_size = compressed_size = 0
+        sysroot = Sysroot()
+        for mm_stat_path in sysroot.glob("/sys/block/zram*/mm_stat"):
+            # See the kernel `Documentation/admin-guide/blockdev/zram.rst`.
+            with suppress(OSError, IndexError, ValueError):
+                mm_stat = sysroot.read_text(mm_stat_path, encoding="ASCII").split()
+                original_size += int(mm_stat[0])
+                compressed_size += int(mm_stat[1])
+
+        if not compressed_size:
+            return None
+
+        return original_size / compressed_size
 
     def output(self, output) -> None:
         if not self.value:
@@ -90,3 +151,41 @@ class RAM(Entry):
         output.append(
             self.name, f"{level_color}{int(used)} {unit}{Colors.CLEAR} / {int(total)} {unit}"
         )
+
+        # Cached values may predate swap and hugepages fields.
+        swap_total = self.value.get("swap_total")
+        if swap_total and self.options.get("show_swap", True):
+            swap_used = self.value["swap_used"]
+            swap_level_color = Colors.get_level_color(
+                (swap_used / swap_total) * 100,
+                self.options.get("warning_swap_use_percent", 25),
+                self.options.get("danger_swap_use_percent", 50),
+            )
+
+            compression_ratios = [
+                f"{compression_name} {compression_ratio:.1f}x"
+                for compression_name, compression_ratio in (
+                    ("zram", self.value.get("zram_compression_ratio")),
+                    ("zswap", self.value.get("zswap_compression_ratio")),
+                )
+                if compression_ratio
+            ]
+
+            output.append(
+                "Swap",
+                f"{swap_level_color}{int(swap_used)} {unit}{Colors.CLEAR}"
+                f" / {int(swap_total)} {unit}"
+                + (f" ({', '.join(compression_ratios)})" if compression_ratios else ""),
+            )
+
+        hugepages_total = self.value.get("hugepages_total")
+        if hugepages_total and self.options.get("show_hugepages", True):
+            output.append(
+                "HugePages",
+                "{} / {} ({:g} {} pages)".format(
+                    hugepages_total - self.value["hugepages_free"],
+                    hugepages_total,
+                    self.value["hugepage_size"],
+                    unit,
+                ),
+            )
@@ -1,31 +1,41 @@
 import os
-from subprocess import CalledProcessError, check_output
+from subprocess import CalledProcessError
 from typing import Optional
 
 from entry import Entry
+from sysroot import Sysroot
 
 
 class Shell(Entry):
 
+    _USES_ENVIRONMENT = True
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
-        self.value = os.getenv("SHELL") or self._query_name_service_switch()
+        self.value = Sysroot().getenv("SHELL") or self._query_name_service_switch()
 
-    @staticmethod
-    def _query_name_service_switch() -> Optional[str]:
-        try:
-            user_id = os.getuid()
-        except AttributeError:
+    @classmethod
+    def _query_name_service_switch(cls) -> Optional[str]:
+        user_id = Sysroot().lookup("uid", cls._get_user_id)
+        if user_id is None:
             return None
 
         try:
             shell = (
-                check_output(["getent", "passwd", str(user_id)], universal_newlines=True)
+                Sysroot()
+                .check_output(["getent", "passwd", user_id])
                 .rstrip()
                 .rsplit(":", maxsplit=1)[-1]
             )
-        except CalledProcessError:
+        except (OSError, CalledProcessError):
             return None
 
         return shell
+
+    @staticmethod
+    def _get_user_id() -> Optional[str]:
+        try:
+            return str(os.getuid())
+        except AttributeError:
+            return None
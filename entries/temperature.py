@@ -1,27 +1,34 @@
 import json
 import platform
 import re
-from glob import iglob
-from subprocess import PIPE, CalledProcessError, run
+from fnmatch import fnmatchcase
 from typing import List, Optional
 
+from cache import EntryCache
 from entry import Entry
+from sysroot import Sysroot
 
 
 class Temperature(Entry):
 
+    _DYNAMIC = True
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
         self._temps: List[float] = []
 
-        self._run_sensors(
-            self.options.get("sensors_chipsets"), self.options.get("sensors_excluded_subfeatures")
-        )
+        whitelisted_chips = self.options.get("sensors_chipsets")
+        excluded_subfeatures = self.options.get("sensors_excluded_subfeatures")
+
+        if platform.system() == "Linux":
+            self._read_hwmon(whitelisted_chips, excluded_subfeatures)
 
         if not self._temps:
-            if platform.system() == "Linux":
-                self._poll_thermal_zones()
+            self._run_sensors(whitelisted_chips, excluded_subfeatures)
+
+        if not self._temps and platform.system() == "Linux":
+            self._poll_thermal_zones()
 
         if not self._temps:
             return
@@ -32,6 +39,95 @@ class Temperature(Entry):
             "unit": "C",
         }
 
+    def _read_hwmon(
+        self,
+        whitelisted_chips: Optional[List[str]] = None,
+        excluded_subfeatures: Optional[List[str]] = None,
+    ) -> None:
+        # hwmon devices numbering may change across boots, as the entry cache does.
+        entry_cache = EntryCache() if Sysroot().is_host else None
+        cache_key = "hwmon_sensors:" + json.dumps([whitelisted_chips, excluded_subfeatures])
+
+        if entry_cache is not None:
+            sensors_paths = entry_cache.get_data(cache_key)
+            if sensors_paths and self._read_hwmon_sensors(sensors_paths):
+                return
+
+        sensors_paths = self._discover_hwmon_sensors(whitelisted_chips, excluded_subfeatures)
+        if self._read_hwmon_sensors(sensors_paths) and entry_cache is not None:
+            entry_cache.store_data(cache_key, sensors_paths)
+
+    def _read_hwmon_sensors(self, sensors_paths: List[str]) -> bool:
+        sysroot = Sysroot()
+
+        temps = []
+        for sensor_path in sensors_paths:
+            try:
+                temp = float(sysroot.read_text(sensor_path, encoding="ASCII"))
+            except OSError:
+                # Cached paths are stale (e.g. a driver has been reloaded).
+                return False
+            except ValueError:
+                continue
+
+            if temp != 0.0:
+                temps.append(temp / 1000)
+
+        self._temps = temps
+        return bool(temps)
+
+    @staticmethod
+    def _discover_hwmon_sensors(
+        whitelisted_chips: Optional[List[str]] = None,
+        excluded_subfeatures: Optional[List[str]] = None,
+    ) -> List[str]:
+        sysroot = Sysroot()
+        try:
+            hwmon_devices = sorted(sysroot.listdir("/sys/class/hwmon"))
+        except OSError:
+            return []
+
+        # Chips are matched by name (`k10temp-pci-00c3` matches `k10temp` devices), bus and
+        # address parts of lm-sensors chip names are not resolved.
+        chips_names_patterns = [
+            whitelisted_chip.split("-", maxsplit=1)[0]
+            for whitelisted_chip in whitelisted_chips or ()
+        ]
+
+        sensors_paths = []
+        for hwmon_device in hwmon_devices:
+            hwmon_path = f"/sys/class/hwmon/{hwmon_device}"
+            try:
+                chip_name = sysroot.read_text(f"{hwmon_path}/name").strip()
+                hwmon_files = sysroot.listdir(hwmon_path)
+            except (OSError, UnicodeDecodeError):
+                continue
+
+            if chips_names_patterns and not any(
+                fnmatchcase(chip_name, chip_name_pattern)
+                for chip_name_pattern in chips_names_patterns
+            ):
+                continue
+
+            for hwmon_file in sorted(hwmon_files):
+                if not (hwmon_file.startswith("temp") and hwmon_file.endswith("_input")):
+                    continue
+
+                if excluded_subfeatures:
+                    # lm-sensors names features after their label, if any.
+                    feature = hwmon_file[: -len("_input")]
+                    try:
+                        label = sysroot.read_text(f"{hwmon_path}/{feature}_label").strip()
+                    except (OSError, UnicodeDecodeError):
+                        label = feature
+
+                    if label in excluded_subfeatures:
+                        continue
+
+                sensors_paths.append(f"{hwmon_path}/{hwmon_file}")
+
+        return sensors_paths
+
     def _run_sensors(
         self,
         whitelisted_chips: Optional[List[str]] = None,
@@ -42,22 +138,17 @@ class Temperature(Entry):
             if whitelisted_chip is not None:
                 sensors_args.append(whitelisted_chip)
 
-            error_message = None
             try:
-                sensors_output = run(
-                    sensors_args, universal_newlines=True, stdout=PIPE, stderr=PIPE, check=True
-                )
+                sensors_output = Sysroot().run(sensors_args)
             except FileNotFoundError:
                 return None
-            except CalledProcessError as called_process_error:
-                error_message = called_process_error.stderr
+
+            if sensors_output.stderr:
+                for line in sensors_output.stderr.splitlines():
+                    self._logger.warning("[lm-sensors]: %s", line)
+
+            if sensors_output.returncode:
                 return None
-            else:
-                error_message = sensors_output.stderr
-            finally:
-                if error_message:
-                    for line in error_message.splitlines():
-                        self._logger.warning("[lm-sensors]: %s", line)
 
             return sensors_output.stdout
 
@@ -91,10 +182,10 @@ class Temperature(Entry):
                             break
 
     def _poll_thermal_zones(self) -> None:
-        for thermal_file in iglob(r"/sys/class/thermal/thermal_zone*/temp"):
+        sysroot = Sysroot()
+        for thermal_file in sysroot.glob(r"/sys/class/thermal/thermal_zone*/temp"):
             try:
-                with open(thermal_file, encoding="ASCII") as file:
-                    temp = float(file.read())
+                temp = float(sysroot.read_text(thermal_file, encoding="ASCII"))
             except OSError:
                 continue
 
@@ -1,9 +1,9 @@
-import os
 import re
 from typing import Optional
 
 from colors import Colors, Style
 from entry import Entry
+from sysroot import Sysroot
 
 COLORTERM_DICT = {
     r"kmscon": "KMSCON",
@@ -27,6 +27,8 @@ ENV_DICT = {
 
 class Terminal(Entry):
 
+    _USES_ENVIRONMENT = True
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
@@ -44,21 +46,21 @@ class Terminal(Entry):
 
     @staticmethod
     def _detect_terminal_emulator() -> Optional[str]:
-        env_term_program = os.getenv("TERM_PROGRAM")
+        env_term_program = Sysroot().getenv("TERM_PROGRAM")
         if env_term_program:
-            env_term_program_version = os.getenv("TERM_PROGRAM_VERSION")
+            env_term_program_version = Sysroot().getenv("TERM_PROGRAM_VERSION")
             if env_term_program_version:
                 env_term_program += f" {env_term_program_version}"
 
             return env_term_program
 
-        env_colorterm = os.getenv("COLORTERM")
+        env_colorterm = Sysroot().getenv("COLORTERM")
         if env_colorterm:
             for env_value_re, normalized_name in COLORTERM_DICT.items():
                 if re.match(env_value_re, env_colorterm):
                     return normalized_name
 
-        env_term = os.getenv("TERM")
+        env_term = Sysroot().getenv("TERM")
         if env_term:
             for env_value_re, normalized_name in TERM_DICT.items():
                 if re.match(env_value_re, env_term):
@@ -68,7 +70,7 @@ class Terminal(Entry):
                 return env_term
 
         for env_var, normalized_name in ENV_DICT.items():
-            if env_var in os.environ:
+            if Sysroot().getenv(env_var) is not None:
                 return normalized_name
 
         return env_term
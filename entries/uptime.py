@@ -1,15 +1,18 @@
+import os
 import re
 import time
 from contextlib import suppress
 from datetime import timedelta
-from subprocess import PIPE, run
 
 from entry import Entry
 from exceptions import SysInfoException
+from sysroot import Sysroot
 
 
 class Uptime(Entry):
 
+    _DYNAMIC = True
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
@@ -27,17 +30,20 @@ class Uptime(Entry):
         except OSError:
             pass
 
-        try:
-            return self._clock_uptime()
-        except RuntimeError:
-            pass
+        # Host clocks are meaningless for a replayed snapshot.
+        if not Sysroot().replaying:
+            try:
+                return self._clock_uptime()
+            except RuntimeError:
+                pass
 
         return self._parse_uptime_cmd()
 
     @staticmethod
     def _proc_file_uptime() -> timedelta:
-        with open("/proc/uptime", encoding="ASCII") as f_uptime:
-            return timedelta(seconds=float(f_uptime.read().split()[0]))
+        return timedelta(
+            seconds=float(Sysroot().read_text("/proc/uptime", encoding="ASCII").split()[0])
+        )
 
     @staticmethod
     def _clock_uptime() -> timedelta:
@@ -49,16 +55,21 @@ class Uptime(Entry):
 
     def _parse_uptime_cmd(self) -> timedelta:
         try:
-            uptime_output = run("uptime", env={"LANG": "C"}, stdout=PIPE, stderr=PIPE, check=True)
+            uptime_output = Sysroot().run("uptime", env={**os.environ, "LANG": "C"})
         except FileNotFoundError as error:
             raise SysInfoException("Couldn't find `uptime` command on this system.") from error
 
         if uptime_output.stderr:
             for line in uptime_output.stderr.splitlines():
-                self._logger.warning("[uptime]: %s", line.decode())
+                self._logger.warning("[uptime]: %s", line)
+        uptime_output.check_returncode()
+
+        return self._parse_uptime_output(uptime_output.stdout)
 
+    @staticmethod
+    def _parse_uptime_output(uptime_output: str) -> timedelta:
         uptime_match = re.search(
-            rb"""
+            r"""
             up\s+?             # match the `up` preceding the uptime (anchor the start of the regex)
             (?:                # non-capture group for days section.
                (?P<days>       # 'days' named capture group, captures the days digits.
@@ -107,7 +118,7 @@ class Uptime(Entry):
             \s+?               #   whitespace between the user count and the text 'user',
             user               #   and the text 'user' (to anchor the end of the expression).
             """,
-            uptime_output.stdout,
+            uptime_output,
             re.VERBOSE,
         )
         if not uptime_match:
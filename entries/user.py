@@ -1,12 +1,29 @@
 import getpass
+from typing import Optional
 
 from entry import Entry
+from sysroot import Sysroot
+
 
 class User(Entry):
 
+    _USES_ENVIRONMENT = True
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        # Same lookup order as `getpass.getuser()`, so that it can be replayed.
+        for env_var in ("LOGNAME", "USER", "LNAME", "USERNAME"):
+            user = Sysroot().getenv(env_var)
+            if user:
+                self.value = user
+                return
+
+        # The password database is consulted last, and its answer is recorded.
+        self.value = Sysroot().lookup("user", self._get_password_database_user)
+
+    @staticmethod
+    def _get_password_database_user() -> Optional[str]:
         try:
-            self.value = getpass.getuser()
-        except ImportError:
-            pass
+            return getpass.getuser()
+        except (ImportError, KeyError, OSError):
+            return None
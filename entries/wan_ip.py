@@ -1,17 +1,29 @@
-from socket import timeout as SocketTimeoutError
-from subprocess import DEVNULL, CalledProcessError, TimeoutExpired, check_output
-from typing import Optional
-from urllib.error import URLError
+import asyncio
+import socket
+import time
+from contextlib import suppress
+from contextvars import copy_context
+from http.client import HTTPException
+from queue import Empty, Queue
+from threading import Thread
+from typing import Callable, Dict, List, Optional, Tuple
 from urllib.request import urlopen
 
+from dns_client import DNS_PORT, query_address, query_address_async
 from entry import Entry
 from environment import Environment
+from sysroot import Sysroot
+
+IP_VERSIONS = (4, 6)
 
 
 class WanIP(Entry):
 
     _PRETTY_NAME = "WAN IP"
 
+    _ISOLATED = True
+    _REFRESH_INTERVAL = 10 * 60
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
@@ -20,64 +32,210 @@ class WanIP(Entry):
         if Environment.DO_NOT_TRACK:
             return
 
-        ipv4_addr = self._retrieve_ip_address(4)
-        if ipv4_addr:
-            self.value.append(ipv4_addr)
+        sources = self._get_sources()
+        self._set_value(sources, {} if Sysroot().replaying else self._race_sources(sources))
 
-        ipv6_addr = self._retrieve_ip_address(6)
-        if ipv6_addr:
-            self.value.append(ipv6_addr)
+    async def collect_async(self) -> None:
+        self.value = []
 
-    def _retrieve_ip_address(self, ip_version: int) -> Optional[str]:
-        options = self.options.get(f"ipv{ip_version}", {})
+        if Environment.DO_NOT_TRACK:
+            return
 
-        if not options and not isinstance(options, dict):
-            return None
+        sources = self._get_sources()
+        self._set_value(
+            sources, {} if Sysroot().replaying else await self._race_sources_async(sources)
+        )
+
+    def _race_sources(self, sources: List[Tuple[int, str, float, tuple]]) -> Dict[int, str]:
+        # Every source of both address families is raced, the first valid answers win.
+        answers: Queue = Queue()
+        for ip_version, source_type, timeout, source_args in sources:
+            Thread(
+                target=copy_context().run,
+                args=(self._race_source, answers, ip_version, source_type, *source_args, timeout),
+                daemon=True,
+            ).start()
+
+        # Losing sources are abandoned (they can't outlive their own timeout anyway).
+        expires_at = time.monotonic() + max((timeout for _, _, timeout, _ in sources), default=0)
+        families = {ip_version for ip_version, _, _, _ in sources}
+        ip_addresses: Dict[int, str] = {}
+        for _ in sources:
+            try:
+                ip_version, ip_address = answers.get(
+                    timeout=max(0.0, expires_at - time.monotonic())
+                )
+            except Empty:
+                break
 
-        dns_query = options.get("dns_query", "myip.opendns.com")
-        if dns_query:
-            ip_address = self._run_dns_query(
-                dns_query,
-                options.get("dns_resolver", "resolver1.opendns.com"),
-                ip_version,
-                options.get("dns_timeout", 1),
-            )
             if ip_address is not None:
-                return ip_address
+                ip_addresses.setdefault(ip_version, ip_address)
+                if len(ip_addresses) == len(families):
+                    break
 
-        http_url = options.get("http_url", f"https://v{ip_version}.ident.me/")
-        if not http_url:
-            return None
+        return ip_addresses
+
+    async def _race_sources_async(
+        self, sources: List[Tuple[int, str, float, tuple]]
+    ) -> Dict[int, str]:
+        sources_tasks = {
+            asyncio.ensure_future(
+                self._query_source_async(ip_version, source_type, *source_args, timeout)
+            ): ip_version
+            for ip_version, source_type, timeout, source_args in sources
+        }
+
+        ip_addresses: Dict[int, str] = {}
+        pending_tasks = set(sources_tasks)
+        try:
+            while pending_tasks:
+                done_tasks, pending_tasks = await asyncio.wait(
+                    pending_tasks, return_when=asyncio.FIRST_COMPLETED
+                )
+                for done_task in done_tasks:
+                    ip_address = done_task.result()
+                    if ip_address is not None:
+                        ip_addresses.setdefault(sources_tasks[done_task], ip_address)
+
+                # Sources of an already resolved address family are cancelled.
+                for pending_task in [
+                    task for task in pending_tasks if sources_tasks[task] in ip_addresses
+                ]:
+                    pending_task.cancel()
+                    pending_tasks.remove(pending_task)
+        finally:
+            for pending_task in pending_tasks:
+                pending_task.cancel()
+
+        return ip_addresses
+
+    def _set_value(
+        self, sources: List[Tuple[int, str, float, tuple]], ip_addresses: Dict[int, str]
+    ) -> None:
+        sysroot = Sysroot()
+        families = {ip_version for ip_version, _, _, _ in sources}
+
+        self.value = []
+        for ip_version in IP_VERSIONS:
+            if ip_version not in families:
+                continue
+
+            # Only winners are recorded (once per family), so that replays can't pick another one.
+            ip_address = sysroot.lookup(
+                f"wan_ip:ipv{ip_version}", lambda: ip_addresses.get(ip_version)
+            )
+            if ip_address:
+                self.value.append(ip_address)
+
+    def _get_sources(self) -> List[Tuple[int, str, float, tuple]]:
+        sources = []
+        for ip_version in IP_VERSIONS:
+            options = self.options.get(f"ipv{ip_version}", {})
 
-        return self._run_http_request(http_url, options.get("http_timeout", 1))
+            if not options and not isinstance(options, dict):
+                continue
+
+            # Resolvers and URLs may be given as a single string, or a list of them.
+            dns_query = options.get("dns_query", "myip.opendns.com")
+            if dns_query:
+                dns_resolvers = options.get("dns_resolver", "resolver1.opendns.com")
+                if isinstance(dns_resolvers, str):
+                    dns_resolvers = [dns_resolvers]
+
+                for dns_resolver in dns_resolvers:
+                    sources.append(
+                        (
+                            ip_version,
+                            "dns",
+                            options.get("dns_timeout", 1),
+                            (dns_query, dns_resolver, options.get("dns_port", DNS_PORT)),
+                        )
+                    )
+
+            http_urls = options.get("http_url", f"https://v{ip_version}.ident.me/")
+            if isinstance(http_urls, str):
+                http_urls = [http_urls]
+
+            for http_url in http_urls or ():
+                if http_url:
+                    sources.append(
+                        (ip_version, "http", options.get("http_timeout", 1), (http_url,))
+                    )
+
+        return sources
+
+    def _race_source(
+        self, answers: Queue, ip_version: int, source_type: str, *source_args
+    ) -> None:
+        ip_address = getattr(self, f"_query_{source_type}")(ip_version, *source_args)
+        answers.put(
+            (ip_version, ip_address if self._is_valid_ip_address(ip_address, ip_version) else None)
+        )
+
+    async def _query_source_async(
+        self, ip_version: int, source_type: str, *source_args
+    ) -> Optional[str]:
+        ip_address = await getattr(self, f"_query_{source_type}_async")(ip_version, *source_args)
+        return ip_address if self._is_valid_ip_address(ip_address, ip_version) else None
 
     @staticmethod
-    def _run_dns_query(query: str, resolver: str, ip_version: int, timeout: float) -> Optional[str]:
+    def _is_valid_ip_address(ip_address: Optional[str], ip_version: int) -> bool:
+        if not ip_address:
+            return False
+
         try:
-            ip_address = check_output(
-                [
-                    "dig",
-                    "+short",
-                    ("-" + str(ip_version)),
-                    ("AAAA" if ip_version == 6 else "A"),
-                    query,
-                    "@" + resolver,
-                ],
-                timeout=timeout,
-                stderr=DEVNULL,
-                universal_newlines=True,
-            ).rstrip()
-        except (FileNotFoundError, TimeoutExpired, CalledProcessError):
-            return None
+            socket.inet_pton(socket.AF_INET6 if ip_version == 6 else socket.AF_INET, ip_address)
+        except (OSError, ValueError):
+            return False
+
+        return True
+
+    @staticmethod
+    def _query_dns(
+        ip_version: int, query: str, resolver: str, port: int, timeout: float
+    ) -> Optional[str]:
+        return query_address(query, resolver, ip_version, timeout, port)
+
+    @staticmethod
+    async def _query_dns_async(
+        ip_version: int, query: str, resolver: str, port: int, timeout: float
+    ) -> Optional[str]:
+        return await query_address_async(query, resolver, ip_version, timeout, port)
+
+    @classmethod
+    def _query_http(cls, _: int, url: str, timeout: float) -> Optional[str]:
+        return cls._run_http_request(url, timeout)
+
+    @classmethod
+    async def _query_http_async(cls, _: int, url: str, timeout: float) -> Optional[str]:
+        return await cls._run_in_daemon_thread(cls._run_http_request, url, timeout)
+
+    @staticmethod
+    def _run_in_daemon_thread(function: Callable, *args) -> asyncio.Future:
+        # An executor would be waited for on loop shutdown, even when its request lost the race.
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        def _set_result(result) -> None:
+            if not future.done():
+                future.set_result(result)
+
+        def _run() -> None:
+            result = function(*args)
+            # The loop may have been closed since.
+            with suppress(RuntimeError):
+                loop.call_soon_threadsafe(_set_result, result)
 
-        return ip_address
+        Thread(target=copy_context().run, args=(_run,), daemon=True).start()
+        return future
 
     @staticmethod
     def _run_http_request(server_url: str, timeout: float) -> Optional[str]:
         try:
             with urlopen(server_url, timeout=timeout) as http_request:
                 return http_request.read().decode().strip()
-        except (URLError, SocketTimeoutError):
+        # Connections may also be reset, or get malformed responses.
+        except (OSError, HTTPException, UnicodeDecodeError):
             return None
 
     def output(self, output) -> None:
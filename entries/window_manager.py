@@ -1,8 +1,9 @@
 import re
-from subprocess import DEVNULL, CalledProcessError, check_output
+from subprocess import CalledProcessError
 
 from entry import Entry
 from processes import Processes
+from sysroot import Sysroot
 
 WM_DICT = {
     "awesome": "Awesome",
@@ -22,17 +23,21 @@ class WindowManager(Entry):
 
     _PRETTY_NAME = "Window Manager"
 
+    _USES_PROCESSES = True
+    # `wmctrl` connects to the `DISPLAY` of the caller.
+    _USES_ENVIRONMENT = True
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
         try:
             self.value = re.search(
                 r"(?<=Name: ).*",
-                check_output(["wmctrl", "-m"], stderr=DEVNULL, universal_newlines=True),
+                Sysroot().check_output(["wmctrl", "-m"]),
             ).group(0)
         except (FileNotFoundError, CalledProcessError):
-            processes = Processes().list
+            process_table = Processes().table
             for wm_id, wm_name in WM_DICT.items():
-                if wm_id in processes:
+                if wm_id in process_table:
                     self.value = wm_name
                     break
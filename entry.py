@@ -1,15 +1,34 @@
 import logging
 from abc import ABC as AbstractBaseClass
 from abc import abstractmethod
-from typing import Optional
+from typing import Optional, Tuple
 
 from configuration import Configuration
 
+# Cached values are always discarded on reboot, see `EntryCache`.
+CACHE_TTL_UNTIL_REBOOT = float("inf")
+# Isolated collectors run in a child process, which is never waited for forever.
+ISOLATED_TIMEOUT = 10.0
+
 
 class Entry(AbstractBaseClass):
 
     _PRETTY_NAME: Optional[str] = None
 
+    _CACHE_TTL: Optional[float] = None
+    # Must be bumped when the value structure changes, so that cached values are discarded.
+    _VALUE_VERSION = 1
+    _CACHE_DEPENDENCIES: Tuple[str, ...] = ()
+
+    _TIMEOUT: Optional[float] = None
+    _ISOLATED = False
+
+    _REFRESH_INTERVAL: Optional[float] = None
+    _USES_PROCESSES = False
+    # Values depending on the caller environment (e.g. `TERM`) are never served by a daemon.
+    _USES_ENVIRONMENT = False
+    _DYNAMIC = False
+
     def __new__(cls, *_, **kwargs):
         return super().__new__(cls)
 
@@ -20,6 +39,75 @@ class Entry(AbstractBaseClass):
         self.options = options or {}
         self._default_strings = Configuration().get("default_strings")
         self._logger = logging.getLogger(self.__module__)
+        self.timed_out = False
+        self.profile: Optional[dict] = None
+
+    @classmethod
+    def from_value(cls, value, options: Optional[dict] = None) -> "Entry":
+        entry = cls.__new__(cls)
+        Entry.__init__(entry, value=value, options=options)
+        return entry
+
+    @classmethod
+    def from_timeout(cls, options: Optional[dict] = None) -> "Entry":
+        entry = cls.from_value(None, options=options)
+        entry.timed_out = True
+        return entry
+
+    @classmethod
+    def has_async_collector(cls) -> bool:
+        return hasattr(cls, "collect_async")
+
+    @classmethod
+    def get_cache_ttl(cls, options: Optional[dict] = None) -> Optional[float]:
+        return (options or {}).get("cache_ttl", cls._CACHE_TTL)
+
+    @classmethod
+    def get_cache_dependencies(cls) -> Tuple[str, ...]:
+        return cls._CACHE_DEPENDENCIES
+
+    @classmethod
+    def get_refresh_interval(cls, options: Optional[dict] = None) -> Optional[float]:
+        return (options or {}).get(
+            "refresh_interval",
+            cls._REFRESH_INTERVAL if cls._REFRESH_INTERVAL is not None else cls._CACHE_TTL,
+        )
+
+    @classmethod
+    def is_dynamic(cls) -> bool:
+        return cls._DYNAMIC
+
+    @classmethod
+    def uses_processes(cls) -> bool:
+        return cls._USES_PROCESSES
+
+    @classmethod
+    def uses_environment(cls) -> bool:
+        return cls._USES_ENVIRONMENT
+
+    @classmethod
+    def get_timeout(cls, options: Optional[dict] = None) -> Optional[float]:
+        timeout = (options or {}).get("timeout", cls._TIMEOUT)
+        if timeout is None and cls.is_isolated(options):
+            return ISOLATED_TIMEOUT
+
+        return timeout
+
+    @classmethod
+    def is_isolated(cls, options: Optional[dict] = None) -> bool:
+        return (options or {}).get("isolated", cls._ISOLATED)
+
+    # Parts of a cached (or daemon served) value which change at runtime are sampled again.
+    def refresh(self) -> None:
+        pass
+
+    def output_timed_out(self, output) -> None:
+        output.append(
+            self.name,
+            "{} ({})".format(
+                self._default_strings.get("not_detected"), self._default_strings.get("timed_out")
+            ),
+        )
 
     def output(self, output) -> None:
         if self.value:
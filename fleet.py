@@ -0,0 +1,232 @@
+import csv
+import json
+import logging
+import os
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Dict, Iterator, List, Optional, Sequence, Set, TextIO, Tuple, Type
+
+from distributions import Distributions
+from entry import Entry
+from isolation import get_fork_context
+from processes import Processes
+from sysroot import SNAPSHOT_FILE_NAME, Sysroot
+
+_WORKER_ENTRIES: Sequence[Tuple[Type[Entry], dict]] = ()
+
+
+def get_entry_name(entry_cls: Type[Entry]) -> str:
+    return entry_cls._PRETTY_NAME or entry_cls.__name__
+
+
+def iter_hosts(directory: str) -> Iterator[Tuple[str, str]]:
+    # Directories are walked lazily, so that memory does not grow with the fleet size.
+    with os.scandir(directory) as dir_entries:
+        sorted_dir_entries = sorted(dir_entries, key=lambda dir_entry: dir_entry.name)
+
+    for dir_entry in sorted_dir_entries:
+        if dir_entry.is_dir():
+            if os.path.isfile(os.path.join(dir_entry.path, SNAPSHOT_FILE_NAME)):
+                yield dir_entry.path, dir_entry.path
+            else:
+                yield from iter_hosts(dir_entry.path)
+        elif dir_entry.name.endswith(".json"):
+            yield dir_entry.path[: -len(".json")], dir_entry.path
+
+
+def _init_worker(entries: Sequence[Tuple[Type[Entry], dict]]) -> None:
+    global _WORKER_ENTRIES
+    _WORKER_ENTRIES = entries
+
+    # Warnings would otherwise be repeated for every single host.
+    logging.getLogger().setLevel(logging.ERROR)
+
+
+def _process_host(host: str, path: str) -> dict:
+    try:
+        if os.path.isdir(path):
+            return _collect_snapshot(host, path)
+
+        return _load_json_output(host, path)
+    except (EOFError, OSError, ValueError) as error:
+        return {"host": host, "source": None, "data": {}, "errors": {}, "error": str(error)}
+
+
+def _collect_snapshot(host: str, snapshot_dir: str) -> dict:
+    Sysroot().replay(snapshot_dir)
+    Distributions.clear_cache()
+    if any(entry_cls.uses_processes() for entry_cls, _ in _WORKER_ENTRIES):
+        Processes().refresh()
+
+    data = {}
+    errors = {}
+    for entry_cls, options in _WORKER_ENTRIES:
+        try:
+            entry = entry_cls(options=options)
+        except Exception as error:
+            errors[get_entry_name(entry_cls)] = f"{type(error).__name__}: {error}"
+            continue
+
+        data[entry.name] = entry.value
+
+    return {"host": host, "source": "snapshot", "data": data, "errors": errors}
+
+
+def _load_json_output(host: str, json_path: str) -> dict:
+    with open(json_path, encoding="UTF-8") as f_json_output:
+        document = json.load(f_json_output)
+
+    if not isinstance(document, dict) or not isinstance(document.get("data"), dict):
+        raise ValueError(f"{json_path} is not a JSON output")
+
+    return {"host": host, "source": "json", "data": document["data"], "errors": {}}
+
+
+class FleetSummary:
+
+    _MAX_DISTINCT_VALUES = 1000
+    _TOP_VALUES_COUNT = 10
+
+    def __init__(self):
+        self.hosts = 0
+        self.failed_hosts = 0
+        self.sources: Counter = Counter()
+        self._detected: Counter = Counter()
+        self._errors: Counter = Counter()
+        self._numbers: Dict[str, List[float]] = {}
+        self._values: Dict[str, Counter] = {}
+
+    def add(self, row: dict) -> None:
+        self.hosts += 1
+        if row.get("error"):
+            self.failed_hosts += 1
+            return
+
+        self.sources[row["source"]] += 1
+        self._errors.update(row["errors"].keys())
+        for entry_name, value in row["data"].items():
+            if value is None or value == [] or value == {}:
+                continue
+
+            self._detected[entry_name] += 1
+            if isinstance(value, dict):
+                for key, field_value in value.items():
+                    self._add_field(f"{entry_name}.{key}", field_value)
+            else:
+                self._add_field(entry_name, value)
+
+    def _add_field(self, field: str, value) -> None:
+        if isinstance(value, bool) or value is None:
+            return
+
+        if isinstance(value, (int, float)):
+            # [count, sum, min, max], instead of all the values.
+            numbers = self._numbers.setdefault(field, [0, 0.0, value, value])
+            numbers[0] += 1
+            numbers[1] += value
+            numbers[2] = min(numbers[2], value)
+            numbers[3] = max(numbers[3], value)
+        elif isinstance(value, str):
+            values = self._values.setdefault(field, Counter())
+            if value in values or len(values) < self._MAX_DISTINCT_VALUES:
+                values[value] += 1
+
+    def to_dict(self) -> dict:
+        return {
+            "hosts": self.hosts,
+            "failed_hosts": self.failed_hosts,
+            "sources": dict(self.sources),
+            "entries": {
+                entry_name: {
+                    "detected": self._detected[entry_name],
+                    "errors": self._errors[entry_name],
+                }
+                for entry_name in sorted(set(self._detected) | set(self._errors))
+            },
+            "numbers": {
+                field: {
+                    "count": count,
+                    "mean": total / count,
+                    "min": minimum,
+                    "max": maximum,
+                }
+                for field, (count, total, minimum, maximum) in sorted(self._numbers.items())
+            },
+            "values": {
+                field: dict(values.most_common(self._TOP_VALUES_COUNT))
+                for field, values in sorted(self._values.items())
+            },
+        }
+
+
+class FleetProcessor:
+
+    def __init__(
+        self,
+        entries: Sequence[Tuple[Type[Entry], dict]],
+        output_format: str = "ndjson",
+        max_workers: Optional[int] = None,
+    ):
+        self._entries = entries
+        self._output_format = output_format
+        self._max_workers = max_workers or os.cpu_count() or 1
+
+    def run(self, directory: str, output: TextIO) -> FleetSummary:
+        summary = FleetSummary()
+
+        csv_writer = None
+        if self._output_format == "csv":
+            csv_writer = csv.DictWriter(
+                output,
+                ["host", *(get_entry_name(entry_cls) for entry_cls, _ in self._entries), "errors"],
+                extrasaction="ignore",
+            )
+            csv_writer.writeheader()
+
+        def _write_row(row: dict) -> None:
+            summary.add(row)
+            if csv_writer is not None:
+                csv_writer.writerow(self._get_csv_row(row))
+            else:
+                output.write(json.dumps(row) + "\n")
+
+        # Hosts are submitted through a bounded window, rather than all at once.
+        max_pending = self._max_workers * 4
+        pending: Set[Future] = set()
+        with ProcessPoolExecutor(
+            self._max_workers,
+            mp_context=get_fork_context(),
+            initializer=_init_worker,
+            initargs=(self._entries,),
+        ) as executor:
+            for host, path in iter_hosts(directory):
+                if len(pending) >= max_pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        _write_row(future.result())
+
+                pending.add(
+                    executor.submit(_process_host, os.path.relpath(host, directory), path)
+                )
+
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    _write_row(future.result())
+
+        return summary
+
+    @staticmethod
+    def _get_csv_row(row: dict) -> dict:
+        csv_row = {"host": row["host"]}
+        for entry_name, value in row["data"].items():
+            if isinstance(value, (dict, list, tuple)):
+                value = json.dumps(value, sort_keys=True, separators=(",", ":"))
+            csv_row[entry_name] = value
+
+        if row.get("error"):
+            csv_row["errors"] = row["error"]
+        elif row["errors"]:
+            csv_row["errors"] = json.dumps(row["errors"])
+
+        return csv_row
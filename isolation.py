@@ -0,0 +1,124 @@
+import logging
+from functools import lru_cache
+from typing import Optional, Tuple, Type
+
+from configuration import Configuration
+from entry import Entry
+from profiling import Profiler
+from sysroot import Sysroot
+
+
+@lru_cache(maxsize=None)
+def get_fork_context():
+    # `multiprocessing` import is deferred, as most entries are never isolated.
+    import multiprocessing
+
+    if "fork" not in multiprocessing.get_all_start_methods():
+        return None
+
+    return multiprocessing.get_context("fork")
+
+
+@lru_cache(maxsize=None)
+def get_isolation_context():
+    import multiprocessing
+
+    # Isolated entries are collected from worker threads, whose locks (logging, `Sysroot`...) a
+    # forked child could inherit while held. Children are rather forked by a single-threaded server.
+    if "forkserver" not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("spawn")
+
+    isolation_context = multiprocessing.get_context("forkserver")
+    isolation_context.set_forkserver_preload(["isolation"])
+    return isolation_context
+
+
+def _isolated_collector(
+    entry_cls: Type[Entry],
+    options: dict,
+    sender,
+    config_path: Optional[str],
+    sysroot_args: Tuple[str, Optional[str], Optional[str]],
+    profiling: bool,
+) -> None:
+    # Children do not inherit the state of their parent, so it is set up again.
+    try:
+        Configuration(config_path=config_path)
+        Sysroot(*sysroot_args)
+        if profiling:
+            Profiler().enable()
+
+        with Profiler().profile_entry() as profile:
+            value = entry_cls(options=options).value
+        sender.send((True, value, profile, Sysroot().get_records()))
+    except Exception as error:
+        sender.send((False, f"{type(error).__name__}: {error}", None, Sysroot().get_records()))
+
+
+def run_isolated(entry_cls: Type[Entry], options: dict, timeout: Optional[float]) -> Entry:
+    isolation_context = get_isolation_context()
+    sysroot = Sysroot()
+
+    receiver, sender = isolation_context.Pipe(duplex=False)
+    process = isolation_context.Process(
+        target=_isolated_collector,
+        args=(
+            entry_cls,
+            options,
+            sender,
+            Configuration().config_path,
+            (sysroot.root_dir, sysroot.record_dir, sysroot.replay_dir),
+            Profiler().enabled,
+        ),
+        daemon=True,
+    )
+    try:
+        process.start()
+    except OSError as error:
+        logging.warning("Couldn't start %s collector : %s", entry_cls.__name__, error)
+        return entry_cls.from_value(None, options=options)
+    finally:
+        sender.close()
+
+    try:
+        if not receiver.poll(timeout):
+            raise TimeoutError(f"{entry_cls.__name__} did not complete within {timeout}s")
+
+        try:
+            succeeded, result, profile, records = receiver.recv()
+        except EOFError:
+            # The child died before reporting (e.g. crashed or killed by the OOM killer).
+            succeeded, result, profile, records = False, None, None, None
+    finally:
+        receiver.close()
+        if process.is_alive():
+            process.kill()
+        process.join()
+
+    if not succeeded:
+        logging.warning(
+            "%s collector failed : %s",
+            entry_cls.__name__,
+            result or f"exited with code {process.exitcode}",
+        )
+        result = None
+
+    # Reads performed by the child would otherwise be missing from a recorded snapshot.
+    sysroot.merge_records(records)
+
+    entry = entry_cls.from_value(result, options=options)
+    entry.profile = profile
+    return entry
+
+
+def collect_entry(entry_cls: Type[Entry], options: dict, timeout: Optional[float]) -> Entry:
+    profiler = Profiler()
+    with profiler.profile_entry() as profile:
+        if entry_cls.is_isolated(options):
+            entry = run_isolated(entry_cls, options, timeout)
+            profiler.merge_child_profile(profile, entry.profile)
+        else:
+            entry = entry_cls(options=options)
+
+    entry.profile = profile
+    return entry
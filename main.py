@@ -1,60 +1,22 @@
 import argparse
+import json
 import logging
 import os
-from concurrent.futures import ThreadPoolExecutor
-from contextlib import ExitStack
-from enum import Enum
-from typing import Callable, Optional
+import sys
+from copy import deepcopy
+from typing import List, Optional, Tuple, Type
 
 from _version import __version__
+from cache import EntryCache
 from configuration import Configuration
-from entries.cpu import CPU as e_CPU
-from entries.desktop_environment import DesktopEnvironment as e_DesktopEnvironment
-from entries.disk import Disk as e_Disk
-from entries.distro import Distro as e_Distro
-from entries.gpu import GPU as e_GPU
-from entries.hostname import Hostname as e_Hostname
-from entries.kernel import Kernel as e_Kernel
-from entries.lan_ip import LanIP as e_LanIP
-from entries.load_average import LoadAverage as e_LoadAverage
-from entries.model import Model as e_Model
-from entries.packages import Packages as e_Packages
-from entries.processes import Processes as e_Processes
-from entries.ram import RAM as e_RAM
-from entries.shell import Shell as e_Shell
-from entries.temperature import Temperature as e_Temperature
-from entries.terminal import Terminal as e_Terminal
-from entries.uptime import Uptime as e_Uptime
-from entries.user import User as e_User
-from entries.wan_ip import WanIP as e_WanIP
-from entries.window_manager import WindowManager as e_WindowManager
+from deadline import Deadline
+from entries import lazy_load_entry_class
 from entry import Entry
 from environment import Environment
 from output import Output
-from processes import Processes
-
-
-class Entries(Enum):
-    User = e_User
-    Hostname = e_Hostname
-    Model = e_Model
-    Distro = e_Distro
-    Kernel = e_Kernel
-    Uptime = e_Uptime
-    LoadAverage = e_LoadAverage
-    Processes = e_Processes
-    WindowManager = e_WindowManager
-    DesktopEnvironment = e_DesktopEnvironment
-    Shell = e_Shell
-    Terminal = e_Terminal
-    Packages = e_Packages
-    Temperature = e_Temperature
-    CPU = e_CPU
-    GPU = e_GPU
-    RAM = e_RAM
-    Disk = e_Disk
-    LAN_IP = e_LanIP
-    WAN_IP = e_WanIP
+from profiling import Profiler
+from sysroot import Sysroot
+from thread_engine import ThreadEngine
 
 
 def args_parsing() -> argparse.Namespace:
@@ -65,65 +27,290 @@ def args_parsing() -> argparse.Namespace:
         metavar="PATH",
         help="path to a configuration file, or a directory containing a `config.json`",
     )
+    parser.add_argument(
+        "-e",
+        "--entry",
+        action="append",
+        metavar="NAME",
+        help="only collect this entry (overrides the `entries` configuration option), "
+        "may be given multiple times",
+    )
     parser.add_argument(
         "-j",
         "--json",
         action="count",
         help="output entries data to JSON format, use multiple times to increase indentation",
     )
+    parser.add_argument(
+        "--ndjson",
+        action="store_true",
+        help="stream entries as newline-delimited JSON, as soon as each one completes",
+    )
+    parser.add_argument(
+        "--prometheus",
+        action="store_true",
+        help="output entries data to Prometheus text exposition format",
+    )
+    parser.add_argument(
+        "--prometheus-textfile",
+        metavar="PATH",
+        help="atomically write Prometheus metrics to a node_exporter textfile (or directory)",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="report per-entry timings, subprocesses, reads and value sources",
+    )
+    parser.add_argument(
+        "--engine",
+        choices=("threads", "asyncio"),
+        help="collection engine to use (overrides the `engine` configuration option)",
+    )
+    parser.add_argument(
+        "--deadline-ms",
+        type=float,
+        metavar="MS",
+        help="global collection deadline, late entries are reported as not detected",
+    )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="run as a daemon keeping entries warm and serving them over a Unix socket",
+    )
+    parser.add_argument(
+        "--no-daemon",
+        action="store_true",
+        help="collect entries directly, even if a daemon is running",
+    )
+    parser.add_argument(
+        "--watch",
+        type=float,
+        metavar="SECONDS",
+        help="refresh dynamic entries every SECONDS, static ones are collected only once",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="ignore and do not update the on-disk entries cache",
+    )
+    parser.add_argument(
+        "--sysroot",
+        metavar="PATH",
+        help="read system files below PATH (overrides the `sysroot` configuration option)",
+    )
+    snapshot_group = parser.add_mutually_exclusive_group()
+    snapshot_group.add_argument(
+        "--record",
+        metavar="DIR",
+        help="capture every file read and command output into a snapshot archive in DIR",
+    )
+    snapshot_group.add_argument(
+        "--replay",
+        metavar="DIR",
+        help="collect entries from the snapshot archive in DIR, without touching this system",
+    )
     parser.add_argument(
         "-v",
         "--version",
         action="version",
         version=__version__,
     )
+
+    subparsers = parser.add_subparsers(dest="command", metavar="COMMAND")
+    fleet_parser = subparsers.add_parser(
+        "fleet", help="batch process a directory of recorded snapshots or JSON outputs"
+    )
+    fleet_parser.add_argument(
+        "directory",
+        metavar="DIR",
+        help="directory of `--record` snapshots and/or `--json` output files",
+    )
+    fleet_parser.add_argument(
+        "-f",
+        "--format",
+        choices=("ndjson", "csv"),
+        default="ndjson",
+        help="merged table format (default: ndjson)",
+    )
+    fleet_parser.add_argument(
+        "-o",
+        "--output",
+        metavar="PATH",
+        help="write the merged table to PATH instead of standard output",
+    )
+    fleet_parser.add_argument(
+        "--summary",
+        metavar="PATH",
+        help="write summary statistics to PATH instead of standard error",
+    )
+    fleet_parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        metavar="N",
+        help="number of worker processes (default: number of CPUs)",
+    )
     return parser.parse_args()
 
 
+def run_fleet(args: argparse.Namespace, entries: List[Tuple[Type[Entry], dict]]) -> None:
+    # `fleet` import is deferred, as it pulls `multiprocessing` and `csv` in.
+    from fleet import FleetProcessor
+
+    fleet_processor = FleetProcessor(entries, args.format, args.workers)
+    if args.output:
+        with open(args.output, mode="w", encoding="UTF-8", newline="") as f_output:
+            summary = fleet_processor.run(args.directory, f_output)
+    else:
+        summary = fleet_processor.run(args.directory, sys.stdout)
+
+    summary_document = json.dumps(summary.to_dict(), indent=2)
+    if args.summary:
+        with open(args.summary, mode="w", encoding="UTF-8") as f_summary:
+            f_summary.write(summary_document + "\n")
+    else:
+        print(summary_document, file=sys.stderr)
+
+
 def main():
     args = args_parsing()
 
+    if args.profile:
+        Profiler().enable()
+
     logging.basicConfig(format="%(levelname)s: [%(name)s] %(message)s")
 
-    Processes()
     Environment()
     configuration = Configuration(config_path=args.config_path)
+    try:
+        sysroot = Sysroot(args.sysroot or configuration.get("sysroot"), args.record, args.replay)
+    except (OSError, ValueError) as error:
+        logging.error("Couldn't load snapshot : %s", error)
+        sys.exit(1)
 
-    available_entries = [
-        {"type": entry_name}
-        for entry_name in Entries.__members__
-    ]
-    output = Output(
-        format_to_json=args.json,
-    )
+    # Cached and daemon values describe the host, not another sysroot or a snapshot.
+    entry_cache = EntryCache(enabled=not args.no_cache and sysroot.is_host)
+
+    available_entries = deepcopy(configuration.get("entries", []))
+    if args.entry:
+        configured_entries = {
+            entry.get("type"): entry for entry in available_entries if isinstance(entry, dict)
+        }
+        available_entries = [
+            configured_entries.get(entry_name, {"type": entry_name}) for entry_name in args.entry
+        ]
 
-    def _entry_instantiator(entry: dict) -> Optional[Entry]:
+    def _entry_resolver(entry: dict) -> Optional[Tuple[Type[Entry], dict]]:
         try:
-            return Entries[entry.pop("type")].value(
-                options=entry,
-            )
+            return lazy_load_entry_class(entry.pop("type")), entry
         except KeyError as key_error:
             logging.warning("One entry (misses or) uses an invalid `type` field (%s).", key_error)
             return None
 
-    with ExitStack() as cm_stack:
-        mapper: Callable
+    resolved_entries = list(filter(None, map(_entry_resolver, available_entries)))
+
+    max_workers = 1
+    if configuration.get("parallel_loading"):
+        max_workers = min(len(resolved_entries) or 1, (os.cpu_count() or 1) + 4)
+
+    if args.command == "fleet":
+        run_fleet(args, resolved_entries)
+        return
+
+    if args.daemon:
+        # The daemon socket is queried by host runs only.
+        if not sysroot.is_host:
+            logging.error("Daemon mode can't be run on a sysroot, nor record or replay snapshots.")
+            sys.exit(1)
 
-        if not configuration.get("parallel_loading"):
-            mapper = map
-        else:
-            executor = cm_stack.enter_context(
-                ThreadPoolExecutor(
-                    max_workers=min(len(available_entries) or 1, (os.cpu_count() or 1) + 4)
-                )
+        # `daemon` import is deferred, as it pulls `socketserver` in (and is seldom run).
+        from daemon import Daemon
+        from daemon_client import get_socket_path
+
+        Daemon(entry_cache, resolved_entries, max_workers).serve_forever(get_socket_path())
+        return
+
+    deadline_ms = args.deadline_ms
+    if deadline_ms is None:
+        deadline_ms = configuration.get("deadline_ms")
+
+    engine_cls = ThreadEngine
+    if (args.engine or configuration.get("engine")) == "asyncio":
+        # `asyncio` import is deferred, as it is not needed by the default engine.
+        from async_engine import AsyncEngine
+
+        engine_cls = AsyncEngine
+
+    if args.watch:
+        from watch import Watcher
+
+        Watcher(
+            entry_cache,
+            resolved_entries,
+            args.watch,
+            lambda: Output(format_to_json=args.json, format_to_ndjson=args.ndjson),
+            max_workers,
+            deadline_ms,
+            engine_cls,
+        ).run()
+        sysroot.save()
+        return
+
+    output = Output(
+        format_to_json=args.json,
+        format_to_ndjson=args.ndjson,
+        format_to_prometheus=args.prometheus,
+    )
+
+    entries_instances: List[Optional[Entry]] = [None] * len(resolved_entries)
+    daemon_config = configuration.get("daemon", {})
+    if daemon_config.get("query", True) and not args.no_daemon and sysroot.is_host:
+        from daemon_client import get_socket_path, query_daemon
+
+        daemon_instances = query_daemon(
+            get_socket_path(), resolved_entries, daemon_config.get("query_timeout", 1)
+        )
+        if daemon_instances is not None:
+            entries_instances = daemon_instances
+            for entry_instance in filter(None, daemon_instances):
+                output.stream_entry(entry_instance)
+
+    # Without a daemon, or for entries depending on this process environment.
+    local_entries = [
+        entry
+        for entry, entry_instance in zip(resolved_entries, entries_instances)
+        if entry_instance is None
+    ]
+    if local_entries:
+        deadline = Deadline.from_milliseconds(deadline_ms)
+        local_instances = iter(
+            engine_cls(entry_cache, max_workers, deadline).collect(
+                local_entries, on_entry=output.stream_entry
             )
-            mapper = executor.map
+        )
+        entries_instances = [
+            entry_instance if entry_instance is not None else next(local_instances)
+            for entry_instance in entries_instances
+        ]
+
+    for entry_instance in entries_instances:
+        output.add_entry(entry_instance)
+
+    entry_cache.save()
+    sysroot.save()
+
+    if args.prometheus_textfile:
+        from prometheus import PrometheusExporter
 
-        for entry_instance in mapper(_entry_instantiator, available_entries):
-            if entry_instance:
-                output.add_entry(entry_instance)
+        PrometheusExporter(entries_instances).write_textfile(args.prometheus_textfile)
+    else:
+        output.output()
 
-    output.output()
+    if any(entry_instance.timed_out for entry_instance in entries_instances):
+        # Abandoned collector threads must not hold the process open.
+        sys.stdout.flush()
+        os._exit(0)
 
 
-main()
+if __name__ == "__main__":
+    main()
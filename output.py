@@ -10,6 +10,7 @@ from distributions import Distributions
 from entry import Entry
 from exceptions import SysInfoException
 from logos import get_logo_width, lazy_load_logo_module
+from profiling import Profiler
 
 
 class Output:
@@ -18,6 +19,8 @@ class Output:
 
     def __init__(self, **kwargs):
         self._format_to_json = kwargs.get("format_to_json")
+        self._format_to_ndjson = kwargs.get("format_to_ndjson")
+        self._format_to_prometheus = kwargs.get("format_to_prometheus")
         self._distribution = Distributions.get_local()
         logo_module = lazy_load_logo_module(self._distribution.value)
         self._logo, self._colors = logo_module.LOGO.copy(), logo_module.COLORS.copy()
@@ -28,20 +31,60 @@ class Output:
     def add_entry(self, module: Entry) -> None:
         self._entries.append(module)
 
+    def stream_entry(self, module: Entry) -> None:
+        if self._format_to_ndjson:
+            print(API.ndjson_entry_serialization(module), flush=True)
+
     def append(self, key: str, value) -> None:
         self._results.append(f"{self._entries_color}{key}:{Colors.CLEAR} {value}")
 
     def output(self) -> None:
-        if self._format_to_json:
+        if self._format_to_prometheus:
+            # `prometheus` import is deferred, as this format is seldom requested.
+            from prometheus import PrometheusExporter
+
+            print(PrometheusExporter(self._entries).text_serialization(), end="")
+        elif self._format_to_ndjson:
+            print(API(self._entries).ndjson_meta_serialization(), flush=True)
+        elif self._format_to_json:
             self._output_json()
         else:
             for entry in self._entries:
-                entry.output(self)
+                if entry.timed_out:
+                    entry.output_timed_out(self)
+                else:
+                    entry.output(self)
             self._output_text()
 
+            if Profiler().enabled:
+                self._output_profile()
+
     def _output_json(self) -> None:
         print(API(self._entries).json_serialization(indent=cast(int, self._format_to_json) - 1))
 
+    def _output_profile(self) -> None:
+        for entry in self._entries:
+            if entry.profile is None:
+                print(f"{entry.name}: -", file=sys.stderr)
+                continue
+
+            profile_parts = [f"{entry.profile['wall_time'] * 1000:.1f} ms wall"]
+            if entry.profile["cpu_time"] is not None:
+                profile_parts.append(f"{entry.profile['cpu_time'] * 1000:.1f} ms CPU")
+            profile_parts.append(f"{entry.profile['subprocesses']} subprocess(es)")
+            profile_parts.append(
+                f"{entry.profile['procfs_files']} procfs / {entry.profile['sysfs_files']} sysfs"
+                f" file(s), {entry.profile['read_bytes']} B read"
+            )
+            profile_parts.append("from " + (", ".join(entry.profile["sources"]) or "memory"))
+
+            print(f"{entry.name}: " + ", ".join(profile_parts), file=sys.stderr)
+
+        process_usage = Profiler().get_process_usage()
+        print(
+            ", ".join(f"{key}: {value}" for key, value in process_usage.items()), file=sys.stderr
+        )
+
     def _output_text(self) -> None:
 
         logo_width = get_logo_width(self._logo, len(self._colors))
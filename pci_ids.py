@@ -0,0 +1,187 @@
+import logging
+import mmap
+import os
+import re
+import struct
+import zlib
+from array import array
+from bisect import bisect_left
+from contextlib import suppress
+from threading import Lock
+from typing import Optional, Sequence, Tuple
+
+from cache import get_cache_dir
+from singleton import Singleton
+from sysroot import Sysroot
+
+PCI_IDS_PATHS = (
+    "/usr/share/hwdata/pci.ids",
+    "/usr/share/misc/pci.ids",
+    "/usr/share/pci.ids",
+    "/usr/local/share/pci.ids",
+)
+
+# magic, pci.ids (size, mtime, inode) fingerprint, vendors count, devices count
+INDEX_HEADER = struct.Struct("=8sQQQQQ")
+INDEX_MAGIC = b"PCIIDX\x00\x01"
+
+# Subsystems lines (indented twice) and comments never match.
+PCI_IDS_LINE_REGEXP = re.compile(
+    rb"^(?:(?P<vendor>[0-9a-fA-F]{4})|\t(?P<device>[0-9a-fA-F]{4}))  ", flags=re.MULTILINE
+)
+
+
+class PciIds(metaclass=Singleton):
+
+    def __init__(self):
+        self._lock = Lock()
+        self._pci_ids: Optional[mmap.mmap] = None
+        self._vendors_keys: Sequence[int] = ()
+        self._vendors_offsets: Sequence[int] = ()
+        self._devices_keys: Sequence[int] = ()
+        self._devices_offsets: Sequence[int] = ()
+        self._loaded = False
+
+    def get_vendor_name(self, vendor_id: int) -> Optional[str]:
+        return Sysroot().lookup(
+            f"pci.ids:{vendor_id:04x}", lambda: self._find_name(vendor_id, is_device=False)
+        )
+
+    def get_device_name(self, vendor_id: int, device_id: int) -> Optional[str]:
+        return Sysroot().lookup(
+            f"pci.ids:{vendor_id:04x}:{device_id:04x}",
+            lambda: self._find_name(vendor_id << 16 | device_id, is_device=True),
+        )
+
+    def _find_name(self, key: int, is_device: bool) -> Optional[str]:
+        with self._lock:
+            if not self._loaded:
+                self._load()
+                self._loaded = True
+
+        if self._pci_ids is None:
+            return None
+
+        if is_device:
+            keys, offsets = self._devices_keys, self._devices_offsets
+        else:
+            keys, offsets = self._vendors_keys, self._vendors_offsets
+
+        # `keys` and `offsets` may be views over the mapped index, which are never copied.
+        key_index = bisect_left(keys, key)
+        if key_index == len(keys) or keys[key_index] != key:
+            return None
+
+        name_offset = offsets[key_index]
+        name_end = self._pci_ids.find(b"\n", name_offset)
+        return self._pci_ids[name_offset:name_end].decode("UTF-8", "replace").strip() or None
+
+    def _load(self) -> None:
+        sysroot = Sysroot()
+        for pci_ids_path in PCI_IDS_PATHS:
+            pci_ids_path = sysroot.get_path(pci_ids_path)
+            with suppress(OSError, ValueError):
+                with open(pci_ids_path, "rb") as f_pci_ids:
+                    self._pci_ids = mmap.mmap(f_pci_ids.fileno(), 0, access=mmap.ACCESS_READ)
+                    pci_ids_stat = os.fstat(f_pci_ids.fileno())
+                break
+        else:
+            return
+
+        fingerprint = (pci_ids_stat.st_size, pci_ids_stat.st_mtime_ns, pci_ids_stat.st_ino)
+        # Each pci.ids file (e.g. in different sysroots) gets its own index.
+        index_path = os.path.join(
+            get_cache_dir(), f"pci.ids.{zlib.crc32(os.fsencode(pci_ids_path)):08x}.idx"
+        )
+        if self._map_index(index_path, fingerprint):
+            return
+
+        arrays = self._build_index(self._pci_ids)
+        self._vendors_keys, self._vendors_offsets, self._devices_keys, self._devices_offsets = (
+            arrays
+        )
+        try:
+            self._write_index(index_path, fingerprint, arrays)
+        except OSError as error:
+            logging.warning("Couldn't write pci.ids index (%s) : %s", index_path, error)
+
+    @staticmethod
+    def _build_index(pci_ids: mmap.mmap) -> Tuple[array, array, array, array]:
+        # See the format description at the top of `pci.ids`.
+        vendors_keys, vendors_offsets = array("I"), array("I")
+        devices_keys, devices_offsets = array("I"), array("I")
+
+        # Device classes come after all the vendors.
+        classes_offset = pci_ids.find(b"\nC ")
+        if classes_offset == -1:
+            classes_offset = len(pci_ids)
+
+        vendor_id = None
+        for id_match in PCI_IDS_LINE_REGEXP.finditer(pci_ids, 0, classes_offset):
+            if id_match.group("vendor") is not None:
+                vendor_id = int(id_match.group("vendor"), 16)
+                vendors_keys.append(vendor_id)
+                vendors_offsets.append(id_match.end())
+            elif vendor_id is not None:
+                devices_keys.append(vendor_id << 16 | int(id_match.group("device"), 16))
+                devices_offsets.append(id_match.end())
+
+        # pci.ids is sorted, but this is not enforced by its format.
+        for keys, offsets in ((vendors_keys, vendors_offsets), (devices_keys, devices_offsets)):
+            if any(keys[index] > keys[index + 1] for index in range(len(keys) - 1)):
+                sorted_items = sorted(zip(keys, offsets))
+                keys[:] = array("I", (key for key, _ in sorted_items))
+                offsets[:] = array("I", (offset for _, offset in sorted_items))
+
+        return vendors_keys, vendors_offsets, devices_keys, devices_offsets
+
+    def _map_index(self, index_path: str, fingerprint: Tuple[int, int, int]) -> bool:
+        try:
+            with open(index_path, "rb") as f_index:
+                index = mmap.mmap(f_index.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return False
+
+        try:
+            magic, *index_fingerprint, nb_vendors, nb_devices = INDEX_HEADER.unpack_from(index)
+        except struct.error:
+            return False
+
+        if (
+            magic != INDEX_MAGIC
+            or tuple(index_fingerprint) != fingerprint
+            or len(index) != INDEX_HEADER.size + 4 * 2 * (nb_vendors + nb_devices)
+        ):
+            return False
+
+        arrays_view = memoryview(index)[INDEX_HEADER.size:].cast("I")
+        self._vendors_keys = arrays_view[:nb_vendors]
+        self._vendors_offsets = arrays_view[nb_vendors:2 * nb_vendors]
+        self._devices_keys = arrays_view[2 * nb_vendors:2 * nb_vendors + nb_devices]
+        self._devices_offsets = arrays_view[2 * nb_vendors + nb_devices:]
+        return True
+
+    @staticmethod
+    def _write_index(
+        index_path: str,
+        fingerprint: Tuple[int, int, int],
+        arrays: Tuple[array, array, array, array],
+    ) -> None:
+        vendors_keys, _, devices_keys, _ = arrays
+
+        os.makedirs(os.path.dirname(index_path), exist_ok=True)
+        tmp_path = f"{index_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f_index:
+                f_index.write(
+                    INDEX_HEADER.pack(
+                        INDEX_MAGIC, *fingerprint, len(vendors_keys), len(devices_keys)
+                    )
+                )
+                for index_array in arrays:
+                    index_array.tofile(f_index)
+            os.replace(tmp_path, index_path)
+        except BaseException:
+            with suppress(FileNotFoundError):
+                os.unlink(tmp_path)
+            raise
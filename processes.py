@@ -1,31 +1,154 @@
 import logging
 import typing
-from subprocess import PIPE, CalledProcessError, check_output
+from bisect import bisect_left
+from subprocess import CalledProcessError
+from threading import Lock
 
 from singleton import Singleton
+from sysroot import Sysroot
+
+
+class ProcessTable:
+
+    def __init__(self, processes: typing.Iterable[typing.Tuple[typing.Optional[int], str]]):
+        self._counts: typing.Dict[str, int] = {}
+        self._pids: typing.Dict[str, typing.List[int]] = {}
+        for pid, comm in processes:
+            self._counts[comm] = self._counts.get(comm, 0) + 1
+            if pid is not None:
+                self._pids.setdefault(comm, []).append(pid)
+
+        self.number = sum(self._counts.values())
+
+        self._lock = Lock()
+        self._sorted_comms: typing.Optional[typing.List[str]] = None
+        self._cmdlines: typing.Dict[int, typing.Optional[typing.List[str]]] = {}
+        self._uids: typing.Dict[int, typing.Optional[int]] = {}
+
+    def __contains__(self, comm: str) -> bool:
+        return comm in self._counts
+
+    def __len__(self) -> int:
+        return self.number
+
+    def __iter__(self) -> typing.Iterator[str]:
+        for comm, count in self._counts.items():
+            for _ in range(count):
+                yield comm
+
+    def count(self, comm: str) -> int:
+        return self._counts.get(comm, 0)
+
+    def find_prefix(self, prefix: str) -> typing.List[str]:
+        with self._lock:
+            if self._sorted_comms is None:
+                self._sorted_comms = sorted(self._counts)
+            sorted_comms = self._sorted_comms
+
+        matching_comms = []
+        for comm in sorted_comms[bisect_left(sorted_comms, prefix):]:
+            if not comm.startswith(prefix):
+                break
+            matching_comms.append(comm)
+
+        return matching_comms
+
+    def get_pids(self, comm: str) -> typing.Tuple[int, ...]:
+        return tuple(self._pids.get(comm, ()))
+
+    def get_cmdline(self, pid: int) -> typing.Optional[typing.List[str]]:
+        with self._lock:
+            if pid in self._cmdlines:
+                return self._cmdlines[pid]
+
+        try:
+            cmdline = Sysroot().read_bytes(f"/proc/{pid}/cmdline")
+        except OSError:
+            cmdline_args = None
+        else:
+            cmdline_args = cmdline.decode(errors="replace").rstrip("\0").split("\0")
+
+        with self._lock:
+            self._cmdlines[pid] = cmdline_args
+        return cmdline_args
+
+    def get_uid(self, pid: int) -> typing.Optional[int]:
+        with self._lock:
+            if pid in self._uids:
+                return self._uids[pid]
+
+        uid = None
+        try:
+            status = Sysroot().read_bytes(f"/proc/{pid}/status")
+        except OSError:
+            pass
+        else:
+            for line in status.splitlines():
+                if line.startswith(b"Uid:"):
+                    uid = int(line.split()[1])
+                    break
+
+        with self._lock:
+            self._uids[pid] = uid
+        return uid
 
 
 class Processes(metaclass=Singleton):
     def __init__(self):
-        self._processes: typing.List[str]
+        self.table: ProcessTable
+        self.refresh()
+
+    def refresh(self) -> None:
+        processes = self._scan_proc()
+        if processes is None:
+            processes = self._run_ps()
+
+        # A new table is swapped in, so that readers never see one being built.
+        self.table = ProcessTable(processes)
 
+    @staticmethod
+    def _scan_proc() -> typing.Optional[typing.List[typing.Tuple[typing.Optional[int], str]]]:
+        sysroot = Sysroot()
         try:
-            ps_output = check_output(["ps", "-eo", "comm"], stderr=PIPE, universal_newlines=True)
+            pids = [name for name in sysroot.listdir("/proc") if name.isdigit()]
+        except OSError:
+            return None
+
+        # An empty `/proc` is most likely not mounted (procfs always lists the current process).
+        if not pids:
+            return None
+
+        processes: typing.List[typing.Tuple[typing.Optional[int], str]] = []
+        for pid in pids:
+            try:
+                comm = sysroot.read_bytes(f"/proc/{pid}/comm")
+            except OSError:
+                # The process exited since `/proc` has been listed.
+                continue
+
+            processes.append((int(pid), comm.decode(errors="replace").rstrip("\n")))
+
+        return processes
+
+    @staticmethod
+    def _run_ps() -> typing.List[typing.Tuple[typing.Optional[int], str]]:
+        try:
+            ps_output = Sysroot().check_output(["ps", "-eo", "comm"])
         except FileNotFoundError:
-            self._processes = []
             logging.warning("`procps` (or `procps-ng`) couldn't be found on your system.")
+            return []
         except CalledProcessError as process_error:
-            self._processes = []
             logging.warning(
                 "This implementation of `ps` might not be supported : %s", process_error.stderr
             )
-        else:
-            self._processes = ps_output.splitlines()[1:]
+            return []
+
+        return [(None, comm) for comm in ps_output.splitlines()[1:]]
 
     @property
     def list(self) -> tuple:
-        return tuple(self._processes)
+        return tuple(self.table)
 
     @property
     def number(self) -> int:
-        return len(self._processes)
+        return self.table.number
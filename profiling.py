@@ -0,0 +1,135 @@
+import sys
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from threading import Lock
+from typing import Iterator, Optional
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+from singleton import Singleton
+
+_CURRENT_PROFILE: ContextVar[Optional[dict]] = ContextVar("current_profile", default=None)
+_READ_BYTES_LOCK = Lock()
+
+
+class Profiler(metaclass=Singleton):
+
+    def __init__(self):
+        self.enabled = False
+        self._lock = Lock()
+        self._forks = 0
+
+    def enable(self) -> None:
+        if self.enabled:
+            return
+
+        self.enabled = True
+        sys.addaudithook(self._audit_hook)
+
+    @contextmanager
+    def profile_entry(self, per_thread: bool = True) -> Iterator[Optional[dict]]:
+        if not self.enabled:
+            yield None
+            return
+
+        profile = {
+            "wall_time": 0.0,
+            "cpu_time": None,
+            "subprocesses": 0,
+            "procfs_files": 0,
+            "sysfs_files": 0,
+            "read_bytes": 0,
+            "sources": [],
+        }
+
+        start_cpu_time = time.thread_time() if per_thread else None
+        start_wall_time = time.perf_counter()
+
+        token = _CURRENT_PROFILE.set(profile)
+        try:
+            yield profile
+        finally:
+            _CURRENT_PROFILE.reset(token)
+
+            profile["wall_time"] = time.perf_counter() - start_wall_time
+            if start_cpu_time is not None:
+                profile["cpu_time"] = time.thread_time() - start_cpu_time
+
+    @staticmethod
+    def add_source(profile: Optional[dict], source: str) -> None:
+        if profile is not None and source not in profile["sources"]:
+            profile["sources"].append(source)
+
+    @staticmethod
+    def add_read_bytes(path: str, byte_count: int) -> None:
+        # Only procfs and sysfs reads (through `Sysroot`) are accounted, by threads started from
+        # the entry too, as long as they run in its context.
+        profile = _CURRENT_PROFILE.get()
+        if profile is not None and path.startswith(("/proc/", "/sys/")):
+            with _READ_BYTES_LOCK:
+                profile["read_bytes"] += byte_count
+
+    def merge_child_profile(self, profile: Optional[dict], child_profile: Optional[dict]) -> None:
+        if profile is None or child_profile is None:
+            return
+
+        with self._lock:
+            self._forks += 1 + child_profile["subprocesses"]
+
+        for counter in ("subprocesses", "procfs_files", "sysfs_files", "read_bytes"):
+            profile[counter] += child_profile[counter]
+        if child_profile["cpu_time"] is not None:
+            profile["cpu_time"] = (profile["cpu_time"] or 0) + child_profile["cpu_time"]
+        for source in child_profile["sources"]:
+            self.add_source(profile, source)
+
+    def get_process_usage(self) -> dict:
+        process_usage = {"forks": self._forks}
+        if resource is None:
+            return process_usage
+
+        self_usage = resource.getrusage(resource.RUSAGE_SELF)
+        children_usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+        process_usage.update(
+            {
+                "max_rss_kib": self_usage.ru_maxrss,
+                "children_max_rss_kib": children_usage.ru_maxrss,
+                "user_time": self_usage.ru_utime,
+                "system_time": self_usage.ru_stime,
+                "children_user_time": children_usage.ru_utime,
+                "children_system_time": children_usage.ru_stime,
+            }
+        )
+        return process_usage
+
+    def _audit_hook(self, event: str, args: tuple) -> None:
+        if event == "subprocess.Popen":
+            with self._lock:
+                self._forks += 1
+
+        profile = _CURRENT_PROFILE.get()
+        if profile is None:
+            return
+
+        if event == "subprocess.Popen":
+            profile["subprocesses"] += 1
+            self.add_source(profile, "subprocess")
+        elif event == "open":
+            path = args[0]
+            if isinstance(path, bytes):
+                path = path.decode(errors="replace")
+            if not isinstance(path, str):
+                return
+
+            if path.startswith("/proc/"):
+                profile["procfs_files"] += 1
+                self.add_source(profile, "procfs")
+            elif path.startswith("/sys/"):
+                profile["sysfs_files"] += 1
+                self.add_source(profile, "sysfs")
+        elif event in ("socket.connect", "socket.getaddrinfo"):
+            self.add_source(profile, "network")
@@ -0,0 +1,181 @@
+import os
+from contextlib import suppress
+from typing import Dict, List, Optional, Sequence
+
+from entries import get_entry_type
+from entry import Entry
+
+METRICS_PREFIX = "sysinfo"
+
+
+class PrometheusExporter:
+
+    def __init__(self, entries: Sequence[Entry]):
+        self.entries = entries
+        self._metrics: Dict[str, dict] = {}
+
+    def text_serialization(self) -> str:
+        self._metrics = {}
+
+        for entry in self.entries:
+            if entry.timed_out or not entry.value:
+                continue
+
+            exporter = getattr(self, f"_export_{get_entry_type(type(entry)).lower()}", None)
+            if exporter is not None:
+                exporter(entry.value)
+
+        lines = []
+        for metric_name, metric in self._metrics.items():
+            lines.append(f"# HELP {metric_name} {metric['help']}")
+            lines.append(f"# TYPE {metric_name} gauge")
+            for labels, value in metric["samples"]:
+                lines.append(f"{metric_name}{self._format_labels(labels)} {value!r}")
+
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path: str) -> None:
+        if os.path.isdir(path):
+            path = os.path.join(path, f"{METRICS_PREFIX}.prom")
+
+        # node_exporter may read the file at any time, so it is atomically replaced.
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, mode="w", encoding="UTF-8") as f_textfile:
+                f_textfile.write(self.text_serialization())
+            os.replace(tmp_path, path)
+        except BaseException:
+            with suppress(FileNotFoundError):
+                os.unlink(tmp_path)
+            raise
+
+    def _add_sample(
+        self, name: str, help_text: str, value: float, labels: Optional[Dict[str, str]] = None
+    ) -> None:
+        metric = self._metrics.setdefault(
+            f"{METRICS_PREFIX}_{name}", {"help": help_text, "samples": []}
+        )
+        metric["samples"].append((labels or {}, float(value)))
+
+    @staticmethod
+    def _format_labels(labels: Dict[str, str]) -> str:
+        if not labels:
+            return ""
+
+        formatted_labels: List[str] = []
+        for label_name, label_value in labels.items():
+            label_value = (
+                str(label_value).replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\"")
+            )
+            formatted_labels.append(f'{label_name}="{label_value}"')
+
+        return "{" + ",".join(formatted_labels) + "}"
+
+    def _export_ram(self, value: dict) -> None:
+        self._add_sample("ram_used_bytes", "Used memory.", value["used"] * 1024 ** 2)
+        self._add_sample("ram_total_bytes", "Total memory.", value["total"] * 1024 ** 2)
+        if value.get("swap_total") is not None:
+            self._add_sample("swap_used_bytes", "Used swap.", value["swap_used"] * 1024 ** 2)
+            self._add_sample("swap_total_bytes", "Total swap.", value["swap_total"] * 1024 ** 2)
+        for compression_name in ("zram", "zswap"):
+            compression_ratio = value.get(f"{compression_name}_compression_ratio")
+            if compression_ratio is not None:
+                self._add_sample(
+                    f"{compression_name}_compression_ratio",
+                    f"Original to compressed size ratio of {compression_name} data.",
+                    compression_ratio,
+                )
+        if value.get("hugepages_total") is not None:
+            self._add_sample("hugepages_total", "Total huge pages.", value["hugepages_total"])
+            self._add_sample("hugepages_free", "Free huge pages.", value["hugepages_free"])
+
+    def _export_disk(self, value: dict) -> None:
+        for mount_point, filesystem_data in value.items():
+            labels = {"mountpoint": mount_point, "device": filesystem_data["device_path"]}
+            self._add_sample(
+                "disk_used_bytes",
+                "Used filesystem space.",
+                filesystem_data["used_blocks"] * 1024,
+                labels,
+            )
+            self._add_sample(
+                "disk_total_bytes",
+                "Total filesystem space.",
+                filesystem_data["total_blocks"] * 1024,
+                labels,
+            )
+
+    def _export_diskio(self, value: dict) -> None:
+        for device, device_io in value.items():
+            labels = {"device": device}
+            self._add_sample(
+                "disk_read_bytes_per_second",
+                "Disk read throughput.",
+                device_io["read_bytes_per_second"],
+                labels,
+            )
+            self._add_sample(
+                "disk_write_bytes_per_second",
+                "Disk write throughput.",
+                device_io["write_bytes_per_second"],
+                labels,
+            )
+            self._add_sample(
+                "disk_iops",
+                "Disk I/O operations per second.",
+                device_io["read_iops"] + device_io["write_iops"],
+                labels,
+            )
+            self._add_sample(
+                "disk_await_milliseconds",
+                "Disk average I/O completion time.",
+                device_io["await_ms"],
+                labels,
+            )
+            self._add_sample(
+                "disk_utilization_percent", "Disk busy time.", device_io["util_percent"], labels
+            )
+
+    def _export_loadaverage(self, value: Sequence[float]) -> None:
+        for period, load_average in zip(("1m", "5m", "15m"), value):
+            self._add_sample(
+                "load_average", "System load average.", load_average, {"period": period}
+            )
+
+    def _export_temperature(self, value: dict) -> None:
+        self._add_sample(
+            "temperature_celsius", "Average temperature of sensors.", value["temperature"]
+        )
+        self._add_sample(
+            "temperature_max_celsius", "Maximum temperature of sensors.", value["max_temperature"]
+        )
+
+    def _export_uptime(self, value: dict) -> None:
+        uptime_seconds = (
+            value["days"] * 86400 + value["hours"] * 3600 + value["minutes"] * 60 + value["seconds"]
+        )
+        self._add_sample("uptime_seconds", "System uptime.", uptime_seconds)
+
+    def _export_processes(self, value: int) -> None:
+        self._add_sample("processes", "Number of running processes.", value)
+
+    def _export_packages(self, value: dict) -> None:
+        self._add_sample("packages", "Number of installed packages.", value["count"])
+        for packages_source, packages_count in value["sources"].items():
+            self._add_sample(
+                "packages_by_source",
+                "Number of installed packages, by source.",
+                packages_count,
+                {"source": packages_source},
+            )
+
+    def _export_kernel(self, value: dict) -> None:
+        if value["is_outdated"] is None:
+            return
+
+        self._add_sample(
+            "kernel_outdated",
+            "Whether a newer stable kernel release is available.",
+            int(value["is_outdated"]),
+            {"release": value["release"], "latest": value["latest"]},
+        )
@@ -1,12 +1,16 @@
 from abc import ABCMeta as AbstractBaseMetaClass
+from threading import RLock
 from typing import Dict
 
 
 class Singleton(AbstractBaseMetaClass):
 
     _instances: Dict["Singleton", object] = {}
+    _instances_lock = RLock()
 
     def __call__(cls, *args, **kwargs):
         if cls not in cls._instances:
-            cls._instances[cls] = super(Singleton, cls).__call__(*args, **kwargs)
+            with cls._instances_lock:
+                if cls not in cls._instances:
+                    cls._instances[cls] = super(Singleton, cls).__call__(*args, **kwargs)
         return cls._instances[cls]
@@ -0,0 +1,338 @@
+import errno
+import glob
+import json
+import os
+import shutil
+from contextlib import suppress
+from subprocess import PIPE, CalledProcessError, CompletedProcess, run
+from threading import Lock
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from profiling import Profiler
+from singleton import Singleton
+
+SNAPSHOT_FILE_NAME = "snapshot.json.gz"
+# Must be bumped when what is recorded changes (e.g. commands replaced by native reads).
+SNAPSHOT_VERSION = 4
+SNAPSHOT_RECORDS_KINDS = (
+    "files", "directories", "globs", "statvfs", "commands", "environment", "lookups"
+)
+
+
+class Sysroot(metaclass=Singleton):
+
+    def __init__(
+        self,
+        root_dir: Optional[str] = None,
+        record_dir: Optional[str] = None,
+        replay_dir: Optional[str] = None,
+    ):
+        self.root_dir = os.path.abspath(root_dir or "/")
+        self.record_dir = record_dir
+        self.replay_dir: Optional[str] = None
+
+        self._lock = Lock()
+        self._records: Dict[str, dict] = {kind: {} for kind in SNAPSHOT_RECORDS_KINDS}
+        if replay_dir is not None:
+            self.replay(replay_dir)
+
+    def replay(self, replay_dir: str) -> None:
+        records = self.load_snapshot(replay_dir)
+        with self._lock:
+            self.record_dir = None
+            self.replay_dir = replay_dir
+            self._records = records
+
+    @property
+    def recording(self) -> bool:
+        return self.record_dir is not None
+
+    @property
+    def replaying(self) -> bool:
+        return self.replay_dir is not None
+
+    @property
+    def is_host(self) -> bool:
+        return self.root_dir == "/" and not self.recording and not self.replaying
+
+    def get_path(self, path: str) -> str:
+        if self.root_dir == "/":
+            return path
+
+        return os.path.join(self.root_dir, path.lstrip("/"))
+
+    def read_bytes(self, path: str) -> bytes:
+        if self.replaying:
+            recorded_content = self._records["files"].get(path)
+            if recorded_content is None:
+                raise FileNotFoundError(errno.ENOENT, "No such file in snapshot", path)
+
+            content = recorded_content.encode("UTF-8", "surrogateescape")
+        else:
+            try:
+                content = self._read_file(self.get_path(path))
+            except OSError:
+                self._record("files", path, None)
+                raise
+
+            if self.recording:
+                # Undecodable bytes are kept as lone surrogates, which JSON can represent.
+                self._record("files", path, content.decode("UTF-8", "surrogateescape"))
+
+        Profiler.add_read_bytes(path, len(content))
+        return content
+
+    @staticmethod
+    def _read_file(path: str) -> bytes:
+        # Raw descriptors are several times cheaper than file objects, for many small procfs files.
+        fd = os.open(path, os.O_RDONLY | os.O_CLOEXEC)
+        try:
+            chunks = []
+            while True:
+                chunk = os.read(fd, 65536)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+        finally:
+            os.close(fd)
+
+        return b"".join(chunks)
+
+    def read_text(self, path: str, encoding: str = "UTF-8") -> str:
+        return self.read_bytes(path).decode(encoding)
+
+    def iter_lines(self, path: str, encoding: str = "UTF-8") -> Iterator[str]:
+        # Snapshots hold whole files, so only host files are actually streamed.
+        if self.recording or self.replaying:
+            yield from self.read_text(path, encoding).splitlines()
+            return
+
+        read_bytes = 0
+        try:
+            with open(self.get_path(path), encoding=encoding) as f_file:
+                for line in f_file:
+                    read_bytes += len(line)
+                    yield line.rstrip("\n")
+        finally:
+            Profiler.add_read_bytes(path, read_bytes)
+
+    def listdir(self, path: str) -> List[str]:
+        if self.replaying:
+            names = self._records["directories"].get(path)
+            if names is None:
+                raise FileNotFoundError(errno.ENOENT, "No such directory in snapshot", path)
+
+            return list(names)
+
+        try:
+            with os.scandir(self.get_path(path)) as dir_entries:
+                names = [dir_entry.name for dir_entry in dir_entries]
+        except OSError:
+            self._record("directories", path, None)
+            raise
+
+        self._record("directories", path, names)
+        return names
+
+    def statvfs(self, path: str) -> Tuple[int, int, int]:
+        if self.replaying:
+            statvfs_result = self._records["statvfs"].get(path)
+            if statvfs_result is None:
+                raise FileNotFoundError(errno.ENOENT, "No such mount point in snapshot", path)
+
+            return tuple(statvfs_result)
+
+        try:
+            statvfs_result = os.statvfs(self.get_path(path))
+        except OSError:
+            self._record("statvfs", path, None)
+            raise
+
+        frsize_blocks_bfree = (
+            statvfs_result.f_frsize, statvfs_result.f_blocks, statvfs_result.f_bfree
+        )
+        self._record("statvfs", path, frsize_blocks_bfree)
+        return frsize_blocks_bfree
+
+    def getenv(self, name: str) -> Optional[str]:
+        if self.replaying:
+            return self._records["environment"].get(name)
+
+        value = os.getenv(name)
+        self._record("environment", name, value)
+        return value
+
+    def glob(self, pattern: str) -> List[str]:
+        if self.replaying:
+            return list(self._records["globs"].get(pattern) or [])
+
+        if self.root_dir == "/":
+            paths = sorted(glob.iglob(pattern))
+        else:
+            paths = sorted(
+                path[len(self.root_dir):]
+                for path in glob.iglob(
+                    os.path.join(glob.escape(self.root_dir), pattern.lstrip("/"))
+                )
+            )
+
+        self._record("globs", pattern, paths)
+        return paths
+
+    def lookup(self, key: str, resolver: Callable[[], Optional[str]]) -> Optional[str]:
+        # Lookups in large host databases are recorded, instead of the databases themselves.
+        if self.replaying:
+            return self._records["lookups"].get(key)
+
+        value = resolver()
+        self._record("lookups", key, value)
+        return value
+
+    def which(self, command: str) -> Optional[str]:
+        return self.lookup(f"which:{command}", lambda: shutil.which(command))
+
+    def run(
+        self,
+        cmd: Union[str, Sequence[str]],
+        env: Optional[dict] = None,
+        timeout: Optional[float] = None,
+    ) -> CompletedProcess:
+        cmd = [cmd] if isinstance(cmd, str) else list(cmd)
+        command_key = json.dumps(cmd)
+
+        if self.replaying:
+            return self._replay_command(cmd, command_key)
+
+        try:
+            completed_process = run(
+                cmd,
+                env=env,
+                timeout=timeout,
+                stdout=PIPE,
+                stderr=PIPE,
+                check=False,
+                encoding="utf-8",
+                errors="replace",
+            )
+        except OSError:
+            self._record("commands", command_key, None)
+            raise
+
+        self._record(
+            "commands",
+            command_key,
+            {
+                "returncode": completed_process.returncode,
+                "stdout": completed_process.stdout,
+                "stderr": completed_process.stderr,
+            },
+        )
+        return completed_process
+
+    def check_output(
+        self,
+        cmd: Union[str, Sequence[str]],
+        env: Optional[dict] = None,
+        timeout: Optional[float] = None,
+    ) -> str:
+        completed_process = self.run(cmd, env=env, timeout=timeout)
+        completed_process.check_returncode()
+        return completed_process.stdout
+
+    async def check_output_async(
+        self, *cmd: str, env: Optional[dict] = None, timeout: Optional[float] = None
+    ) -> str:
+        command_key = json.dumps(list(cmd))
+
+        if self.replaying:
+            completed_process = self._replay_command(list(cmd), command_key)
+            completed_process.check_returncode()
+            return completed_process.stdout
+
+        # `async_engine` imports entries machinery, which depends on this module.
+        from async_engine import async_check_output
+
+        try:
+            stdout = await async_check_output(*cmd, env=env, timeout=timeout)
+        except OSError:
+            self._record("commands", command_key, None)
+            raise
+        except CalledProcessError as process_error:
+            self._record(
+                "commands",
+                command_key,
+                {
+                    "returncode": process_error.returncode,
+                    "stdout": process_error.output,
+                    "stderr": "",
+                },
+            )
+            raise
+
+        self._record("commands", command_key, {"returncode": 0, "stdout": stdout, "stderr": ""})
+        return stdout
+
+    def _replay_command(self, cmd: List[str], command_key: str) -> CompletedProcess:
+        record = self._records["commands"].get(command_key)
+        if record is None:
+            raise FileNotFoundError(errno.ENOENT, "No such command in snapshot", cmd[0])
+
+        return CompletedProcess(cmd, record["returncode"], record["stdout"], record["stderr"])
+
+    def _record(self, kind: str, key: str, value) -> None:
+        if not self.recording:
+            return
+
+        with self._lock:
+            self._records[kind][key] = value
+
+    def get_records(self) -> Optional[Dict[str, dict]]:
+        if not self.recording:
+            return None
+
+        with self._lock:
+            return {kind: dict(records) for kind, records in self._records.items()}
+
+    def merge_records(self, records: Optional[Dict[str, dict]]) -> None:
+        if records is None or not self.recording:
+            return
+
+        with self._lock:
+            for kind, kind_records in records.items():
+                self._records[kind].update(kind_records)
+
+    @staticmethod
+    def load_snapshot(snapshot_dir: str) -> Dict[str, dict]:
+        # `gzip` import is deferred, as snapshots are seldom used.
+        import gzip
+
+        with gzip.open(os.path.join(snapshot_dir, SNAPSHOT_FILE_NAME), mode="rt") as f_snapshot:
+            snapshot = json.load(f_snapshot)
+
+        # Older snapshots would replay as undetected entries, instead of failing.
+        if not isinstance(snapshot, dict) or snapshot.get("version") != SNAPSHOT_VERSION:
+            raise ValueError(
+                f"{snapshot_dir} snapshot version is not supported (expected {SNAPSHOT_VERSION})"
+            )
+
+        return {kind: snapshot.get(kind) or {} for kind in SNAPSHOT_RECORDS_KINDS}
+
+    def save(self) -> None:
+        if not self.recording:
+            return
+
+        import gzip
+
+        snapshot = {"version": SNAPSHOT_VERSION, **(self.get_records() or {})}
+
+        os.makedirs(self.record_dir, exist_ok=True)
+        snapshot_path = os.path.join(self.record_dir, SNAPSHOT_FILE_NAME)
+        tmp_path = f"{snapshot_path}.{os.getpid()}.tmp"
+        try:
+            with gzip.open(tmp_path, mode="wt", encoding="UTF-8") as f_snapshot:
+                json.dump(snapshot, f_snapshot, separators=(",", ":"))
+            os.replace(tmp_path, snapshot_path)
+        except BaseException:
+            with suppress(FileNotFoundError):
+                os.unlink(tmp_path)
+            raise
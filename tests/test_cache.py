@@ -0,0 +1,94 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from cache import EntryCache
+from entry import Entry
+from singleton import Singleton
+
+
+class _CachedEntry(Entry):
+
+    _CACHE_TTL = 60
+
+    collections = 0
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        _CachedEntry.collections += 1
+        self.value = self.options.get("value", "collected")
+
+
+class TestEntryCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+
+        self.boot_id_path = os.path.join(self.tmp_dir.name, "boot_id")
+        self._write(self.boot_id_path, "boot-1\n")
+        self.dependency_path = os.path.join(self.tmp_dir.name, "dependency")
+        self._write(self.dependency_path, "1\n")
+
+        for patcher in (
+            mock.patch.dict(os.environ, {"XDG_CACHE_HOME": self.tmp_dir.name}),
+            mock.patch.object(EntryCache, "_BOOT_ID_PATH", self.boot_id_path),
+            mock.patch.object(_CachedEntry, "_CACHE_DEPENDENCIES", (self.dependency_path,)),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        _CachedEntry.collections = 0
+        Singleton._instances.pop(EntryCache, None)
+        self.addCleanup(Singleton._instances.pop, EntryCache, None)
+
+    @staticmethod
+    def _write(path: str, content: str) -> None:
+        with open(path, mode="w", encoding="UTF-8") as f_file:
+            f_file.write(content)
+
+    @staticmethod
+    def _reload() -> EntryCache:
+        # As a new run would do.
+        EntryCache().save()
+        Singleton._instances.pop(EntryCache, None)
+        return EntryCache()
+
+    def test_get_or_collect(self):
+        self.assertEqual(EntryCache().get_or_collect(_CachedEntry, {}).value, "collected")
+        self.assertEqual(self._reload().get_or_collect(_CachedEntry, {}).value, "collected")
+        self.assertEqual(_CachedEntry.collections, 1)
+
+        # Options are part of the key.
+        self.assertIsNone(EntryCache().get(_CachedEntry, {"value": "other"}))
+
+    def test_dependency_invalidation(self):
+        EntryCache().get_or_collect(_CachedEntry, {})
+
+        os.utime(self.dependency_path, ns=(0, 0))
+        self.assertIsNone(self._reload().get(_CachedEntry, {}))
+
+    def test_ttl_expiry(self):
+        EntryCache().get_or_collect(_CachedEntry, {"cache_ttl": -1})
+        self.assertIsNone(self._reload().get(_CachedEntry, {"cache_ttl": -1}))
+
+    def test_reboot_invalidation(self):
+        EntryCache().get_or_collect(_CachedEntry, {})
+
+        self._write(self.boot_id_path, "boot-2\n")
+        self.assertIsNone(self._reload().get(_CachedEntry, {}))
+
+    def test_uncached_values(self):
+        # Entries without a TTL, and undetected values, are never stored.
+        EntryCache().get_or_collect(_CachedEntry, {"cache_ttl": None})
+        EntryCache().get_or_collect(_CachedEntry, {"value": None})
+        self.assertFalse(os.path.exists(os.path.join(self.tmp_dir.name, "sysinfo")))
+
+    def test_disabled(self):
+        EntryCache(enabled=False).get_or_collect(_CachedEntry, {})
+        self.assertIsNone(EntryCache().get(_CachedEntry, {}))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,142 @@
+import os
+import tempfile
+import unittest
+
+from entries.cpu import CPU
+from singleton import Singleton
+from sysroot import Sysroot
+
+
+class TestParseCpuinfo(unittest.TestCase):
+
+    def test_packages(self):
+        self.assertListEqual(
+            CPU._parse_cpuinfo(
+                [
+                    "processor\t: 0",
+                    "model name\t: Intel(R)  Xeon(R)   CPU",
+                    "physical id\t: 1",
+                    "",
+                    "processor\t: 1",
+                    "model name\t: Intel(R) Xeon(R) CPU",
+                    "physical id\t: 1",
+                    "",
+                    "processor\t: 2",
+                    "model name\t: Intel(R) Xeon(R) CPU",
+                    "physical id\t: 0",
+                ],
+                {},
+            ),
+            # Packages are sorted, model names are normalised.
+            [{"Intel(R) Xeon(R) CPU": 1}, {"Intel(R) Xeon(R) CPU": 2}],
+        )
+
+    def test_hybrid_package(self):
+        self.assertListEqual(
+            CPU._parse_cpuinfo(
+                (
+                    "processor\t: 0\nmodel name\t: P-core\nphysical id\t: 0\n\n"
+                    "processor\t: 1\nmodel name\t: P-core\nphysical id\t: 0\n\n"
+                    "processor\t: 2\nmodel name\t: E-core\nphysical id\t: 0\n\n"
+                    "processor\t: 3\nmodel name\t: E-core\nphysical id\t: 0\n\n"
+                    "processor\t: 4\nmodel name\t: E-core\nphysical id\t: 0\n\n"
+                ).splitlines(),
+                {},
+            ),
+            [{"P-core": 2, "E-core": 3}],
+        )
+
+    def test_missing_fields(self):
+        # ARM processors (handled by `_parse_arm_cpuinfo`) have no model name, and some
+        # virtualized ones have no (or a malformed) physical id.
+        self.assertListEqual(
+            CPU._parse_cpuinfo(
+                (
+                    "processor\t: 0\nBogoMIPS\t: 50.00\nCPU implementer\t: 0x41\n\n"
+                ).splitlines(),
+                {0: 0},
+            ),
+            [],
+        )
+        for cpu_info in (
+            "processor\t: 0\nmodel name\t: vCPU\n\n",
+            "processor\t: 0\nmodel name\t: vCPU\nphysical id\t: ?\n\n",
+        ):
+            with self.subTest(cpu_info):
+                self.assertListEqual(CPU._parse_cpuinfo(cpu_info.splitlines(), {0: 0}), [])
+
+    def _iter_lines(self, cpu_info: str, stop_after: int):
+        # Fails the test if parsing goes further than `stop_after` processor blocks.
+        blocks = cpu_info.split("\n\n")
+        yield from "\n\n".join(blocks[:stop_after]).splitlines()
+        yield ""
+        self.fail("Processors were read past the last new package")
+
+    def test_sysfs_packages(self):
+        cpu_info = "".join(
+            f"processor\t: {cpu}\nmodel name\t: EPYC\nphysical id\t: {cpu % 2}\n\n"
+            for cpu in range(8)
+        )
+        self.assertListEqual(
+            CPU._parse_cpuinfo(
+                self._iter_lines(cpu_info, 2), {cpu: cpu % 2 for cpu in range(8)}
+            ),
+            [{"EPYC": 4}, {"EPYC": 4}],
+        )
+
+    def test_sysfs_packages_hybrid(self):
+        # Once a package has shown different model names, all the processors are read.
+        cpu_info = "".join(
+            f"processor\t: {cpu}\nmodel name\t: {('P-core', 'E-core')[cpu % 2]}\n"
+            f"physical id\t: {cpu // 2}\n\n"
+            for cpu in range(4)
+        )
+        self.assertListEqual(
+            CPU._parse_cpuinfo(cpu_info.splitlines(), {cpu: cpu // 2 for cpu in range(4)}),
+            [{"P-core": 1, "E-core": 1}, {"P-core": 1, "E-core": 1}],
+        )
+
+
+class TestRefresh(unittest.TestCase):
+
+    def setUp(self):
+        root_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(root_dir.cleanup)
+        Singleton._instances.pop(Sysroot, None)
+        self.addCleanup(Singleton._instances.pop, Sysroot, None)
+        Sysroot(root_dir.name)
+
+        for policy, current_frequency, governor in (
+            ("policy0", "1200000", "powersave"),
+            ("policy4", "1800000", "powersave"),
+            ("policy8", "3000000", "performance"),
+        ):
+            policy_path = os.path.join(root_dir.name, "sys/devices/system/cpu/cpufreq", policy)
+            os.makedirs(policy_path)
+            for file_name, content in (
+                ("scaling_cur_freq", current_frequency),
+                ("scaling_governor", governor),
+            ):
+                with open(os.path.join(policy_path, file_name), mode="w") as f_policy:
+                    f_policy.write(content + "\n")
+
+    def test_cached_value(self):
+        frequency = {"min_mhz": 800.0, "max_mhz": 3000.0, "current_mhz": 800.0, "governor": None}
+        cpu = CPU.from_value({"models": [{"CPU": 12}], "frequency": frequency})
+        cpu.refresh()
+
+        self.assertDictEqual(
+            cpu.value["frequency"],
+            {"min_mhz": 800.0, "max_mhz": 3000.0, "current_mhz": 2000.0, "governor": "powersave"},
+        )
+        # Cached values are left untouched.
+        self.assertEqual(frequency["current_mhz"], 800.0)
+
+    def test_no_frequency(self):
+        cpu = CPU.from_value({"models": [{"CPU": 12}], "frequency": None})
+        cpu.refresh()
+        self.assertIsNone(cpu.value["frequency"])
+
+
+if __name__ == "__main__":
+    unittest.main()
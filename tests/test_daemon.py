@@ -0,0 +1,70 @@
+import os
+import tempfile
+import time
+import unittest
+from threading import Thread
+
+from cache import EntryCache
+from daemon import Daemon
+from daemon_client import query_daemon
+from entries.hostname import Hostname
+from entries.terminal import Terminal
+from entries.uptime import Uptime
+from singleton import Singleton
+
+
+class TestDaemon(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.socket_dir = tempfile.TemporaryDirectory()
+        cls.socket_path = os.path.join(cls.socket_dir.name, "sysinfo.sock")
+
+        Singleton._instances.pop(EntryCache, None)
+        cls.daemon = Daemon(EntryCache(enabled=False), [(Hostname, {}), (Terminal, {})])
+        Singleton._instances.pop(EntryCache, None)
+        Thread(target=cls.daemon.serve_forever, args=(cls.socket_path,), daemon=True).start()
+
+        for _ in range(100):
+            if os.path.exists(cls.socket_path):
+                break
+            time.sleep(0.05)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.socket_dir.cleanup()
+
+    def test_query(self):
+        # Entries the daemon has not been configured with are collected on demand.
+        entries_instances = query_daemon(self.socket_path, [(Hostname, {}), (Uptime, {})], 5)
+
+        self.assertEqual(len(entries_instances), 2)
+        self.assertIsInstance(entries_instances[0], Hostname)
+        self.assertEqual(entries_instances[0].value, Hostname().value)
+        self.assertIsInstance(entries_instances[1], Uptime)
+        self.assertFalse(entries_instances[1].timed_out)
+
+    def test_caller_environment(self):
+        # The daemon environment (e.g. its `TERM`) is not the one of its clients.
+        entries_instances = query_daemon(self.socket_path, [(Terminal, {}), (Hostname, {})], 5)
+
+        self.assertIsNone(entries_instances[0])
+        self.assertEqual(entries_instances[1].value, Hostname().value)
+        with self.assertRaises(ValueError):
+            self.daemon.get_entries_values([{"type": "Terminal"}])
+
+    def test_no_daemon(self):
+        self.assertIsNone(
+            query_daemon(os.path.join(self.socket_dir.name, "missing.sock"), [(Hostname, {})], 1)
+        )
+
+    def test_untrusted_socket(self):
+        # Only sockets (owned by the current user) are queried.
+        fake_socket_path = os.path.join(self.socket_dir.name, "fake.sock")
+        with open(fake_socket_path, mode="w"):
+            pass
+        self.assertIsNone(query_daemon(fake_socket_path, [(Hostname, {})], 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+import unittest
+
+from entries.disk import Disk
+
+
+class TestParseMountinfo(unittest.TestCase):
+
+    def test_local_filesystems(self):
+        self.assertListEqual(
+            Disk._parse_mountinfo(
+                "22 1 259:2 / / rw,relatime shared:1 - ext4 /dev/nvme0n1p2 rw\n"
+                "23 22 0:21 / /proc rw,nosuid,nodev,noexec,relatime shared:12 - proc proc rw\n"
+                "24 22 0:5 / /dev/shm rw,nosuid,nodev shared:3 - tmpfs tmpfs rw\n"
+                "25 22 7:0 / /snap/core/1 ro,relatime - squashfs /dev/loop0 ro\n"
+                "26 22 0:60 / /var/lib/docker/overlay2/x/merged rw,relatime"
+                " - overlay overlay rw,lowerdir=/l,upperdir=/u,workdir=/w\n"
+                "27 22 0:50 / /mnt/nfs rw,relatime - nfs4 server:/export rw\n"
+                "28 22 253:1 / /home rw,relatime - xfs /dev/mapper/vg-home rw\n"
+            ),
+            [("/", "/dev/nvme0n1p2"), ("/home", "/dev/mapper/vg-home")],
+        )
+
+    def test_duplicates_and_escapes(self):
+        self.assertListEqual(
+            Disk._parse_mountinfo(
+                "22 1 259:2 / / rw,relatime shared:1 - ext4 /dev/nvme0n1p2 rw\n"
+                # A bind mount, then two btrfs subvolumes of the same device.
+                "30 22 259:2 /srv /mnt/bind rw,relatime shared:1 - ext4 /dev/nvme0n1p2 rw\n"
+                "31 22 0:40 / /home rw,relatime shared:2 - btrfs /dev/sda1 rw,subvol=/home\n"
+                "32 22 0:41 / /var rw,relatime shared:3 - btrfs /dev/sda1 rw,subvol=/var\n"
+                "33 22 8:17 / /media/USB\\040Key rw,relatime - vfat /dev/sdb1 rw\n"
+            ),
+            [("/", "/dev/nvme0n1p2"), ("/home", "/dev/sda1"), ("/media/USB Key", "/dev/sdb1")],
+        )
+
+    def test_malformed_lines(self):
+        self.assertListEqual(
+            Disk._parse_mountinfo(
+                "malformed line\n"
+                "\n"
+                "40 22 8:1 / - ext4 /dev/sdc1 rw\n"
+                "41 22 8:2 / /data rw - ext4\n"
+                "42 22 8:3 / /backup rw - ext4 /dev/sdc3 rw\n"
+            ),
+            [("/backup", "/dev/sdc3")],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
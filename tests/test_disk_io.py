@@ -0,0 +1,66 @@
+import unittest
+
+from entries.disk_io import DISKSTATS_COUNTER_MODULUS, DiskIO
+
+
+class TestDiskIO(unittest.TestCase):
+
+    def test_parse_diskstats(self):
+        diskstats = (
+            " 259 0 nvme0n1 100 1 2000 30 50 2 4000 60 0 80 90 0 0 0 0 10 5\n"
+            " 259 1 nvme0n1p1 90 1 1800 25 40 2 3000 50 0 70 75 0 0 0 0\n"
+            "   7 0 loop0 12 0 345 1 0 0 0 0 0 4 1 0 0 0 0\n"
+            " 104 0 cciss/c0d0 10 0 20 3 40 0 50 6 0 7 8\n"
+            # Kernels older than 2.6.25 have fewer fields for partitions.
+            "   8 1 sda1 100 200 300 400\n"
+            "malformed line\n"
+        )
+
+        self.assertDictEqual(
+            DiskIO._parse_diskstats(diskstats, frozenset(("nvme0n1", "cciss!c0d0", "loop0"))),
+            {"nvme0n1": (100, 2000, 30, 50, 4000, 60, 80), "cciss/c0d0": (10, 20, 3, 40, 50, 6, 7)},
+        )
+        # Without `/sys/block`, partitions are kept.
+        self.assertListEqual(
+            list(DiskIO._parse_diskstats(diskstats)), ["nvme0n1", "nvme0n1p1", "cciss/c0d0"]
+        )
+
+    def test_rates(self):
+        disk_io = DiskIO.from_value(None)
+        disk_io._set_value(
+            (10.0, {"sda": (100, 2000, 30, 50, 4000, 60, 800), "sdb": (0, 0, 0, 0, 0, 0, 0)}),
+            (12.0, {"sda": (120, 6000, 50, 70, 4000, 80, 1800), "sdc": (1, 1, 1, 1, 1, 1, 1)}),
+        )
+
+        # Devices missing from one of the samples are left out.
+        self.assertDictEqual(
+            disk_io.value,
+            {
+                "sda": {
+                    "read_bytes_per_second": 4000 * 512 / 2,
+                    "write_bytes_per_second": 0.0,
+                    "read_iops": 10.0,
+                    "write_iops": 10.0,
+                    "await_ms": 1.0,
+                    "util_percent": 50.0,
+                }
+            },
+        )
+
+    def test_single_sample(self):
+        disk_io = DiskIO.from_value(None)
+        disk_io._set_value((10.0, {"sda": (0, 0, 0, 0, 0, 0, 0)}), None)
+        self.assertIsNone(disk_io.value)
+
+    def test_counter_delta(self):
+        self.assertEqual(DiskIO._get_counter_delta(150, 100), 50)
+        self.assertEqual(DiskIO._get_counter_delta(10, DISKSTATS_COUNTER_MODULUS - 10), 20)
+        # 64-bit counters can't have wrapped around, their device has been reset instead.
+        self.assertEqual(DiskIO._get_counter_delta(10, DISKSTATS_COUNTER_MODULUS + 10), 0)
+        # Nor have 32-bit counters far from their maximum.
+        self.assertEqual(DiskIO._get_counter_delta(10, 1000), 0)
+        self.assertEqual(DiskIO._get_counter_delta(0, DISKSTATS_COUNTER_MODULUS // 2 - 1), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
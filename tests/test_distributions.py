@@ -0,0 +1,35 @@
+import unittest
+
+from distributions import _parse_os_release
+
+
+class TestParseOsRelease(unittest.TestCase):
+
+    def test_quoting(self):
+        self.assertDictEqual(
+            _parse_os_release(
+                'NAME="Debian GNU/Linux"\n'
+                "ID=debian\n"
+                "ID_LIKE='rhel fedora'\n"
+                'PRETTY_NAME="Escaped \\"quotes\\" and \\$dollar"\n'
+                'ANSI_COLOR="38;2;23;147;209"\n'
+            ),
+            {
+                "name": "Debian GNU/Linux",
+                "id": "debian",
+                "id_like": "rhel fedora",
+                "pretty_name": 'Escaped "quotes" and $dollar',
+                "ansi_color": "38;2;23;147;209",
+            },
+        )
+
+    def test_malformed_lines(self):
+        # Comments, blank lines and lines without assignment are skipped.
+        self.assertDictEqual(
+            _parse_os_release("# ID=comment\n\nMALFORMED LINE\n  \nID=arch\nVERSION_ID=\n"),
+            {"id": "arch", "version_id": ""},
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from async_engine import AsyncEngine
+from cache import EntryCache
+from deadline import Deadline
+from entry import Entry
+from singleton import Singleton
+from thread_engine import ThreadEngine
+
+
+class _StuckEntry(Entry):
+
+    _TIMEOUT = 0.2
+
+    collections = 0
+    released = threading.Event()
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        _StuckEntry.collections += 1
+        _StuckEntry.released.wait()
+        self.value = "released"
+
+
+class _QuickEntry(Entry):
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.value = "collected"
+
+
+class TestEngines(unittest.TestCase):
+
+    def setUp(self):
+        Singleton._instances.pop(EntryCache, None)
+        self.addCleanup(Singleton._instances.pop, EntryCache, None)
+        self.entry_cache = EntryCache(enabled=False)
+
+        _StuckEntry.collections = 0
+        _StuckEntry.released.clear()
+        self.addCleanup(_StuckEntry.released.set)
+
+        self.executor = ThreadPoolExecutor(max_workers=2)
+        self.addCleanup(self.executor.shutdown, wait=False)
+
+    def test_abandoned_collections(self):
+        for engine_cls in (ThreadEngine, AsyncEngine):
+            with self.subTest(engine_cls.__name__):
+                _StuckEntry.collections = 0
+                _StuckEntry.released.clear()
+
+                deadline = Deadline()
+                engine = engine_cls(self.entry_cache, 1, deadline, self.executor)
+                entries = [(_StuckEntry, {}), (_QuickEntry, {})]
+
+                # A stuck collection is not started again (nor does it hold more workers).
+                for _ in range(3):
+                    deadline.restart()
+                    stuck_entry, quick_entry = engine.collect(entries)
+                    self.assertTrue(stuck_entry.timed_out)
+                    self.assertEqual(quick_entry.value, "collected")
+                self.assertEqual(_StuckEntry.collections, 1)
+
+                _StuckEntry.released.set()
+                deadline.restart()
+                stuck_entry, _ = engine.collect(entries)
+                self.assertEqual(stuck_entry.value, "released")
+
+
+if __name__ == "__main__":
+    unittest.main()
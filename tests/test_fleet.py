@@ -0,0 +1,110 @@
+import csv
+import io
+import json
+import os
+import tempfile
+import unittest
+
+from entries.hostname import Hostname
+from fleet import FleetProcessor, FleetSummary, iter_hosts
+from singleton import Singleton
+from sysroot import Sysroot
+
+
+class TestFleet(unittest.TestCase):
+
+    def setUp(self):
+        self.fleet_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.fleet_dir.cleanup)
+        Singleton._instances.pop(Sysroot, None)
+        self.addCleanup(Singleton._instances.pop, Sysroot, None)
+
+        # A recorded snapshot, a JSON output and a truncated JSON output, in nested directories.
+        root_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(root_dir.cleanup)
+        os.makedirs(os.path.join(root_dir.name, "etc"))
+        with open(os.path.join(root_dir.name, "etc", "hostname"), mode="w") as f_hostname:
+            f_hostname.write("recorded-host\n")
+
+        Sysroot(root_dir.name, record_dir=os.path.join(self.fleet_dir.name, "rack-1", "host-a"))
+        Hostname()
+        Sysroot().save()
+
+        with open(os.path.join(self.fleet_dir.name, "host-b.json"), mode="w") as f_json_output:
+            json.dump({"data": {"Hostname": "json-host"}}, f_json_output)
+        with open(os.path.join(self.fleet_dir.name, "host-c.json"), mode="w") as f_json_output:
+            f_json_output.write('{"data": {')
+
+    def _run(self, output_format: str):
+        output = io.StringIO()
+        summary = FleetProcessor([(Hostname, {})], output_format, 1).run(
+            self.fleet_dir.name, output
+        )
+        return output.getvalue(), summary.to_dict()
+
+    def test_iter_hosts(self):
+        self.assertListEqual(
+            [
+                os.path.relpath(host, self.fleet_dir.name)
+                for host, _ in iter_hosts(self.fleet_dir.name)
+            ],
+            ["host-b", "host-c", "rack-1/host-a"],
+        )
+
+    def test_ndjson(self):
+        output, summary = self._run("ndjson")
+
+        rows = {row["host"]: row for row in map(json.loads, output.splitlines())}
+        self.assertSetEqual(set(rows), {"host-b", "host-c", "rack-1/host-a"})
+        self.assertEqual(rows["rack-1/host-a"]["source"], "snapshot")
+        self.assertDictEqual(rows["rack-1/host-a"]["data"], {"Hostname": "recorded-host"})
+        self.assertEqual(rows["host-b"]["source"], "json")
+        self.assertIn("error", rows["host-c"])
+
+        self.assertEqual(summary["hosts"], 3)
+        self.assertEqual(summary["failed_hosts"], 1)
+        self.assertDictEqual(summary["sources"], {"snapshot": 1, "json": 1})
+        self.assertDictEqual(
+            summary["values"]["Hostname"], {"recorded-host": 1, "json-host": 1}
+        )
+
+    def test_csv(self):
+        output, _ = self._run("csv")
+
+        rows = list(csv.DictReader(io.StringIO(output)))
+        self.assertListEqual(list(rows[0]), ["host", "Hostname", "errors"])
+        self.assertDictEqual(
+            {row["host"]: row["Hostname"] for row in rows},
+            {"host-b": "json-host", "host-c": "", "rack-1/host-a": "recorded-host"},
+        )
+
+
+class TestFleetSummary(unittest.TestCase):
+
+    def test_add(self):
+        summary = FleetSummary()
+        summary.add({"host": "a", "source": "json", "data": {"RAM": {"used": 2}}, "errors": {}})
+        summary.add(
+            {
+                "host": "b",
+                "source": "json",
+                "data": {"RAM": {"used": 4}, "GPU": []},
+                "errors": {"CPU": "ValueError: "},
+            }
+        )
+        summary.add({"host": "c", "source": None, "data": {}, "errors": {}, "error": "EOF"})
+
+        summary_dict = summary.to_dict()
+        self.assertEqual(summary_dict["failed_hosts"], 1)
+        # Undetected (empty) values are not counted.
+        self.assertDictEqual(
+            summary_dict["entries"],
+            {"CPU": {"detected": 0, "errors": 1}, "RAM": {"detected": 2, "errors": 0}},
+        )
+        self.assertDictEqual(
+            summary_dict["numbers"]["RAM.used"], {"count": 2, "mean": 3.0, "min": 2, "max": 4}
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from entries.gpu import GPU
+from pci_ids import PciIds
+from singleton import Singleton
+from sysroot import Sysroot
+
+PCI_IDS = b"""\
+# Comment lines, and subsystems, are never indexed.
+1002  Advanced Micro Devices, Inc. [AMD/ATI]
+\t744c  Navi 31 [Radeon RX 7900 XT/7900 XTX]
+\t\t1002 0e3b  Radeon RX 7900 XTX
+10de  NVIDIA Corporation
+\t2331  GH100 [H100 PCIe]
+\t2684  AD102 [GeForce RTX 4090]
+1a03  ASPEED Technology, Inc.
+\t2000  ASPEED Graphics Family
+C 03  Display controller
+\t00  VGA compatible controller
+"""
+
+
+class TestGPU(unittest.TestCase):
+
+    def setUp(self):
+        self.root_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.root_dir.cleanup)
+        self._write("/usr/share/misc/pci.ids", PCI_IDS)
+
+        # Indexes are written to the cache directory.
+        self.cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.cache_dir.cleanup)
+        patcher = mock.patch.dict(os.environ, {"XDG_CACHE_HOME": self.cache_dir.name})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        for singleton_cls in (Sysroot, PciIds):
+            Singleton._instances.pop(singleton_cls, None)
+            self.addCleanup(Singleton._instances.pop, singleton_cls, None)
+        Sysroot(self.root_dir.name)
+
+    def _write(self, path: str, content: bytes) -> None:
+        path = os.path.join(self.root_dir.name, path.lstrip("/"))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, mode="wb") as f_file:
+            f_file.write(content)
+
+    def _add_pci_device(
+        self, address: str, pci_class: int, vendor_id: int, device_id: int, revision: int
+    ) -> None:
+        for attribute, value in (
+            ("class", f"0x{pci_class:06x}"),
+            ("vendor", f"0x{vendor_id:04x}"),
+            ("device", f"0x{device_id:04x}"),
+            ("revision", f"0x{revision:02x}"),
+        ):
+            self._write(f"/sys/bus/pci/devices/{address}/{attribute}", f"{value}\n".encode())
+
+    def test_pci_ids(self):
+        for _ in range(2):
+            pci_ids = PciIds()
+            self.assertEqual(pci_ids.get_vendor_name(0x10DE), "NVIDIA Corporation")
+            self.assertEqual(pci_ids.get_device_name(0x10DE, 0x2684), "AD102 [GeForce RTX 4090]")
+            self.assertEqual(
+                pci_ids.get_device_name(0x1002, 0x744C), "Navi 31 [Radeon RX 7900 XT/7900 XTX]"
+            )
+            self.assertIsNone(pci_ids.get_vendor_name(0x8086))
+            self.assertIsNone(pci_ids.get_device_name(0x10DE, 0x0001))
+
+            # The next instance maps the index written by the first one.
+            Singleton._instances.pop(PciIds, None)
+            self.assertEqual(len(os.listdir(os.path.join(self.cache_dir.name, "sysinfo"))), 1)
+
+    def test_build_index(self):
+        vendors_keys, vendors_offsets, devices_keys, _ = PciIds._build_index(
+            # Out of order vendors are sorted.
+            b"10de  NVIDIA Corporation\n\t2331  GH100 [H100 PCIe]\n"
+            b"1002  Advanced Micro Devices, Inc. [AMD/ATI]\n\tZZZZ  Malformed\n"
+        )
+        self.assertListEqual(list(vendors_keys), [0x1002, 0x10DE])
+        self.assertListEqual(list(vendors_offsets), [56, 6])
+        self.assertListEqual(list(devices_keys), [0x10DE2331])
+
+    def test_pci_gpus(self):
+        self._add_pci_device("0000:00:00.0", 0x060000, 0x1022, 0x14A4, 0x00)
+        self._add_pci_device("0000:02:00.0", 0x030000, 0x1A03, 0x2000, 0x52)
+        self._add_pci_device("0000:41:00.0", 0x030200, 0x10DE, 0x2331, 0xA1)
+        self._add_pci_device("0000:c1:00.0", 0x038000, 0x8086, 0x56A0, 0x00)
+
+        # 3D controllers first, then VGA ones, then other display controllers.
+        self.assertListEqual(
+            GPU._get_pci_gpus(),
+            [
+                "NVIDIA Corporation GH100 [H100 PCIe] (rev a1)",
+                "ASPEED Technology, Inc. ASPEED Graphics Family (rev 52)",
+                "Vendor 8086 Device 56a0",
+            ],
+        )
+
+    def test_no_pci_bus(self):
+        self.assertIsNone(GPU._get_pci_gpus())
+
+
+if __name__ == "__main__":
+    unittest.main()
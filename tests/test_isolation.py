@@ -0,0 +1,76 @@
+import os
+import tempfile
+import time
+import unittest
+
+from entries.hostname import Hostname
+from entry import ISOLATED_TIMEOUT, Entry
+from isolation import collect_entry
+from singleton import Singleton
+from sysroot import Sysroot
+
+
+class _CrashingEntry(Entry):
+
+    _ISOLATED = True
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        os._exit(1)
+
+
+class _FailingEntry(Entry):
+
+    _ISOLATED = True
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        raise RuntimeError("unexpected layout")
+
+
+class _HangingEntry(Entry):
+
+    _ISOLATED = True
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        time.sleep(60)
+
+
+class TestIsolation(unittest.TestCase):
+
+    def setUp(self):
+        Singleton._instances.pop(Sysroot, None)
+        self.addCleanup(Singleton._instances.pop, Sysroot, None)
+
+    def test_default_timeout(self):
+        self.assertEqual(_HangingEntry.get_timeout(), ISOLATED_TIMEOUT)
+        self.assertEqual(_HangingEntry.get_timeout({"timeout": 1}), 1)
+        self.assertIsNone(Hostname.get_timeout())
+
+    def test_failing_collectors(self):
+        for entry_cls in (_CrashingEntry, _FailingEntry):
+            with self.subTest(entry_cls.__name__):
+                with self.assertLogs(level="WARNING"):
+                    entry = collect_entry(entry_cls, {}, 5)
+                self.assertIsNone(entry.value)
+                self.assertFalse(entry.timed_out)
+
+    def test_hanging_collector(self):
+        started_at = time.monotonic()
+        with self.assertRaises(TimeoutError):
+            collect_entry(_HangingEntry, {}, 0.5)
+        self.assertLess(time.monotonic() - started_at, 30)
+
+    def test_recorded_reads(self):
+        root_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(root_dir.cleanup)
+        os.makedirs(os.path.join(root_dir.name, "etc"))
+        with open(os.path.join(root_dir.name, "etc", "hostname"), mode="w") as f_hostname:
+            f_hostname.write("isolated-host\n")
+
+        # The child collects from the sysroot of its parent, which gets its reads back.
+        Sysroot(root_dir.name, record_dir=root_dir.name)
+        entry = collect_entry(Hostname, {"isolated": True}, 5)
+        self.assertEqual(entry.value, "isolated-host")
+        self.assertIn("/etc/hostname", Sysroot().get_records()["files"])
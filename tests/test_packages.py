@@ -0,0 +1,82 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from entries.packages import Packages
+from singleton import Singleton
+from sysroot import Sysroot
+
+
+class TestPackagesCounters(unittest.TestCase):
+
+    def setUp(self):
+        self.root_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.root_dir.cleanup)
+        Singleton._instances.pop(Sysroot, None)
+        Sysroot(self.root_dir.name)
+        self.addCleanup(Singleton._instances.pop, Sysroot, None)
+
+    def _write(self, path: str, content: bytes = b"") -> str:
+        path = os.path.join(self.root_dir.name, path.lstrip("/"))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, mode="wb") as f_file:
+            f_file.write(content)
+        return path
+
+    def test_absent_databases(self):
+        for packages_source in ("apk", "dpkg", "pacman", "rpm"):
+            with self.subTest(packages_source=packages_source):
+                self.assertIsNone(getattr(Packages, f"_count_{packages_source}_packages")())
+
+    def test_apk(self):
+        self._write(
+            "/lib/apk/db/installed",
+            b"C:Q1abc=\nP:musl\nV:1.2.4-r2\n\nC:Q1def=\nP:busybox\nV:1.36.1-r5\n\n",
+        )
+        self.assertEqual(Packages._count_apk_packages(), 2)
+
+    def test_dpkg(self):
+        self._write(
+            "/var/lib/dpkg/status",
+            b"Package: bash\nStatus: install ok installed\n\n"
+            b"Package: vim\nStatus: deinstall ok config-files\n\n"
+            b"Package: linux-image\nStatus: hold ok installed\n\n"
+            # A description line looking like a status is not counted.
+            b"Package: doc\nStatus: install ok installed\nDescription: x\n"
+            b" Status: install ok installed\n",
+        )
+        self.assertEqual(Packages._count_dpkg_packages(), 3)
+
+    def test_dpkg_recorded_count(self):
+        self._write("/var/lib/dpkg/status", b"Package: bash\nStatus: install ok installed\n\n")
+        Singleton._instances.pop(Sysroot, None)
+        Sysroot(self.root_dir.name, record_dir=self.root_dir.name)
+
+        self.assertEqual(Packages._count_dpkg_packages(), 1)
+        records = Sysroot().get_records()
+        self.assertEqual(records["lookups"]["dpkg:installed"], "1")
+        self.assertNotIn("/var/lib/dpkg/status", records["files"])
+
+    def test_cache_dependencies(self):
+        self._write("/usr/local/lib/python3.11/dist-packages/README.txt")
+        self.assertIn("/usr/local/lib/python3.11/dist-packages", Packages.get_cache_dependencies())
+
+    def test_pacman(self):
+        self._write("/var/lib/pacman/local/ALPM_DB_VERSION", b"9\n")
+        self._write("/var/lib/pacman/local/bash-5.2.015-1/desc")
+        self._write("/var/lib/pacman/local/glibc-2.38-7/desc")
+        self.assertEqual(Packages._count_pacman_packages(), 2)
+
+    def test_rpm_sqlite(self):
+        rpmdb_sqlite_path = self._write("/var/lib/rpm/rpmdb.sqlite")
+        with sqlite3.connect(rpmdb_sqlite_path) as connection:
+            connection.execute("CREATE TABLE Packages (hnum INTEGER PRIMARY KEY, blob BLOB)")
+            connection.executemany("INSERT INTO Packages (blob) VALUES (?)", [(b"",)] * 3)
+        connection.close()
+
+        self.assertEqual(Packages._count_rpm_packages(), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import os
+import tempfile
+import unittest
+
+from processes import Processes, ProcessTable
+from singleton import Singleton
+from sysroot import Sysroot
+
+
+class TestProcessTable(unittest.TestCase):
+
+    def setUp(self):
+        self.root_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.root_dir.cleanup)
+        Singleton._instances.pop(Sysroot, None)
+        Sysroot(self.root_dir.name)
+        self.addCleanup(Singleton._instances.pop, Sysroot, None)
+
+    def _write_proc_file(self, pid: int, name: str, content: bytes) -> None:
+        pid_dir = os.path.join(self.root_dir.name, "proc", str(pid))
+        os.makedirs(pid_dir, exist_ok=True)
+        with open(os.path.join(pid_dir, name), mode="wb") as f_proc_file:
+            f_proc_file.write(content)
+
+    def test_lookups(self):
+        process_table = ProcessTable(
+            [(1, "systemd"), (42, "kworker/0:1"), (43, "kworker/1:0"), (44, "bash"), (45, "bash")]
+        )
+
+        self.assertEqual(len(process_table), 5)
+        self.assertIn("bash", process_table)
+        self.assertNotIn("kworker", process_table)
+        self.assertEqual(process_table.count("bash"), 2)
+        self.assertEqual(process_table.count("zsh"), 0)
+        self.assertListEqual(process_table.find_prefix("kworker/"), ["kworker/0:1", "kworker/1:0"])
+        self.assertListEqual(process_table.find_prefix("zsh"), [])
+        self.assertTupleEqual(process_table.get_pids("bash"), (44, 45))
+        self.assertListEqual(
+            sorted(process_table), ["bash", "bash", "kworker/0:1", "kworker/1:0", "systemd"]
+        )
+
+    def test_ps_processes(self):
+        # `ps` output has no PIDs.
+        process_table = ProcessTable([(None, "bash"), (None, "bash")])
+        self.assertEqual(process_table.count("bash"), 2)
+        self.assertTupleEqual(process_table.get_pids("bash"), ())
+
+    def test_lazy_attributes(self):
+        self._write_proc_file(44, "cmdline", b"bash\0--login\0")
+        self._write_proc_file(44, "status", b"Name:\tbash\nUid:\t1000\t1000\t1000\t1000\n")
+        process_table = ProcessTable([(44, "bash")])
+
+        self.assertListEqual(process_table.get_cmdline(44), ["bash", "--login"])
+        self.assertEqual(process_table.get_uid(44), 1000)
+        # Exited processes have no attributes.
+        self.assertIsNone(process_table.get_cmdline(45))
+        self.assertIsNone(process_table.get_uid(45))
+
+        # Attributes are only read once.
+        os.remove(os.path.join(self.root_dir.name, "proc", "44", "cmdline"))
+        self.assertListEqual(process_table.get_cmdline(44), ["bash", "--login"])
+
+    def test_scan_proc(self):
+        self._write_proc_file(1, "comm", b"systemd\n")
+        self._write_proc_file(44, "comm", b"bash\n")
+        # A process that exited after `/proc` has been listed, and a non-PID entry.
+        os.makedirs(os.path.join(self.root_dir.name, "proc", "45"))
+        with open(os.path.join(self.root_dir.name, "proc", "meminfo"), mode="wb"):
+            pass
+
+        self.assertListEqual(sorted(Processes._scan_proc()), [(1, "systemd"), (44, "bash")])
+
+
+if __name__ == "__main__":
+    unittest.main()
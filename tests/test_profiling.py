@@ -0,0 +1,58 @@
+import os
+import tempfile
+import unittest
+from contextvars import copy_context
+from threading import Thread
+
+from profiling import Profiler
+from singleton import Singleton
+from sysroot import Sysroot
+
+
+class TestProfiler(unittest.TestCase):
+
+    def setUp(self):
+        root_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(root_dir.cleanup)
+        for path, content in (
+            ("proc/loadavg", "0.10 0.20 0.30 1/100 1000\n"),
+            ("sys/class/thermal/thermal_zone0/temp", "41000\n"),
+            ("etc/hostname", "host\n"),
+        ):
+            path = os.path.join(root_dir.name, path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, mode="w") as f_file:
+                f_file.write(content)
+
+        for singleton_cls in (Profiler, Sysroot):
+            Singleton._instances.pop(singleton_cls, None)
+            self.addCleanup(Singleton._instances.pop, singleton_cls, None)
+        Sysroot(root_dir.name)
+        Profiler().enable()
+
+    def test_read_bytes(self):
+        sysroot = Sysroot()
+        with Profiler().profile_entry() as profile:
+            sysroot.read_bytes("/proc/loadavg")
+            sysroot.read_bytes("/etc/hostname")
+            # Threads started by the entry are accounted to it, when they run in its context.
+            thread = Thread(
+                target=copy_context().run,
+                args=(sysroot.read_bytes, "/sys/class/thermal/thermal_zone0/temp"),
+            )
+            thread.start()
+            thread.join()
+        self.assertEqual(profile["read_bytes"], 26 + 6)
+
+    def test_merge_child_profile(self):
+        profiler = Profiler()
+        with profiler.profile_entry() as profile, profiler.profile_entry() as child_profile:
+            list(Sysroot().iter_lines("/proc/loadavg"))
+        self.assertEqual(profile["read_bytes"], 0)
+
+        profiler.merge_child_profile(profile, child_profile)
+        self.assertEqual(profile["read_bytes"], 26)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+import os
+import tempfile
+import unittest
+
+from entries.ram import RAM
+from singleton import Singleton
+from sysroot import Sysroot
+
+MEMINFO = (
+    "MemTotal:        8388608 kB\n"
+    "MemFree:         2097152 kB\n"
+    "MemAvailable:    4194304 kB\n"
+    "Buffers:          262144 kB\n"
+    "Cached:          1048576 kB\n"
+    "Shmem:            524288 kB\n"
+    "SwapTotal:       2097152 kB\n"
+    "SwapFree:        1048576 kB\n"
+    "Zswap:             65536 kB\n"
+    "Zswapped:         196608 kB\n"
+    "SReclaimable:     262144 kB\n"
+    "HugePages_Total:      64\n"
+    "HugePages_Free:       16\n"
+    "Hugepagesize:       2048 kB\n"
+)
+
+
+class TestRAM(unittest.TestCase):
+
+    def setUp(self):
+        self.root_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.root_dir.cleanup)
+        Singleton._instances.pop(Sysroot, None)
+        Sysroot(self.root_dir.name)
+        self.addCleanup(Singleton._instances.pop, Sysroot, None)
+
+    def _write(self, path: str, content: str) -> None:
+        path = os.path.join(self.root_dir.name, path.lstrip("/"))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, mode="w", encoding="ASCII") as f_file:
+            f_file.write(content)
+
+    def test_parse_meminfo(self):
+        # Unneeded keys are skipped, hugepages counts have no unit.
+        self.assertDictEqual(
+            RAM._parse_meminfo(
+                "MemTotal: 2048 kB\nActive(anon): 1024 kB\nHugePages_Total: 4\nMemFree: 512 kB\n"
+            ),
+            {"MemTotal": 2048, "HugePages_Total": 4, "MemFree": 512},
+        )
+
+    def test_read_proc_meminfo(self):
+        self._write("/proc/meminfo", MEMINFO)
+        self._write("/sys/block/zram0/mm_stat", "3000 1000 1100 0 1100 0 0 0 0\n")
+
+        self.assertDictEqual(
+            RAM._read_proc_meminfo(),
+            {
+                "used": 8192 + (512 - (2048 + 1024 + 256 + 256)),
+                "total": 8192.0,
+                "unit": "MiB",
+                "swap_used": 1024.0,
+                "swap_total": 2048.0,
+                "zram_compression_ratio": 3.0,
+                "zswap_compression_ratio": 3.0,
+                "hugepages_total": 64,
+                "hugepages_free": 16,
+                "hugepage_size": 2.0,
+            },
+        )
+
+    def test_missing_optional_keys(self):
+        # e.g. kernels without swap, zswap nor hugepages support.
+        self._write(
+            "/proc/meminfo",
+            "".join(
+                line + "\n"
+                for line in MEMINFO.splitlines()
+                if not line.startswith(("Swap", "Zswap", "Huge"))
+            ),
+        )
+
+        mem_info = RAM._read_proc_meminfo()
+        self.assertEqual(mem_info["total"], 8192.0)
+        self.assertIsNone(mem_info["swap_total"])
+        self.assertIsNone(mem_info["zswap_compression_ratio"])
+        self.assertIsNone(mem_info["zram_compression_ratio"])
+        self.assertIsNone(mem_info["hugepage_size"])
+
+    def test_missing_required_key(self):
+        self._write("/proc/meminfo", MEMINFO.replace("Cached:", "Cachedx:"))
+        with self.assertRaises(KeyError):
+            RAM._read_proc_meminfo()
+
+
+if __name__ == "__main__":
+    unittest.main()
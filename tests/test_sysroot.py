@@ -0,0 +1,114 @@
+import gzip
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+from entries.distro import Distro
+from entries.hostname import Hostname
+from entries.kernel import Kernel
+from entries.shell import Shell
+from environment import Environment
+from singleton import Singleton
+from sysroot import SNAPSHOT_FILE_NAME, SNAPSHOT_VERSION, Sysroot
+
+
+class TestSysroot(unittest.TestCase):
+
+    def setUp(self):
+        self.root_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root_dir, True)
+        self.snapshot_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.snapshot_dir.cleanup)
+
+        os.makedirs(os.path.join(self.root_dir, "etc"))
+        with open(os.path.join(self.root_dir, "etc", "hostname"), mode="wb") as f_hostname:
+            # Undecodable bytes must survive the (JSON) snapshot.
+            f_hostname.write(b"host-\xff\n")
+
+        Singleton._instances.pop(Sysroot, None)
+        self.addCleanup(Singleton._instances.pop, Sysroot, None)
+
+    def _collect(self) -> tuple:
+        sysroot = Sysroot()
+        return (
+            sysroot.read_bytes("/etc/hostname"),
+            sysroot.glob("/etc/host*"),
+            sysroot.check_output([sys.executable, "-c", "print('recorded')"]),
+        )
+
+    def test_root_dir(self):
+        sysroot = Sysroot(self.root_dir)
+        self.assertFalse(sysroot.is_host)
+        self.assertEqual(sysroot.get_path("/etc/hostname"), f"{self.root_dir}/etc/hostname")
+        self.assertTupleEqual(
+            self._collect(), (b"host-\xff\n", ["/etc/hostname"], "recorded\n")
+        )
+
+    def test_record_and_replay(self):
+        Sysroot(self.root_dir, record_dir=self.snapshot_dir.name)
+        recorded_values = self._collect()
+        with self.assertRaises(FileNotFoundError):
+            Sysroot().read_bytes("/etc/machine-id")
+        Sysroot().save()
+
+        # Replays never touch the sysroot (nor run commands).
+        shutil.rmtree(self.root_dir)
+        Singleton._instances.pop(Sysroot, None)
+        Sysroot(replay_dir=self.snapshot_dir.name)
+        self.assertTupleEqual(self._collect(), recorded_values)
+        with self.assertRaises(FileNotFoundError):
+            Sysroot().read_bytes("/etc/machine-id")
+        with self.assertRaises(FileNotFoundError):
+            Sysroot().check_output(["uname"])
+
+    def test_snapshot_version(self):
+        snapshot_path = os.path.join(self.snapshot_dir.name, SNAPSHOT_FILE_NAME)
+        with gzip.open(snapshot_path, mode="wt", encoding="UTF-8") as f_snapshot:
+            json.dump({"version": SNAPSHOT_VERSION - 1, "files": {}}, f_snapshot)
+
+        with self.assertRaises(ValueError):
+            Sysroot(replay_dir=self.snapshot_dir.name)
+
+    def test_replayed_platform(self):
+        def _collect_platform(platform_name: str, uid: int) -> tuple:
+            with mock.patch.multiple(
+                "platform",
+                system=lambda: f"{platform_name}-system",
+                release=lambda: f"{platform_name}-release",
+                node=lambda: f"{platform_name}-node",
+                machine=lambda: f"{platform_name}-machine",
+            ), mock.patch("os.getuid", return_value=uid), mock.patch.dict(os.environ):
+                os.environ.pop("SHELL", None)
+                kernel = Kernel().value
+                return (
+                    kernel["name"],
+                    kernel["release"],
+                    Hostname().value,
+                    Distro().value["arch"],
+                    Shell().value,
+                )
+
+        # This sysroot has neither hostname files nor kernel sysctls.
+        patcher = mock.patch.object(Environment, "DO_NOT_TRACK", True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        Sysroot(self.snapshot_dir.name, record_dir=self.snapshot_dir.name)
+        recorded_values = _collect_platform("recorded", 0)
+        Sysroot().save()
+
+        # The machine running the analysis is never described.
+        Singleton._instances.pop(Sysroot, None)
+        Sysroot(replay_dir=self.snapshot_dir.name)
+        self.assertTupleEqual(_collect_platform("analysis", 4242), recorded_values)
+        self.assertTupleEqual(
+            recorded_values[:4],
+            ("recorded-system", "recorded-release", "recorded-node", "recorded-machine"),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
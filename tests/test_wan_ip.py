@@ -0,0 +1,195 @@
+import asyncio
+import socket
+import struct
+import tempfile
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from threading import Thread
+
+from dns_client import build_query, parse_response, query_address, query_address_async
+from entries.wan_ip import WanIP
+from singleton import Singleton
+from sysroot import Sysroot
+
+DNS_ANSWER = "192.0.2.1"
+HTTP_ANSWER = "198.51.100.1"
+
+
+class StubDNSServer:
+
+    def __init__(self, answer: bool = True):
+        self.answer = answer
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._socket.bind(("127.0.0.1", 0))
+        self.port = self._socket.getsockname()[1]
+        Thread(target=self._serve, daemon=True).start()
+
+    def _serve(self) -> None:
+        while True:
+            try:
+                query, client_address = self._socket.recvfrom(512)
+            except OSError:
+                return
+
+            if not self.answer:
+                continue
+
+            # The question is echoed, then answered through a compression pointer to its name.
+            answer = b"\xc0\x0c" + struct.pack("!HHIH", 1, 1, 60, 4)
+            answer += socket.inet_aton(DNS_ANSWER)
+            self._socket.sendto(
+                query[:2] + struct.pack("!HHHHH", 0x8180, 1, 1, 0, 0) + query[12:] + answer,
+                client_address,
+            )
+
+    def close(self) -> None:
+        self._socket.close()
+
+
+class StubHTTPRequestHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self) -> None:
+        self.send_response(200)
+        self.end_headers()
+        self.wfile.write(f"{HTTP_ANSWER}\n".encode())
+
+    def log_message(self, *_) -> None:
+        pass
+
+
+class TestDNSClient(unittest.TestCase):
+
+    def setUp(self):
+        self.dns_server = StubDNSServer()
+        self.addCleanup(self.dns_server.close)
+
+    def test_query_address(self):
+        self.assertEqual(
+            query_address("myip.example", "127.0.0.1", 4, 1, self.dns_server.port), DNS_ANSWER
+        )
+
+    def test_query_address_async(self):
+        self.assertEqual(
+            asyncio.run(
+                query_address_async("myip.example", "127.0.0.1", 4, 1, self.dns_server.port)
+            ),
+            DNS_ANSWER,
+        )
+
+    def test_query_timeout(self):
+        self.dns_server.answer = False
+        self.assertIsNone(query_address("myip.example", "127.0.0.1", 4, 0.1, self.dns_server.port))
+        self.assertIsNone(
+            asyncio.run(
+                query_address_async("myip.example", "127.0.0.1", 4, 0.1, self.dns_server.port)
+            )
+        )
+
+    def test_parse_response(self):
+        query_id, query = build_query("myip.example", 6)
+        answer = b"\xc0\x0c" + struct.pack("!HHIH", 28, 1, 60, 16)
+        answer += socket.inet_pton(socket.AF_INET6, "2001:db8::1")
+        response = query[:2] + struct.pack("!HHHHH", 0x8180, 1, 1, 0, 0) + query[12:] + answer
+
+        self.assertEqual(parse_response(response, query_id, 6), "2001:db8::1")
+        # Another query identifier, a (NXDOMAIN) error code or a truncated answer.
+        self.assertIsNone(parse_response(response, query_id ^ 1, 6))
+        self.assertIsNone(parse_response(response[:3] + b"\x83" + response[4:], query_id, 6))
+        self.assertIsNone(parse_response(response[:-4], query_id, 6))
+
+
+class TestWanIP(unittest.TestCase):
+
+    def setUp(self):
+        Singleton._instances.pop(Sysroot, None)
+        self.addCleanup(Singleton._instances.pop, Sysroot, None)
+
+        self.dns_server = StubDNSServer()
+        self.addCleanup(self.dns_server.close)
+
+        self.http_server = HTTPServer(("127.0.0.1", 0), StubHTTPRequestHandler)
+        Thread(target=self.http_server.serve_forever, daemon=True).start()
+        self.addCleanup(self.http_server.server_close)
+        self.addCleanup(self.http_server.shutdown)
+
+    def _collect(self, ipv4_options: dict, use_async: bool = False) -> list:
+        options = {"ipv4": ipv4_options, "ipv6": False}
+        if not use_async:
+            return WanIP(options=options).value
+
+        wan_ip = WanIP.from_value(None, options=options)
+        asyncio.run(wan_ip.collect_async())
+        return wan_ip.value
+
+    def test_dns_source(self):
+        for use_async in (False, True):
+            with self.subTest(use_async=use_async):
+                self.assertListEqual(
+                    self._collect(
+                        {
+                            "dns_resolver": "127.0.0.1",
+                            "dns_port": self.dns_server.port,
+                            "http_url": False,
+                        },
+                        use_async,
+                    ),
+                    [DNS_ANSWER],
+                )
+
+    def test_http_source(self):
+        for use_async in (False, True):
+            with self.subTest(use_async=use_async):
+                self.assertListEqual(
+                    self._collect(
+                        {
+                            "dns_query": False,
+                            "http_url": f"http://127.0.0.1:{self.http_server.server_port}/",
+                        },
+                        use_async,
+                    ),
+                    [HTTP_ANSWER],
+                )
+
+    def test_sources_race(self):
+        # The resolver never answers, so the HTTP source must win without waiting for it.
+        self.dns_server.answer = False
+        for use_async in (False, True):
+            with self.subTest(use_async=use_async):
+                start_time = time.monotonic()
+                self.assertListEqual(
+                    self._collect(
+                        {
+                            "dns_resolver": "127.0.0.1",
+                            "dns_port": self.dns_server.port,
+                            "dns_timeout": 5,
+                            "http_url": f"http://127.0.0.1:{self.http_server.server_port}/",
+                        },
+                        use_async,
+                    ),
+                    [HTTP_ANSWER],
+                )
+                self.assertLess(time.monotonic() - start_time, 2.5)
+
+    def test_replay_winners(self):
+        ipv4_options = {
+            "dns_resolver": "127.0.0.1",
+            "dns_port": self.dns_server.port,
+            "http_url": f"http://127.0.0.1:{self.http_server.server_port}/",
+        }
+        snapshot_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(snapshot_dir.cleanup)
+
+        Sysroot(record_dir=snapshot_dir.name)
+        recorded_value = self._collect(ipv4_options)
+        Sysroot().save()
+
+        # Replays are given the recorded winner, whatever the sources answer now.
+        Sysroot().replay(snapshot_dir.name)
+        self.dns_server.close()
+        self.assertListEqual(self._collect(ipv4_options), recorded_value)
+        self.assertListEqual(self._collect(ipv4_options, use_async=True), recorded_value)
+
+
+if __name__ == "__main__":
+    unittest.main()
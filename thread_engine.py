@@ -0,0 +1,107 @@
+import logging
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from concurrent.futures import wait
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Type, cast
+
+from cache import EntryCache
+from deadline import Deadline
+from entry import Entry
+from isolation import collect_entry
+from profiling import Profiler
+
+
+class ThreadEngine:
+
+    def __init__(
+        self,
+        entry_cache: EntryCache,
+        max_workers: Optional[int] = None,
+        deadline: Optional[Deadline] = None,
+        executor: Optional[ThreadPoolExecutor] = None,
+    ):
+        self._entry_cache = entry_cache
+        self._max_workers = max_workers
+        self._deadline = deadline or Deadline()
+        self._executor = executor
+        # Collections still running past their timeout, which a next call waits for again.
+        self._abandoned_futures: Dict[str, Future] = {}
+
+    def collect(
+        self,
+        entries: Sequence[Tuple[Type[Entry], dict]],
+        on_entry: Optional[Callable[[Entry], None]] = None,
+    ) -> List[Entry]:
+        executor = self._executor or ThreadPoolExecutor(max_workers=self._max_workers)
+        keys = [EntryCache.get_key(entry_cls, options) for entry_cls, options in entries]
+        futures = []
+        for key, (entry_cls, options) in zip(keys, entries):
+            future = self._abandoned_futures.pop(key, None)
+            if future is None or future.done():
+                future = executor.submit(self._collect_one, entry_cls, options)
+            futures.append(future)
+
+        entries_instances: List[Optional[Entry]] = [None] * len(entries)
+
+        def _complete(index: int, entry_instance: Entry) -> None:
+            entries_instances[index] = entry_instance
+            if on_entry is not None:
+                on_entry(entry_instance)
+
+        try:
+            pending: Dict[Future, int] = {future: index for index, future in enumerate(futures)}
+            while pending:
+                wait_timeout = min(
+                    (
+                        entry_timeout
+                        for entry_timeout in (
+                            self._deadline.get_entry_timeout(*entries[index])
+                            for index in pending.values()
+                        )
+                        if entry_timeout is not None
+                    ),
+                    default=None,
+                )
+
+                done, _ = wait(pending, timeout=wait_timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = pending.pop(future)
+                    try:
+                        _complete(index, future.result())
+                    except (TimeoutError, FuturesTimeoutError):
+                        _complete(index, self._on_timeout(*entries[index]))
+
+                for future, index in list(pending.items()):
+                    entry_timeout = self._deadline.get_entry_timeout(*entries[index])
+                    if entry_timeout is not None and entry_timeout <= 0:
+                        del pending[future]
+                        _complete(index, self._on_timeout(*entries[index]))
+        finally:
+            # Do not wait for abandoned (timed out) collectors, nor start queued ones.
+            for key, future in zip(keys, futures):
+                if not future.cancel() and not future.done():
+                    self._abandoned_futures[key] = future
+            if executor is not self._executor:
+                executor.shutdown(wait=False)
+
+        return cast(List[Entry], entries_instances)
+
+    @staticmethod
+    def _on_timeout(entry_cls: Type[Entry], options: dict) -> Entry:
+        logging.warning("%s entry timed out.", entry_cls.__name__)
+        return entry_cls.from_timeout(options)
+
+    def _collect_one(self, entry_cls: Type[Entry], options: dict) -> Entry:
+        profiler = Profiler()
+        with profiler.profile_entry() as profile:
+            entry = self._entry_cache.get(entry_cls, options)
+        if entry is not None:
+            profiler.add_source(profile, "cache")
+            entry.profile = profile
+            return entry
+
+        entry = collect_entry(
+            entry_cls, options, self._deadline.get_entry_timeout(entry_cls, options)
+        )
+        self._entry_cache.store(entry)
+        return entry
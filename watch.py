@@ -0,0 +1,96 @@
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional, Sequence, Tuple, Type
+
+from cache import EntryCache
+from deadline import Deadline
+from entry import Entry
+from output import Output
+from processes import Processes
+from thread_engine import ThreadEngine
+
+CLEAR_SCREEN = "\x1b[H\x1b[2J"
+
+
+class Watcher:
+
+    def __init__(
+        self,
+        entry_cache: EntryCache,
+        entries: Sequence[Tuple[Type[Entry], dict]],
+        interval: float,
+        output_factory: Callable[[], Output],
+        max_workers: Optional[int] = None,
+        deadline_ms: Optional[float] = None,
+        engine_cls: Type = ThreadEngine,
+    ):
+        self._entry_cache = entry_cache
+        self._entries = entries
+        self._interval = interval
+        self._output_factory = output_factory
+
+        # A single pool and engine are kept for the whole session, instead of one per refresh.
+        # Engines keep at most one collection per entry running past its timeout, which the pool
+        # has room for.
+        self._executor = ThreadPoolExecutor(
+            max_workers=None if max_workers is None else max_workers + len(entries)
+        )
+        self._deadline = Deadline.from_milliseconds(deadline_ms)
+        self._engine = engine_cls(entry_cache, max_workers, self._deadline, self._executor)
+
+    def run(self) -> None:
+        dynamic_indexes = [
+            index for index, (entry_cls, _) in enumerate(self._entries) if entry_cls.is_dynamic()
+        ]
+        static_indexes = sorted(set(range(len(self._entries))) - set(dynamic_indexes))
+        refresh_processes = any(
+            self._entries[index][0].uses_processes() for index in dynamic_indexes
+        )
+
+        entries_instances: List[Optional[Entry]] = [None] * len(self._entries)
+
+        try:
+            self._collect_into(entries_instances, static_indexes)
+            self._entry_cache.save()
+
+            next_tick = time.monotonic()
+            first_refresh = True
+            while True:
+                if refresh_processes and not first_refresh:
+                    Processes().refresh()
+
+                self._collect_into(entries_instances, dynamic_indexes)
+                self._render(entries_instances)
+
+                # Dynamic entries may store cache data too (e.g. Temperature sensors paths).
+                if first_refresh:
+                    self._entry_cache.save()
+                    first_refresh = False
+
+                next_tick = max(next_tick + self._interval, time.monotonic())
+                time.sleep(max(0.0, next_tick - time.monotonic()))
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self._executor.shutdown(wait=False)
+
+    def _collect_into(self, entries_instances: List[Optional[Entry]], indexes: List[int]) -> None:
+        # Each refresh gets the whole deadline.
+        self._deadline.restart()
+        collected_entries = self._engine.collect([self._entries[index] for index in indexes])
+
+        for index, entry_instance in zip(indexes, collected_entries):
+            entries_instances[index] = entry_instance
+
+    def _render(self, entries_instances: List[Optional[Entry]]) -> None:
+        output = self._output_factory()
+        for entry_instance in entries_instances:
+            if entry_instance is not None:
+                output.stream_entry(entry_instance)
+                output.add_entry(entry_instance)
+
+        if sys.stdout.isatty():
+            sys.stdout.write(CLEAR_SCREEN)
+        output.output()
+        sys.stdout.flush()